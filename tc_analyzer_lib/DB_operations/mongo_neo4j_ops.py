@@ -1,8 +1,13 @@
+import asyncio
+import contextvars
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
 from tc_analyzer_lib.DB_operations.mongodb_interaction import MongoDBOps
 from tc_analyzer_lib.DB_operations.network_graph import NetworkGraph
 from tc_analyzer_lib.schemas import GraphSchema
+from tc_analyzer_lib.utils.instrumentation import increment, stage
+from tc_analyzer_lib.utils.neo4j_async import AsyncNeo4jOps
 from tc_neo4j_lib.neo4j_ops import Neo4jOps, Query
 
 
@@ -35,6 +40,8 @@ class MongoNeo4jDB:
         graph_schema: GraphSchema,
         remove_memberactivities: bool = False,
         remove_heatmaps: bool = False,
+        remove_graph: bool | None = None,
+        delta_graph: bool = False,
     ):
         """
         store the analytics data into database
@@ -57,6 +64,13 @@ class MongoNeo4jDB:
         remove_heatmaps : bool
             remove the whole heatmap data and insert
             default is `False` which means don't delete the existing data
+        remove_graph : bool | None
+            remove the relations of the platform on graph before writing the graph
+            default is `None` meaning to follow `remove_memberactivities`
+        delta_graph : bool
+            if True, the graph already persisted would be read in bulk
+            and just its new members and relationships would be written
+            default is `False` meaning to write (`MERGE`) the whole graph
 
         Returns:
         ----------
@@ -66,35 +80,246 @@ class MongoNeo4jDB:
         (memberactivities_data, memberactivities_networkx_data) = analytics_data[
             "memberactivities"
         ]
+        if remove_graph is None:
+            remove_graph = remove_memberactivities
 
         if not self.testing:
             # mongodb transactions
-            self.mongoOps._do_analytics_write_transaction(
-                platform_id=platform_id,
-                delete_heatmaps=remove_heatmaps,
-                delete_member_acitivities=remove_memberactivities,
-                acitivties_list=memberactivities_data,
-                heatmaps_list=heatmaps_data,
-            )
+            with stage("mongo_write"):
+                self.mongoOps._do_analytics_write_transaction(
+                    platform_id=platform_id,
+                    delete_heatmaps=remove_heatmaps,
+                    delete_member_acitivities=remove_memberactivities,
+                    acitivties_list=memberactivities_data,
+                    heatmaps_list=heatmaps_data,
+                )
 
             # neo4j transactions
             if (
                 memberactivities_networkx_data is not None
                 and memberactivities_networkx_data != []
             ):
-                network_graph = NetworkGraph(graph_schema, platform_id)
-                queries_list = network_graph.make_neo4j_networkx_query_dict(
-                    networkx_graphs=memberactivities_networkx_data,
-                )
-                self.run_operations_transaction(
+                with stage("neo4j_write"), ThreadPoolExecutor(1) as executor:
+                    # the relations are removed while the queries are being prepared
+                    deletion = None
+                    if remove_graph:
+                        deletion = executor.submit(
+                            contextvars.copy_context().run,
+                            self.remove_platform_relations,
+                            platform_id=platform_id,
+                            graph_schema=graph_schema,
+                        )
+
+                    network_graph = NetworkGraph(graph_schema, platform_id)
+                    if delta_graph:
+                        node_queries, rel_queries = self._make_delta_graph_queries(
+                            network_graph,
+                            memberactivities_networkx_data,
+                            remove_graph=remove_graph,
+                        )
+                        queries_list = node_queries + rel_queries
+                        queries_list.append(
+                            network_graph.make_graph_dates_query(
+                                list(memberactivities_networkx_data.keys())
+                            )
+                        )
+                    else:
+                        queries_list = network_graph.make_neo4j_networkx_query_dict(
+                            networkx_graphs=memberactivities_networkx_data,
+                        )
+
+                    if deletion is not None:
+                        deletion.result()
+                    self.run_operations_transaction(
+                        platform_id=platform_id,
+                        queries_list=queries_list,
+                        remove_memberactivities=False,
+                        graph_schema=graph_schema,
+                    )
+        else:
+            logging.warning("Testing mode enabled! Not saving any data")
+
+    async def store_analytics_data_async(
+        self,
+        analytics_data: dict,
+        platform_id: str,
+        graph_schema: GraphSchema,
+        remove_memberactivities: bool = False,
+        remove_heatmaps: bool = False,
+        remove_graph: bool | None = None,
+        delta_graph: bool = False,
+    ):
+        """
+        the async version of `store_analytics_data`
+        the mongodb write is done in a thread and the graph is written
+        using the async neo4j driver with concurrent transactions
+
+        the parameters are the same as `store_analytics_data`
+        """
+        heatmaps_data = analytics_data["heatmaps"]
+        (memberactivities_data, memberactivities_networkx_data) = analytics_data[
+            "memberactivities"
+        ]
+        if remove_graph is None:
+            remove_graph = remove_memberactivities
+
+        if not self.testing:
+            # mongodb transactions
+            with stage("mongo_write"):
+                await asyncio.to_thread(
+                    self.mongoOps._do_analytics_write_transaction,
                     platform_id=platform_id,
-                    queries_list=queries_list,
-                    remove_memberactivities=remove_memberactivities,
-                    graph_schema=graph_schema,
+                    delete_heatmaps=remove_heatmaps,
+                    delete_member_acitivities=remove_memberactivities,
+                    acitivties_list=memberactivities_data,
+                    heatmaps_list=heatmaps_data,
                 )
+
+            # neo4j transactions
+            if (
+                memberactivities_networkx_data is not None
+                and memberactivities_networkx_data != []
+            ):
+                with stage("neo4j_write"):
+                    # the relations are removed while the queries are being prepared
+                    deletion = None
+                    if remove_graph:
+                        deletion = asyncio.create_task(
+                            self.remove_platform_relations_async(
+                                platform_id=platform_id,
+                                graph_schema=graph_schema,
+                            )
+                        )
+
+                    network_graph = NetworkGraph(graph_schema, platform_id)
+                    try:
+                        if delta_graph:
+                            node_queries, rel_queries = (
+                                await self._make_delta_graph_queries_async(
+                                    network_graph,
+                                    memberactivities_networkx_data,
+                                    remove_graph=remove_graph,
+                                )
+                            )
+                        else:
+                            node_queries, rel_queries = await asyncio.to_thread(
+                                network_graph.make_neo4j_networkx_queries,
+                                networkx_graphs=memberactivities_networkx_data,
+                            )
+                    finally:
+                        if deletion is not None:
+                            await deletion
+
+                    await self.run_operations_transaction_async(
+                        platform_id=platform_id,
+                        node_queries=node_queries,
+                        rel_queries=rel_queries,
+                        remove_memberactivities=False,
+                        graph_schema=graph_schema,
+                        final_queries=[
+                            network_graph.make_graph_dates_query(
+                                list(memberactivities_networkx_data.keys())
+                            )
+                        ],
+                    )
         else:
             logging.warning("Testing mode enabled! Not saving any data")
 
+    def _make_delta_graph_queries(
+        self,
+        network_graph: NetworkGraph,
+        networkx_graphs: dict,
+        remove_graph: bool,
+    ) -> tuple[list[Query], list[Query]]:
+        """
+        read the graph already persisted and make the queries
+        to write just the changes of the given graphs
+
+        Parameters
+        ------------
+        network_graph : NetworkGraph
+            the utils to make the graph queries
+        networkx_graphs : dict
+            the networkx graphs to be written, with their dates as keys
+        remove_graph : bool
+            whether the relations of the platform would be removed before writing
+            if so, all the relationships would be written
+
+        Returns
+        ---------
+        node_queries : list[Query]
+            the queries creating the new members of platform
+        rel_queries : list[Query]
+            the queries creating the new relationships
+        """
+        members_query, edges_query = network_graph.make_persisted_graph_queries(
+            graph_dates=list(networkx_graphs.keys())
+        )
+        increment("neo4j.queries")
+        records, _, _ = self.neo4j_ops.neo4j_driver.execute_query(
+            members_query.query, parameters_=members_query.parameters
+        )
+        persisted_members = {record["id"] for record in records}
+
+        persisted_edges: set[tuple[str, str, int, int]] = set()
+        if not remove_graph:
+            increment("neo4j.queries")
+            records, _, _ = self.neo4j_ops.neo4j_driver.execute_query(
+                edges_query.query, parameters_=edges_query.parameters
+            )
+            persisted_edges = {
+                (
+                    record["source"],
+                    record["target"],
+                    int(record["date"]),
+                    int(record["weight"]),
+                )
+                for record in records
+            }
+
+        return network_graph.make_neo4j_delta_queries(
+            networkx_graphs=networkx_graphs,
+            persisted_members=persisted_members,
+            persisted_edges=persisted_edges,
+        )
+
+    async def _make_delta_graph_queries_async(
+        self,
+        network_graph: NetworkGraph,
+        networkx_graphs: dict,
+        remove_graph: bool,
+    ) -> tuple[list[Query], list[Query]]:
+        """
+        the async version of `_make_delta_graph_queries`
+        the parameters are the same as `_make_delta_graph_queries`
+        """
+        neo4j_ops = AsyncNeo4jOps.get_instance()
+
+        members_query, edges_query = network_graph.make_persisted_graph_queries(
+            graph_dates=list(networkx_graphs.keys())
+        )
+        members = await neo4j_ops.run_cypher(
+            members_query.query, members_query.parameters
+        )
+        persisted_members = set(members["id"]) if len(members) else set()
+
+        persisted_edges: set[tuple[str, str, int, int]] = set()
+        if not remove_graph:
+            edges = await neo4j_ops.run_cypher(
+                edges_query.query, edges_query.parameters
+            )
+            persisted_edges = {
+                (row.source, row.target, int(row.date), int(row.weight))
+                for row in edges.itertuples(index=False)
+            }
+
+        return await asyncio.to_thread(
+            network_graph.make_neo4j_delta_queries,
+            networkx_graphs=networkx_graphs,
+            persisted_members=persisted_members,
+            persisted_edges=persisted_edges,
+        )
+
     def run_operations_transaction(
         self,
         platform_id: str,
@@ -116,32 +341,201 @@ class MongoNeo4jDB:
         remove_memberactivities : bool
             if True, remove the old data specified in that guild
         """
-        self.guild_msg = f"platform_id: {platform_id}:"
+        message = f"platform_id: {platform_id}:"
 
-        transaction_queries: list[Query] = []
         if remove_memberactivities:
-            logging.info(
-                f"{self.guild_msg} Neo4J platform_id accounts relation will be removed!"
+            self.remove_platform_relations(
+                platform_id=platform_id,
+                graph_schema=graph_schema,
             )
-            delete_relationship_query = self._create_guild_rel_deletion_query(
+
+        transaction_queries: list[Query] = list(queries_list)
+
+        increment("neo4j.queries", len(transaction_queries))
+        self.neo4j_ops.run_queries_in_batch(transaction_queries, message=message)
+
+    async def run_operations_transaction_async(
+        self,
+        platform_id: str,
+        node_queries: list[Query],
+        rel_queries: list[Query],
+        remove_memberactivities: bool,
+        graph_schema: GraphSchema,
+        chunk_size: int = 1000,
+        max_concurrency: int = 4,
+        final_queries: list[Query] | None = None,
+    ) -> None:
+        """
+        do the deletion and insertion operations using the async neo4j driver
+        the queries are run in chunks, each chunk within a transaction
+
+        - the deletion is done first
+        - the nodes are created sequentially, as concurrent `MERGE`s
+        of a node could create duplicates of it
+        - the relationships are created concurrently, since the nodes are created
+        and each relationship is a distinct one
+        - the final queries are run after all the relationships are written
+
+        Note: unlike `run_operations_transaction` the whole operation
+        is not atomic, a failing chunk wouldn't roll back the previous ones.
+        The queries are all `MERGE`s so it is safe to re-run.
+
+        Parameters:
+        ------------
+        platform_id : str
+            the platform id that the users are connected to it
+        node_queries : list[Query]
+            the queries to create the nodes
+        rel_queries : list[Query]
+            the queries to create the relationships between nodes
+        remove_memberactivities : bool
+            if True, remove the old data specified in that platform
+        graph_schema : GraphSchema
+            the schema of graph to be saved
+        chunk_size : int
+            the number of queries to run in each transaction
+        max_concurrency : int
+            the maximum number of concurrent transactions
+            for writing the relationships
+        final_queries : list[Query] | None
+            the queries to run in a transaction after the last relationship chunk
+            i.e. updating the latest graph date of the platform
+            default is `None` meaning nothing to run
+        """
+        message = f"platform_id: {platform_id}:"
+        neo4j_ops = AsyncNeo4jOps.get_instance()
+
+        if remove_memberactivities:
+            await self.remove_platform_relations_async(
                 platform_id=platform_id,
                 graph_schema=graph_schema,
             )
-            transaction_queries.append(delete_relationship_query)
 
-        transaction_queries.extend(queries_list)
+        for idx in range(0, len(node_queries), chunk_size):
+            await neo4j_ops.run_queries_in_transaction(
+                node_queries[idx : idx + chunk_size], message=message
+            )
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def write_chunk(queries: list[Query]) -> None:
+            async with semaphore:
+                await neo4j_ops.run_queries_in_transaction(queries, message=message)
+
+        await asyncio.gather(
+            *[
+                write_chunk(rel_queries[idx : idx + chunk_size])
+                for idx in range(0, len(rel_queries), chunk_size)
+            ]
+        )
+
+        if final_queries:
+            await neo4j_ops.run_queries_in_transaction(final_queries, message=message)
+
+    def remove_platform_relations(
+        self,
+        platform_id: str,
+        graph_schema: GraphSchema,
+        batch_size: int = 10000,
+    ) -> int:
+        """
+        remove the interaction relationships of a platform in chunks
+        each chunk is deleted in its own transaction,
+        so the deletion of millions of relationships wouldn't blow up the heap
+        the latest graph date kept on the platform node is removed afterwards
+
+        Note: unlike the inserts, the deletion is not rolled back on failures.
+        The remaining relationships would be removed on the next try.
+
+        Parameters:
+        ------------
+        platform_id : str
+            the platform id that the relationships are related to
+        graph_schema : GraphSchema
+            the schema of graph
+        batch_size : int
+            the count of relationships to delete in each transaction
+
+        Returns:
+        ---------
+        deleted_count : int
+            the count of relationships removed
+        """
+        message = f"platform_id: {platform_id}:"
+        logging.info(f"{message} Neo4J platform_id accounts relation will be removed!")
+        query = self._create_guild_rel_deletion_query(
+            platform_id=platform_id,
+            graph_schema=graph_schema,
+            batch_size=batch_size,
+        )
+
+        deleted_count = 0
+        while True:
+            increment("neo4j.queries")
+            records, _, _ = self.neo4j_ops.neo4j_driver.execute_query(
+                query.query, parameters_=query.parameters
+            )
+            chunk_count = records[0]["deleted_count"]
+            deleted_count += chunk_count
+            logging.info(f"{message} Removed {deleted_count} relations so far!")
+            if chunk_count < batch_size:
+                break
+
+        dates_query = self._create_graph_dates_removal_query(
+            platform_id=platform_id, graph_schema=graph_schema
+        )
+        increment("neo4j.queries")
+        self.neo4j_ops.neo4j_driver.execute_query(
+            dates_query.query, parameters_=dates_query.parameters
+        )
+        return deleted_count
 
-        self.neo4j_ops.run_queries_in_batch(transaction_queries, message=self.guild_msg)
+    async def remove_platform_relations_async(
+        self,
+        platform_id: str,
+        graph_schema: GraphSchema,
+        batch_size: int = 10000,
+    ) -> int:
+        """
+        the async version of `remove_platform_relations`
+        the parameters are the same as `remove_platform_relations`
+        """
+        message = f"platform_id: {platform_id}:"
+        logging.info(f"{message} Neo4J platform_id accounts relation will be removed!")
+        neo4j_ops = AsyncNeo4jOps.get_instance()
+        query = self._create_guild_rel_deletion_query(
+            platform_id=platform_id,
+            graph_schema=graph_schema,
+            batch_size=batch_size,
+        )
+
+        deleted_count = 0
+        while True:
+            results = await neo4j_ops.run_cypher(query.query, query.parameters)
+            chunk_count = int(results["deleted_count"].iloc[0])
+            deleted_count += chunk_count
+            logging.info(f"{message} Removed {deleted_count} relations so far!")
+            if chunk_count < batch_size:
+                break
+
+        dates_query = self._create_graph_dates_removal_query(
+            platform_id=platform_id, graph_schema=graph_schema
+        )
+        await neo4j_ops.run_queries_in_transaction([dates_query], message=message)
+        return deleted_count
 
     def _create_guild_rel_deletion_query(
         self,
         platform_id: str,
         graph_schema: GraphSchema,
         relation_name: str = "INTERACTED_WITH",
+        batch_size: int = 10000,
     ) -> Query:
         """
-        create a query to delete the relationships
+        create a query to delete a chunk of the relationships
         between DiscordAccount users in a specific guild
+        the query returns the count of deleted relationships as `deleted_count`
+        so it should be run until the count is less than `batch_size`
 
         Parameters:
         -------------
@@ -149,6 +543,8 @@ class MongoNeo4jDB:
             the guild id that the users are connected to it
         relation_name : str
             the relation we want to delete
+        batch_size : int
+            the maximum count of relationships to delete
 
         Returns:
         ------------
@@ -158,12 +554,15 @@ class MongoNeo4jDB:
         query_str = f"""
           MATCH
             (:{graph_schema.user_label})
-                -[r:{graph_schema.interacted_with_rel} {{platformId: '{platform_id}'}}]-(:{graph_schema.user_label})
-            DETACH DELETE r"""
+                -[r:{graph_schema.interacted_with_rel} {{platformId: $platform_id}}]->(:{graph_schema.user_label})
+            WITH r LIMIT $batch_size
+            DETACH DELETE r
+            RETURN count(*) AS deleted_count"""
 
         parameters = {
             "relation_name": relation_name,
             "platform_id": platform_id,
+            "batch_size": batch_size,
         }
 
         query = Query(
@@ -171,3 +570,30 @@ class MongoNeo4jDB:
             parameters=parameters,
         )
         return query
+
+    def _create_graph_dates_removal_query(
+        self,
+        platform_id: str,
+        graph_schema: GraphSchema,
+    ) -> Query:
+        """
+        create a query to remove the latest graph date kept on the platform node
+        to be used after the relationships of the platform were removed
+
+        Parameters:
+        -------------
+        platform_id : str
+            the platform id to remove its latest graph date
+        graph_schema : GraphSchema
+            the schema of graph
+
+        Returns:
+        ------------
+        query : Query
+            the query to remove the latest graph date
+        """
+        query_str = f"""
+            MATCH (g:{graph_schema.platform_label} {{id: $platform_id}})
+            REMOVE g.latestGraphDate
+            """
+        return Query(query=query_str, parameters={"platform_id": platform_id})
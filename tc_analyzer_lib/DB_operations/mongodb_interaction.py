@@ -11,7 +11,6 @@ class MongoDBOps:
         mongoDB database operations
         """
         self.DB_access = DB_access
-        self.guild_msg = ""
 
     def set_mongo_db_access(self, platform_id=None):
         """
@@ -23,7 +22,6 @@ class MongoDBOps:
          would also have db_client which is connected to a guild
         """
         self.mongo_db_access = self.DB_access(db_name=platform_id)
-        self.guild_msg = f"PLATFORMID: {platform_id}:"
 
     def _do_analytics_write_transaction(
         self,
@@ -84,15 +82,16 @@ class MongoDBOps:
           also insertion of activities_list and heatmaps_list after
 
         """
-        self.guild_msg = f"PLATFORMID: {platform_id}:"
+        # kept local, as the instance could be shared between concurrent platforms
+        guild_msg = f"PLATFORMID: {platform_id}:"
 
         if delete_heatmaps:
-            logging.info(f"{self.guild_msg} Removing Heatmaps data!")
+            logging.info(f"{guild_msg} Removing Heatmaps data!")
             self.empty_collection(
                 session=session, platform_id=platform_id, activity="heatmaps"
             )
         if delete_member_acitivities:
-            logging.info(f"{self.guild_msg} Removing MemberActivities MongoDB data!")
+            logging.info(f"{guild_msg} Removing MemberActivities MongoDB data!")
             self.empty_collection(
                 session=session, platform_id=platform_id, activity="memberactivities"
             )
@@ -130,10 +129,11 @@ class MongoDBOps:
             the platform_id to insert data to it
         """
         memberactivities_collection = session.client[platform_id].memberactivities
+        guild_msg = f"PLATFORMID: {platform_id}:"
         self._batch_insertion(
             collection=memberactivities_collection,
             data=acitivities_list,
-            message=f"{self.guild_msg} Inserting memberactivities documents to MongoDB",
+            message=f"{guild_msg} Inserting memberactivities documents to MongoDB",
             batch_size=batch_size,
         )
 
@@ -154,11 +154,12 @@ class MongoDBOps:
             the platform_id to insert data to it
         """
         heatmaps_collection = session.client[platform_id].heatmaps
+        guild_msg = f"PLATFORMID: {platform_id}:"
 
         self._batch_insertion(
             heatmaps_collection,
             heatmaps_list,
-            message=f"{self.guild_msg} Inserting heatmaps documents to mongoDB",
+            message=f"{guild_msg} Inserting heatmaps documents to mongoDB",
             batch_size=batch_size,
         )
 
@@ -0,0 +1,218 @@
+import logging
+
+from neo4j.exceptions import Neo4jError
+from tc_analyzer_lib.schemas import GraphSchema
+from tc_analyzer_lib.utils.instrumentation import increment
+from tc_neo4j_lib.neo4j_ops import Neo4jOps, Query
+
+# the plan operators reading all the nodes of a label or relationships of a type
+SCAN_OPERATORS = (
+    "AllNodesScan",
+    "NodeByLabelScan",
+    "DirectedRelationshipTypeScan",
+    "UndirectedRelationshipTypeScan",
+    "DirectedAllRelationshipsScan",
+    "UndirectedAllRelationshipsScan",
+)
+
+
+class Neo4jSchemaBootstrap:
+    # the schema queries already run successfully within the process
+    _bootstrapped: set[str] = set()
+
+    def __init__(self, graph_schema: GraphSchema) -> None:
+        """
+        ensure the constraints and indexes the analyzer queries rely on exist
+
+        Parameters
+        ------------
+        graph_schema : GraphSchema
+            the schema of graph to create its constraints and indexes
+        """
+        self.graph_schema = graph_schema
+        self.neo4j_ops = Neo4jOps.get_instance()
+
+    def make_schema_queries(self) -> list[Query]:
+        """
+        make the idempotent queries creating the constraints and indexes
+        - uniqueness of the `id` of the member and platform nodes
+        - `platformId` and `date` of the interacted with relationships
+        - `date` of the interacted in and platform metrics relationships
+
+        Returns
+        ---------
+        queries : list[Query]
+            the schema queries, each to be run in its own transaction
+        """
+        queries: list[Query] = []
+        for label in [self.graph_schema.user_label, self.graph_schema.platform_label]:
+            queries.append(
+                Query(
+                    f"""
+                    CREATE CONSTRAINT {label.lower()}_id_unique IF NOT EXISTS
+                    FOR (n:{label}) REQUIRE n.id IS UNIQUE
+                    """,
+                    {},
+                )
+            )
+
+        relationship_indexes = {
+            self.graph_schema.interacted_with_rel: ["platformId", "date"],
+            self.graph_schema.interacted_in_rel: ["date"],
+            self.graph_schema.have_metrics_rel: ["date"],
+        }
+        for rel_type, properties in relationship_indexes.items():
+            index_name = "_".join([rel_type.lower()] + [p.lower() for p in properties])
+            properties_str = ", ".join(f"r.{property}" for property in properties)
+            queries.append(
+                Query(
+                    f"""
+                    CREATE INDEX {index_name} IF NOT EXISTS
+                    FOR ()-[r:{rel_type}]-() ON ({properties_str})
+                    """,
+                    {},
+                )
+            )
+
+        return queries
+
+    def bootstrap(self) -> None:
+        """
+        create the constraints and indexes that don't exist
+        each would be created just once within a process
+
+        a failing query (i.e. duplicate ids preventing the uniqueness constraint)
+        is logged and the others would still be created
+        the failed ones would be tried again on the next bootstrap
+        """
+        failed_count = 0
+        for query in self.make_schema_queries():
+            if query.query in Neo4jSchemaBootstrap._bootstrapped:
+                continue
+
+            increment("neo4j.queries")
+            try:
+                self.neo4j_ops.neo4j_driver.execute_query(
+                    query.query, parameters_=query.parameters
+                )
+            except Neo4jError as exp:
+                logging.error(
+                    f"Failed to create neo4j schema! query: {query.query.strip()}, "
+                    f"exp: {exp}"
+                )
+                failed_count += 1
+            else:
+                Neo4jSchemaBootstrap._bootstrapped.add(query.query)
+
+        if failed_count:
+            logging.warning(
+                f"Neo4j schema of {self.graph_schema.platform_label} bootstrapped "
+                f"partially, {failed_count} queries failed and would be retried!"
+            )
+        else:
+            logging.info(
+                f"Neo4j schema bootstrapped for {self.graph_schema.platform_label}!"
+            )
+
+    def make_lookup_queries(self) -> dict[str, Query]:
+        """
+        make the representative lookups of the analyzer queries
+        to check their query plans
+
+        Returns
+        ---------
+        queries : dict[str, Query]
+            the lookup queries, with their name as keys
+        """
+        user_label = self.graph_schema.user_label
+        platform_label = self.graph_schema.platform_label
+        params = {"id": "", "platform_id": "", "date": 0.0}
+
+        return {
+            "member_by_id": Query(
+                f"MATCH (a:{user_label} {{id: $id}}) RETURN a", params
+            ),
+            "platform_by_id": Query(
+                f"MATCH (g:{platform_label} {{id: $platform_id}}) RETURN g", params
+            ),
+            "interacted_with_by_platform_date": Query(
+                f"""
+                MATCH ()-[r:{self.graph_schema.interacted_with_rel}]->()
+                WHERE r.platformId = $platform_id AND r.date = $date
+                RETURN r
+                """,
+                params,
+            ),
+            "interacted_in_by_date": Query(
+                f"""
+                MATCH ()-[r:{self.graph_schema.interacted_in_rel}]->()
+                WHERE r.date = $date
+                RETURN r
+                """,
+                params,
+            ),
+            "have_metrics_by_date": Query(
+                f"""
+                MATCH ()-[r:{self.graph_schema.have_metrics_rel}]->()
+                WHERE r.date = $date
+                RETURN r
+                """,
+                params,
+            ),
+        }
+
+    def report_label_scans(self) -> dict[str, list[str]]:
+        """
+        find the analyzer lookups that would scan a whole label or relationship type
+        meaning their backing index is missing (or not online yet)
+        the lookups are just explained, and are not run
+
+        Returns
+        ---------
+        report : dict[str, list[str]]
+            the lookups having scans in their plan, with their scan operators
+            would be empty if all the lookups use the indexes
+        """
+        report: dict[str, list[str]] = {}
+        for name, query in self.make_lookup_queries().items():
+            increment("neo4j.queries")
+            _, summary, _ = self.neo4j_ops.neo4j_driver.execute_query(
+                "EXPLAIN " + query.query, parameters_=query.parameters
+            )
+            scans = self._find_scan_operators(summary.plan)
+            if scans:
+                logging.warning(
+                    f"Neo4j lookup `{name}` of {self.graph_schema.platform_label} "
+                    f"is scanning the graph using: {scans}"
+                )
+                report[name] = scans
+
+        return report
+
+    def _find_scan_operators(self, plan: dict | None) -> list[str]:
+        """
+        find the scan operators within a query plan and its children
+
+        Parameters
+        ------------
+        plan : dict | None
+            the plan of a query, as returned within the neo4j result summary
+
+        Returns
+        ---------
+        scans : list[str]
+            the scan operators used in plan
+        """
+        if plan is None:
+            return []
+
+        scans: list[str] = []
+        # the operator types could include the runtime i.e. `NodeByLabelScan@neo4j`
+        operator = plan.get("operatorType", "").split("@")[0]
+        if operator in SCAN_OPERATORS:
+            scans.append(operator)
+
+        for child in plan.get("children", []):
+            scans.extend(self._find_scan_operators(child))
+
+        return scans
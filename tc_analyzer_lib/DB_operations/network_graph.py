@@ -45,9 +45,49 @@ class NetworkGraph:
             networkx_graphs=graph_list,
             networkx_dates=graph_dates,
         )
+        queries_list.append(self.make_graph_dates_query(graph_dates))
 
         return queries_list
 
+    def make_neo4j_networkx_queries(
+        self,
+        networkx_graphs: dict[datetime.datetime, networkx.classes.graph.Graph],
+    ) -> tuple[list[Query], list[Query]]:
+        """
+        make the queries to store networkx graphs into the neo4j
+        the node and relationship queries are returned separately
+        so the relationships could be written after all the nodes are created
+        Note: the latest graph date query (`make_graph_dates_query`) isn't included,
+        it should be run after the last relationship is written
+
+        Parameters:
+        -------------
+        networkx_graphs : dictionary of networkx.classes.graph.Graph
+                            or networkx.classes.digraph.DiGraph
+            the dictinoary keys is the date of graph and the values
+            are the actual networkx graphs
+
+        Returns:
+        -----------
+        node_queries : list[Query]
+            the MERGE queries for creating the nodes of all graphs
+        rel_queries : list[Query]
+            the MERGE queries for creating the relationships of all graphs
+        """
+        node_queries: list[Query] = []
+        rel_queries: list[Query] = []
+
+        for date, graph in networkx_graphs.items():
+            graph_node_queries, graph_rel_queries = self.create_network_query(
+                graph.nodes.data(),
+                graph.edges.data(),
+                date,
+            )
+            node_queries.extend(graph_node_queries)
+            rel_queries.extend(graph_rel_queries)
+
+        return node_queries, rel_queries
+
     def make_graph_list_query(
         self,
         networkx_graphs: networkx.classes.graph.Graph,
@@ -209,6 +249,201 @@ class NetworkGraph:
 
         return node_queries, rel_queries
 
+    def make_graph_dates_query(self, graph_dates: list[datetime.datetime]) -> Query:
+        """
+        make the query to keep the latest graph date on the platform node
+        so it could be read without scanning the relationships
+        the `latestGraphDate` would just move forward to the latest given date
+
+        Note: it should be run after all the relationships of graphs are written,
+        so the readers wouldn't see a date whose graph isn't complete yet
+
+        Parameters:
+        -------------
+        graph_dates : list[datetime.datetime]
+            the dates of the graphs being written
+
+        Returns:
+        -----------
+        query : Query
+            the query updating the latest graph date of the platform node
+        """
+        query_str = f"""
+            MERGE (g:{self.graph_schema.platform_label} {{id: $platform_id}})
+                ON CREATE SET g.createdAt = $date_now_timestamp
+            WITH g
+            WHERE $latest_date IS NOT NULL
+                AND (g.latestGraphDate IS NULL OR g.latestGraphDate < $latest_date)
+            SET g.latestGraphDate = $latest_date
+        """
+        parameters = {
+            "platform_id": self.platform_id,
+            "latest_date": max(
+                (int(self.get_timestamp(date)) for date in graph_dates),
+                default=None,
+            ),
+            "date_now_timestamp": int(self.get_timestamp()),
+        }
+        return Query(query_str, parameters)
+
+    def make_persisted_graph_queries(
+        self, graph_dates: list[datetime.datetime]
+    ) -> tuple[Query, Query]:
+        """
+        make the queries to read the graph already persisted for the platform
+        used to write just the changes of a graph (see `make_neo4j_delta_queries`)
+
+        Parameters:
+        -------------
+        graph_dates : list[datetime.datetime]
+            the dates of the graphs to be written
+
+        Returns:
+        -----------
+        members_query : Query
+            the query returning the `id` of the members of platform
+        edges_query : Query
+            the query returning the interactions of the given dates
+            as `source`, `target`, `date`, and `weight`
+        """
+        user_label = self.graph_schema.user_label
+        platform_label = self.graph_schema.platform_label
+
+        members_query = Query(
+            f"""
+            MATCH (a:{user_label})
+                -[:{self.graph_schema.member_relation}]->
+                (:{platform_label} {{id: $platform_id}})
+            RETURN a.id AS id
+            """,
+            {"platform_id": self.platform_id},
+        )
+        edges_query = Query(
+            f"""
+            MATCH (a:{user_label})
+                -[r:{self.graph_schema.interacted_with_rel}
+                    {{platformId: $platform_id}}]->
+                (b:{user_label})
+            WHERE r.date IN $dates
+            RETURN a.id AS source, b.id AS target, r.date AS date, r.weight AS weight
+            """,
+            {
+                "platform_id": self.platform_id,
+                "dates": [int(self.get_timestamp(date)) for date in graph_dates],
+            },
+        )
+        return members_query, edges_query
+
+    def make_neo4j_delta_queries(
+        self,
+        networkx_graphs: dict[datetime.datetime, networkx.classes.graph.Graph],
+        persisted_members: set[str],
+        persisted_edges: set[tuple[str, str, int, int]],
+        batch_size: int = 1000,
+    ) -> tuple[list[Query], list[Query]]:
+        """
+        make the queries to store just the changes of the networkx graphs
+        compared to the graph already persisted on neo4j
+        the nodes and relationships are written in bulk using `UNWIND`
+        Note: the latest graph date query (`make_graph_dates_query`) isn't included,
+        it should be run after the last relationship is written
+
+        Parameters:
+        -------------
+        networkx_graphs : dictionary of networkx.classes.graph.Graph
+                            or networkx.classes.digraph.DiGraph
+            the dictinoary keys is the date of graph and the values
+            are the actual networkx graphs
+        persisted_members : set[str]
+            the accounts that are already members of the platform
+        persisted_edges : set[tuple[str, str, int, int]]
+            the interactions already persisted, each as a tuple of
+            `(source account, target account, date timestamp, weight)`
+        batch_size : int
+            the maximum count of nodes or relationships written in each query
+
+        Returns:
+        -----------
+        node_queries : list[Query]
+            the queries creating the new members of platform
+        rel_queries : list[Query]
+            the queries creating the new relationships
+        """
+        date_now_timestamp = int(self.get_timestamp())
+
+        new_members: set[str] = set()
+        edges_per_date: dict[int, list[dict]] = {}
+        for date, graph in networkx_graphs.items():
+            date_timestamp = int(self.get_timestamp(date))
+            nodes_dict = graph.nodes.data()
+
+            for _, node_data in nodes_dict:
+                if node_data["acc_name"] not in persisted_members:
+                    new_members.add(node_data["acc_name"])
+
+            for source, target, edge_data in graph.edges.data():
+                edge = (
+                    nodes_dict[source]["acc_name"],
+                    nodes_dict[target]["acc_name"],
+                    date_timestamp,
+                    int(edge_data["weight"]),
+                )
+                if edge not in persisted_edges:
+                    edges_per_date.setdefault(date_timestamp, []).append(
+                        {"source": edge[0], "target": edge[1], "weight": edge[3]}
+                    )
+
+        user_label = self.graph_schema.user_label
+        node_query_str = f"""
+            MERGE (g:{self.graph_schema.platform_label} {{id: $platform_id}})
+                ON CREATE SET g.createdAt = $date_now_timestamp
+            WITH g
+            UNWIND $accounts AS account
+            MERGE (a:{user_label} {{id: account}})
+                ON CREATE SET a.createdAt = $date_now_timestamp
+            MERGE (a)-[rel_platform:{self.graph_schema.member_relation}]->(g)
+                ON CREATE SET rel_platform.createdAt = $date_now_timestamp
+        """
+        rel_query_str = f"""
+            UNWIND $edges AS edge
+            MATCH (a:{user_label} {{id: edge.source}})
+            MATCH (b:{user_label} {{id: edge.target}})
+            MERGE (a)-[:{self.graph_schema.interacted_with_rel}
+                {{
+                    date: $date,
+                    weight: edge.weight,
+                    platformId: $platform_id
+                }}
+            ]->(b)
+        """
+
+        accounts = sorted(new_members)
+        node_queries = [
+            Query(
+                node_query_str,
+                {
+                    "accounts": accounts[idx : idx + batch_size],
+                    "date_now_timestamp": date_now_timestamp,
+                    "platform_id": self.platform_id,
+                },
+            )
+            for idx in range(0, len(accounts), batch_size)
+        ]
+        rel_queries = [
+            Query(
+                rel_query_str,
+                {
+                    "edges": edges[idx : idx + batch_size],
+                    "date": date_timestamp,
+                    "platform_id": self.platform_id,
+                },
+            )
+            for date_timestamp, edges in edges_per_date.items()
+            for idx in range(0, len(edges), batch_size)
+        ]
+
+        return node_queries, rel_queries
+
     def get_timestamp(self, time: datetime.datetime | None = None) -> float:
         """
         get the timestamp of the given time or just now
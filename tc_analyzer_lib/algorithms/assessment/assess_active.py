@@ -40,6 +40,6 @@ def assess_active(
     thr_overlap = intersect1d(thr_ind, thr_uw_deg)
 
     # obtain active account names in this period and store in dictionary
-    all_active[str(w_i)] = set(acc_names[thr_overlap])
+    all_active[str(w_i)] = set(acc_names[thr_overlap].tolist())
 
     return all_active
@@ -34,6 +34,6 @@ def assess_connected(
     """
 
     # obtain connected account names in this period and store in dictionary
-    all_connected[str(w_i)] = set(acc_names[thr_uw_thr_deg])
+    all_connected[str(w_i)] = set(acc_names[thr_uw_thr_deg].tolist())
 
     return all_connected
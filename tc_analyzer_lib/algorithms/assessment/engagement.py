@@ -74,6 +74,7 @@ class EngagementAssessment:
         all_lurker,
         all_about_to_disengage,
         all_disengaged_in_past,
+        build_graph=True,
     ):
         """
         Assess engagment levels for all active members in a time period
@@ -94,6 +95,10 @@ class EngagementAssessment:
             dictionary with keys w_i and values
             containing a list of all account names belonging to engagement
             category *
+        build_graph : bool
+            whether to build the networkx graph of the window
+            if False, `None` would be returned instead of the graph
+            default is True
 
         act_param : dict[str, int]
             parameters for activity types:
@@ -128,7 +133,7 @@ class EngagementAssessment:
 
         Returns:
         ---------
-        graph : networkx.DiGraph
+        graph : networkx.DiGraph | None
             networkx object for int_mat
         all_* : dict[str, [str]]
             dictionary with keys w_i and values
@@ -149,6 +154,7 @@ class EngagementAssessment:
             activities=self.activities,
             ignore_axis_0_activities=self.activities_ignore_0_axis,
             ignore_axis_1_activities=self.activities_ignore_1_axis,
+            build_graph=build_graph,
         )
 
         # # # ACTIVE # # #
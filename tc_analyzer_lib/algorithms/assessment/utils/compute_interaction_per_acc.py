@@ -1,5 +1,3 @@
-import copy
-
 import numpy as np
 import numpy.typing as npt
 from networkx import DiGraph
@@ -16,7 +14,7 @@ def thr_int(
     activities: list[str],
     **kwargs,
 ) -> tuple[
-    npt.NDArray[np.int32], npt.NDArray[np.int32], npt.NDArray[np.int32], DiGraph
+    npt.NDArray[np.int32], npt.NDArray[np.int32], npt.NDArray[np.int32], DiGraph | None
 ]:
     """
     Computes number of interactions and connections per account
@@ -43,6 +41,10 @@ def thr_int(
             ignore the axis zero of matrix of given activites
         ignore_axis_1_activities : list[str]
             ignore the axis one of matrix of given activites
+        build_graph : bool
+            whether to build the networkx graph of the interactions
+            the thresholds are computed on the matrix, so it's just needed
+            if the graph is going to be used. default is True
 
     Returns:
     ---------
@@ -56,11 +58,13 @@ def thr_int(
         index numbers of account names with at
         least UW_THR_DEG_THR connections of at least EDGE_STR_THR
         interactions each
-    graph : networkx.DiGraph
+    graph : networkx.DiGraph | None
         the network graph of active members
+        would be `None` if `build_graph` was False
     """
     ignore_axis_0_activities: list[str] = kwargs.get("ignore_axis_0_activities", [])
     ignore_axis_1_activities: list[str] = kwargs.get("ignore_axis_1_activities", [])
+    build_graph: bool = kwargs.get("build_graph", True)
 
     # int_analysis is for all actions and interactions
     int_analysis = get_analysis_vector(
@@ -79,7 +83,7 @@ def thr_int(
         # matrix for action and interactions
         matrix += int_mat[activity]
 
-    graph = make_graph(matrix)
+    graph = make_graph(matrix) if build_graph else None
 
     # # # TOTAL INTERACTIONS # # #
 
@@ -89,28 +93,23 @@ def thr_int(
     # # # TOTAL CONNECTIONS # # #
 
     # get unweighted node degree value for each node
-    all_degrees = np.array([val for (_, val) in graph.degree()])
+    # the same as the graph's degree, each nonzero entry is an edge
+    # so a self-loop (on diagonal) is counted twice
+    all_degrees = get_unweighted_degrees(matrix != 0)
 
     # compare total unweighted node degree to interaction threshold
     thr_uw_deg = np.where(all_degrees >= UW_DEG_THR)[0]
 
     # # # THRESHOLDED CONNECTIONS # # #
 
-    # preparing matrix with no `action` and just interactions
+    # the edges with no `action` and just interactions
     # actions were self-intereaction and are on diagonal
-    matrix_interaction = copy.deepcopy(matrix)
-    matrix_interaction[np.diag_indices_from(matrix_interaction)] = 0
-    graph_interaction = make_graph(matrix_interaction)
-
-    # filtering the `at least interaction count` from the graph
-    graph_interaction_thresh = remove_edges_below_threshold(
-        graph_interaction, EDGE_STR_THR
-    )
+    # filtering the `at least interaction count` edges
+    edges_interaction_thresh = (matrix != 0) & (matrix >= EDGE_STR_THR)
+    np.fill_diagonal(edges_interaction_thresh, False)
 
     # get unweighted node degree value for each node from interaction network
-    all_degrees_thresh = np.array(
-        [val for (_, val) in graph_interaction_thresh.degree()]
-    )
+    all_degrees_thresh = get_unweighted_degrees(edges_interaction_thresh)
 
     # compare total unweighted node degree after thresholding to threshold
     thr_uw_thr_deg = np.where(all_degrees_thresh > UW_THR_DEG_THR)[0]
@@ -118,21 +117,22 @@ def thr_int(
     return (thr_ind, thr_uw_deg, thr_uw_thr_deg, graph)
 
 
-def remove_edges_below_threshold(
-    graph: DiGraph, EDGE_STR_THR: int, weight_name: str = "weight"
-) -> DiGraph:
+def get_unweighted_degrees(edges: npt.NDArray[np.bool_]) -> npt.NDArray[np.int64]:
     """
-    remove the edges that has a weight below the threshold
+    get the unweighted degree (in-degree + out-degree) of each node
+
+    Parameters:
+    -------------
+    edges : npt.NDArray[np.bool_]
+        2D squared matrix showing whether an edge from row to column node exists
+
+    Returns:
+    ----------
+    degrees : npt.NDArray[np.int64]
+        the degree of each node
     """
-    graph_copy = copy.deepcopy(graph)
-    graph_copy.remove_edges_from(
-        [
-            (n1, n2)
-            for n1, n2, w in graph_copy.edges(data=weight_name)
-            if w < EDGE_STR_THR
-        ]
-    )
-    return graph_copy
+    degrees = np.count_nonzero(edges, axis=1) + np.count_nonzero(edges, axis=0)
+    return degrees
 
 
 def get_analysis_vector(
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import Any
 
 from numpy import diag_indices_from, ndarray
+from tc_analyzer_lib.metrics.heatmaps.heatmaps_buffer import HeatmapsBuffer
 from tc_analyzer_lib.utils.mongo import MongoSingleton
 
 from .utils.compute_interaction_mtx_utils import (
@@ -19,6 +20,7 @@ def compute_interaction_matrix_discord(
     platform_id: str,
     interactions: list[str],
     actions: list[str],
+    heatmaps_buffer: HeatmapsBuffer | None = None,
 ) -> dict[str, ndarray]:
     """
     Computes interaction matrix from discord data
@@ -45,6 +47,10 @@ def compute_interaction_matrix_discord(
         the list of action activities to generate the matrix for
         we would assume actions as self-interactions in matrix
         minimum length is 1
+    heatmaps_buffer : HeatmapsBuffer | None
+        the in-memory heatmaps of the current run
+        if given, the days covered by the buffer would be read from it
+        and just the days before it would be read from database
 
     Output:
     ---------
@@ -61,24 +67,43 @@ def compute_interaction_matrix_discord(
         **feature_projection,
         "user": True,
     }
-    query = {
-        "$and": [
-            {"user": {"$in": acc_names}},
-            {resource_identifier: {"$in": resources}},
-            {
-                "date": {
-                    "$gte": date_range[0],
-                    "$lt": date_range[1],
-                }
-            },
-        ]
-    }
-
-    cursor = client[platform_id]["heatmaps"].find(
-        query,
-        feature_projection,
-    )
-    db_results = list(cursor)
+    database_end_date = date_range[1]
+    if heatmaps_buffer is not None:
+        heatmaps_buffer.wait_until(date_range[1])
+        database_end_date = heatmaps_buffer.split_date(date_range[0], date_range[1])
+
+    db_results = []
+    if date_range[0] < database_end_date:
+        query = {
+            "$and": [
+                {"user": {"$in": acc_names}},
+                {resource_identifier: {"$in": resources}},
+                {
+                    "date": {
+                        "$gte": date_range[0],
+                        "$lt": database_end_date,
+                    }
+                },
+            ]
+        }
+
+        cursor = client[platform_id]["heatmaps"].find(
+            query,
+            feature_projection,
+        )
+        db_results = list(cursor)
+
+    if heatmaps_buffer is not None:
+        db_results.extend(
+            heatmaps_buffer.find(
+                start_date=database_end_date,
+                end_date=date_range[1],
+                users=acc_names,
+                resources=resources,
+                resource_identifier=resource_identifier,
+                projection=list(feature_projection.keys()),
+            )
+        )
 
     per_acc_query_result = prepare_per_account(db_results=db_results)
     per_acc_interaction = process_actions(
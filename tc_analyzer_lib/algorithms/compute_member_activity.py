@@ -12,19 +12,19 @@ import networkx as nx
 import numpy as np
 from dateutil.relativedelta import relativedelta
 from tc_analyzer_lib.algorithms.member_activity_history import check_past_history
+from tc_analyzer_lib.algorithms.utils.account_dictionary import AccountDictionary
 from tc_analyzer_lib.algorithms.utils.member_activity_history_utils import (
     MemberActivityPastUtils,
 )
 from tc_analyzer_lib.algorithms.utils.member_activity_utils import (
     assess_engagement,
-    convert_to_dict,
     get_joined_accounts,
     get_latest_joined_users,
     get_users_past_window,
     store_based_date,
-    update_activities,
 )
 from tc_analyzer_lib.DB_operations.mongodb_access import DB_access
+from tc_analyzer_lib.metrics.heatmaps.heatmaps_buffer import HeatmapsBuffer
 from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
 
 
@@ -38,6 +38,9 @@ def compute_member_activity(
     window_param: dict[str, int],
     act_param: dict[str, int],
     load_past_data=True,
+    heatmaps_buffer: HeatmapsBuffer | None = None,
+    from_date: datetime | None = None,
+    latest_graph_only: bool = False,
 ):
     """
     Computes member activity and member interaction network
@@ -108,6 +111,17 @@ def compute_member_activity(
     load_past_data : bool
         whether to load past data or not, default is True
         if True, will load the past data, if data was available in given range
+    heatmaps_buffer : HeatmapsBuffer | None
+        the heatmaps being produced in the current run
+        if given, the windows would wait for their days to be produced
+        and read them from memory instead of database
+    from_date : datetime | None
+        the date of the latest memberactivities already stored
+        if given, just the documents after it would be returned
+    latest_graph_only : bool
+        if True, just the graph of the final window would be built
+        and for the other windows just their activities are computed
+        default is False meaning to return the graphs of all windows
     """
     platform_msg = f"PLATFORM_ID: {platform_id}:"
 
@@ -144,6 +158,10 @@ def compute_member_activity(
     }
     activities_name = list(activity_dict.keys())
 
+    # the accounts are kept as integer codes within the computations
+    # and decoded back to their ids just when preparing the documents
+    account_dictionary = AccountDictionary()
+
     if load_past_data:
         # past_activities_date is the data from past activities
         # new_date_range is defined to change the date_range with past data loaded
@@ -153,6 +171,11 @@ def compute_member_activity(
             date_range=date_range,
             collection_name="memberactivities",
             window_param=window_param,
+            # `all_joined` is recomputed from `all_joined_day`
+            categories=[
+                activity for activity in activities_name if activity != "all_joined"
+            ],
+            account_dictionary=account_dictionary,
         )
     else:
         past_activities_data = {}
@@ -161,12 +184,10 @@ def compute_member_activity(
 
     # if in past there was an activity, we'll update the dictionaries
     if past_activities_data != {}:
-        activities = update_activities(
-            past_activities=past_activities_data, activities_list=activities_name
-        )
-        activity_dict = convert_to_dict(
-            data=list(activities), dict_keys=activities_name
-        )
+        activity_dict = {
+            activity: past_activities_data.get(activity, {})
+            for activity in activities_name
+        }
 
     # if there was still a need to analyze some data in the range
     # also if there was some accounts and channels to be analyzed
@@ -193,6 +214,7 @@ def compute_member_activity(
             all_joined_day=activity_dict["all_joined_day"],
             starting_key=starting_key,
             window_d=window_param["period_size"],
+            account_dictionary=account_dictionary,
         )
 
         # # # DEFINE SLIDING WINDOW RANGE # # #
@@ -237,6 +259,7 @@ def compute_member_activity(
                     window_start_date=window_start,
                     window_end_date=last_date,
                     collection=db_access.db_mongo_client[platform_id]["heatmaps"],
+                    heatmaps_buffer=heatmaps_buffer,
                 )
 
                 if acc_names == []:
@@ -269,8 +292,21 @@ def compute_member_activity(
                     activities_name=activities_name,
                     activity_dict=activity_dict,
                     analyzer_config=analyzer_config,
+                    heatmaps_buffer=heatmaps_buffer,
+                    build_graph=(not latest_graph_only or w_i == max_range - 1),
+                    account_dictionary=account_dictionary,
                 )
 
+                # the next windows won't need the days before their start
+                if heatmaps_buffer is not None:
+                    heatmaps_buffer.discard_before(
+                        window_start + relativedelta(days=window_param["step_size"])
+                    )
+
+                # the graphs of non-final windows won't be used
+                if latest_graph_only and w_i != max_range - 1:
+                    continue
+
                 # make empty dict for node attributes
                 node_att = {}
 
@@ -301,6 +337,8 @@ def compute_member_activity(
         analytics_day_range=window_param["period_size"] - 1,
         joined_acc_dict=joined_acc_dict,
         load_past=load_past_data,
+        from_date=from_date,
+        account_dictionary=account_dictionary,
         empty_channel_acc=(len(resources) != 0 and len(acc_names) != 0),
     )
 
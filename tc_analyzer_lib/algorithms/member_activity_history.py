@@ -2,11 +2,36 @@
 
 from datetime import datetime, timedelta, timezone
 
+from tc_analyzer_lib.algorithms.utils.account_dictionary import AccountDictionary
 from tc_analyzer_lib.algorithms.utils.member_activity_history_utils import (
     MemberActivityPastUtils,
 )
 from tc_analyzer_lib.DB_operations.mongodb_access import DB_access
 
+# the categories stored in each memberactivities document
+MEMBERACTIVITIES_CATEGORIES = (
+    "all_joined",
+    "all_joined_day",
+    "all_consistent",
+    "all_vital",
+    "all_active",
+    "all_connected",
+    "all_paused",
+    "all_new_disengaged",
+    "all_disengaged",
+    "all_unpaused",
+    "all_returned",
+    "all_new_active",
+    "all_still_active",
+    "all_dropped",
+    "all_disengaged_were_vital",
+    "all_disengaged_were_newly_active",
+    "all_disengaged_were_consistently_active",
+    "all_lurker",
+    "all_about_to_disengage",
+    "all_disengaged_in_past",
+)
+
 
 # the main script function
 def check_past_history(
@@ -15,6 +40,8 @@ def check_past_history(
     window_param: dict[str, int],
     collection_name: str = "memberactivities",
     verbose=False,
+    categories: list[str] | None = None,
+    account_dictionary: AccountDictionary | None = None,
 ):
     """
     check past member_activities history and
@@ -36,6 +63,12 @@ def check_past_history(
         default is `memberactivities`
     verbose : bool
         whether to print the logs or not
+    categories : list[str] | None
+        the memberactivities categories to load from the past
+        default is `None` meaning to load all the categories
+    account_dictionary : AccountDictionary | None
+        if given, the past activities would have the integer codes of the users
+        interned within this dictionary instead of their ids
 
     Returns:
     ----------
@@ -61,49 +94,28 @@ def check_past_history(
 
     member_act_past_utils = MemberActivityPastUtils(db_access=db_access)
 
-    # creating the query
-    query = member_act_past_utils.create_past_history_query(date_range)
-
-    # do not project the variables that we don't need
-    feature_projection = {
-        # 'first_end_date': 1,
-        # 'all_consistent': 1,
-        "_id": 0
-    }
-    # sorting the results from past to now (ascending)
-    # sorting by `date`
-    sorting = ["date", 1]
-
-    # quering the db now
-    cursor = db_access.query_db_find(
-        collection_name, query, feature_projection, sorting
+    if categories is None:
+        categories = list(MEMBERACTIVITIES_CATEGORIES)
+
+    # just the needed categories are loaded, interned in a columnar form
+    history = member_act_past_utils.get_past_history(
+        date_range, categories, collection_name, account_dictionary
     )
-    # getting a list of returned data
-    past_data_new_schema = list(cursor)
 
     db_analysis_end_date: datetime | None
 
     # if any past data was available in DB
-    if past_data_new_schema != []:
-        if verbose:
-            print(past_data_new_schema)
+    if len(history) != 0:
+        db_analysis_end_date = history.dates[-1]
 
-        # db_analysis_start_date = parser.parse(past_data[0]['date'])
-        # db_analysis_start_date = date_range_start
-        db_analysis_end_date = past_data_new_schema[-1]["date"]
-
-        # days_after_analysis_start = (
-        #       db_analysis_end_date - db_analysis_start_date
-        # ).days
-
-        past_data = member_act_past_utils.convert_back_to_old_schema(
-            past_data_new_schema,
-            date_range_start,
-            window_param=window_param,
-        )
+        past_data = history.to_activity_dict(decode=account_dictionary is None)
+        past_data["first_end_date"] = (
+            date_range_start - timedelta(days=window_param["period_size"])
+        ).isoformat()
 
+        if verbose:
+            print(past_data)
     else:
-        # db_analysis_start_date = None
         db_analysis_end_date = None
 
     if db_analysis_end_date:
@@ -128,7 +140,7 @@ def check_past_history(
         all_activity_data_dict = past_data
         # maximum key is used for having the key for future data
         # maximum_key = days_after_analysis_start + 1
-        maximum_key = len(past_data_new_schema)
+        maximum_key = len(history)
     else:
         all_activity_data_dict = {}
         new_date_range = [date_range_start, date_range_end]
@@ -5,7 +5,7 @@ from uuid import uuid1
 import pandas as pd
 from tc_analyzer_lib.algorithms.neo4j_analysis.utils import ProjectionUtils
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib.neo4j_ops import Neo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class NodeStats:
@@ -33,7 +33,7 @@ class NodeStats:
             - else it is balanced
 
         """
-        neo4j_ops = Neo4jOps.get_instance()
+        neo4j_ops = CountedNeo4jOps.get_instance()
         self.gds = neo4j_ops.gds
         self.driver = neo4j_ops.neo4j_driver
         self.threshold = threshold
@@ -41,10 +41,35 @@ class NodeStats:
         self.graph_schema = graph_schema
         self.projection_utils = ProjectionUtils(self.platform_id, self.graph_schema)
 
-    def compute_stats(self, from_start: bool) -> None:
+    def compute_stats(
+        self,
+        from_start: bool,
+        projected_graphs: dict[float, str] | None = None,
+    ) -> None:
         """
         from_start is disabled. We would always compute just for the latest date
+
+        Parameters
+        ------------
+        from_start : bool
+            whether to compute the metric from the first day or not
+        projected_graphs : dict[float, str] | None
+            already projected graphs (weighted with `NATURAL` direction) per date
+            to compute the stats on, instead of projecting a graph for each date
+            the graphs wouldn't be dropped here
+            default is `None` meaning the graphs would be projected here
         """
+        if projected_graphs is not None:
+            for date, graph_name in projected_graphs.items():
+                try:
+                    self.compute_graph_stats(date, graph_name)
+                except Exception as exp:
+                    msg = f"PLATFORMID: {self.platform_id} "
+                    logging.error(
+                        f"{msg} node stats computation for date: {date}, exp: {exp}"
+                    )
+            return
+
         # possible dates to do the computations
         possible_dates = self.projection_utils.get_dates()
 
@@ -62,6 +87,36 @@ class NodeStats:
                     f"{msg} node stats computation for date: {date}, exp: {exp}"
                 )
 
+    async def compute_stats_async(
+        self,
+        from_start: bool,
+        projected_graphs: dict[float, str] | None = None,
+    ) -> None:
+        """
+        the async version of `compute_stats`
+        """
+        if projected_graphs is not None:
+            for date, graph_name in projected_graphs.items():
+                try:
+                    await self.compute_graph_stats_async(date, graph_name)
+                except Exception as exp:
+                    msg = f"PLATFORMID: {self.platform_id} "
+                    logging.error(
+                        f"{msg} node stats computation for date: {date}, exp: {exp}"
+                    )
+            return
+
+        possible_dates = await self.projection_utils.get_dates_async()
+
+        for date in possible_dates:
+            try:
+                await self.compute_node_stats_wrapper_async(date)
+            except Exception as exp:
+                msg = f"PLATFORMID: {self.platform_id} "
+                logging.error(
+                    f"{msg} node stats computation for date: {date}, exp: {exp}"
+                )
+
     def compute_node_stats_wrapper(self, date: float):
         """
         a wrapper for node stats computation process
@@ -87,34 +142,34 @@ class NodeStats:
             relation_direction="NATURAL",
             date=date,
         )
+        self.compute_graph_stats(date, graph_name)
+        _ = self.gds.run_cypher(
+            "CALL gds.graph.drop($graph_name) YIELD graphName",
+            {
+                "graph_name": graph_name,
+            },
+        )
+
+    def compute_graph_stats(self, date: float, graph_name: str) -> None:
+        """
+        compute the node stats on a projected graph and save them
+
+        Parameters:
+        ------------
+        date : float
+            timestamp of the relation
+        graph_name : str
+            the projected graph (weighted with `NATURAL` direction)
+        """
         natural_dc = self.gds.run_cypher(
-            """
-            CALL gds.degree.stream(
-                $graph_name,
-                {
-                    relationshipWeightProperty: 'weight'
-                }
-            )
-            YIELD nodeId, score
-            RETURN gds.util.asNode(nodeId).id AS userId, score
-            """,
+            self._degree_query(orientation="NATURAL"),
             {
                 "graph_name": graph_name,
             },
         )
 
         reverse_dc = self.gds.run_cypher(
-            """
-            CALL gds.degree.stream(
-                $graph_name,
-                {
-                    orientation: 'REVERSE',
-                    relationshipWeightProperty: 'weight'
-                }
-            )
-            YIELD nodeId, score
-            RETURN gds.util.asNode(nodeId).id AS userId, score
-            """,
+            self._degree_query(orientation="REVERSE"),
             {
                 "graph_name": graph_name,
             },
@@ -123,12 +178,62 @@ class NodeStats:
         df = self.get_date_stats(natural_dc, reverse_dc, threshold=self.threshold)
 
         self.save_properties_db(df, date)
-        _ = self.gds.run_cypher(
-            "CALL gds.graph.drop($graph_name) YIELD graphName",
-            {
-                "graph_name": graph_name,
-            },
+
+    async def compute_node_stats_wrapper_async(self, date: float):
+        """
+        the async version of `compute_node_stats_wrapper`
+        """
+        graph_name = f"GraphStats_{uuid1()}"
+
+        await self.projection_utils.project_temp_graph_async(
+            graph_name=graph_name,
+            weighted=True,
+            relation_direction="NATURAL",
+            date=date,
         )
+        try:
+            await self.compute_graph_stats_async(date, graph_name)
+        finally:
+            await self.projection_utils.drop_temp_graph_async(graph_name)
+
+    async def compute_graph_stats_async(self, date: float, graph_name: str) -> None:
+        """
+        the async version of `compute_graph_stats`
+        """
+        async_ops = self.projection_utils.async_ops
+        natural_dc = await async_ops.run_cypher(
+            self._degree_query(orientation="NATURAL"),
+            {"graph_name": graph_name},
+        )
+        reverse_dc = await async_ops.run_cypher(
+            self._degree_query(orientation="REVERSE"),
+            {"graph_name": graph_name},
+        )
+
+        df = self.get_date_stats(natural_dc, reverse_dc, threshold=self.threshold)
+        await self.save_properties_db_async(df, date)
+
+    def _degree_query(self, orientation: str) -> str:
+        """
+        the weighted degree centrality query of a projected graph
+
+        Parameters
+        ------------
+        orientation : str
+            either `NATURAL` (out degrees) or `REVERSE` (in degrees)
+        """
+        query = f"""
+            CALL gds.degree.stream(
+                $graph_name,
+                {{
+                    orientation: '{orientation}',
+                    relationshipWeightProperty: 'weight'
+                }}
+            )
+            YIELD nodeId, score
+            RETURN gds.util.asNode(nodeId).id AS userId, score
+            """
+        return query
 
     def get_computed_dates(self) -> set[float]:
         """
@@ -241,14 +346,7 @@ class NodeStats:
                 userId = row["userId"]
                 status = row["stats"]
 
-                query = f"""
-                    MATCH (a:{self.graph_schema.user_label} {{id: $userId}})
-                    MATCH (g:{self.graph_schema.platform_label} {{id: $platform_id}})
-                    MERGE (a) -[r:INTERACTED_IN {{
-                        date: $date
-                    }}] -> (g)
-                    SET r.status = $status
-                """
+                query = self._save_status_query()
                 session.run(
                     query,
                     userId=userId,
@@ -258,3 +356,51 @@ class NodeStats:
                 )
         prefix = f"PLATFORMID: {self.platform_id}: "
         logging.info(f"{prefix}Node stats saved for the date: {date}")
+
+    async def save_properties_db_async(
+        self, user_status: pd.DataFrame, date: float
+    ) -> None:
+        """
+        the async version of `save_properties_db`
+        all the statuses are saved using one query (`UNWIND`)
+        instead of one query per user
+        """
+        rows = [
+            {"userId": row["userId"], "status": int(row["stats"])}
+            for _, row in user_status.iterrows()
+        ]
+        query = f"""
+            UNWIND $rows AS row
+            {self._save_status_query(user_id="row.userId", status="row.status")}
+        """
+        await self.projection_utils.async_ops.run_cypher(
+            query,
+            {"rows": rows, "platform_id": self.platform_id, "date": date},
+        )
+        prefix = f"PLATFORMID: {self.platform_id}: "
+        logging.info(f"{prefix}Node stats saved for the date: {date}")
+
+    def _save_status_query(
+        self, user_id: str = "$userId", status: str = "$status"
+    ) -> str:
+        """
+        the query to save the status of a user
+
+        Parameters
+        ------------
+        user_id : str
+            the cypher expression of user id
+            default is the `$userId` parameter
+        status : str
+            the cypher expression of the user status
+            default is the `$status` parameter
+        """
+        query = f"""
+            MATCH (a:{self.graph_schema.user_label} {{id: {user_id}}})
+            MATCH (g:{self.graph_schema.platform_label} {{id: $platform_id}})
+            MERGE (a) -[r:INTERACTED_IN {{
+                date: $date
+            }}] -> (g)
+            SET r.status = {status}
+        """
+        return query
@@ -7,7 +7,9 @@ from tc_analyzer_lib.algorithms.neo4j_analysis.utils import (
     ProjectionUtils,
 )
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib.neo4j_ops import Neo4jOps, Query
+from tc_analyzer_lib.utils.neo4j_async import AsyncNeo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
+from tc_neo4j_lib.neo4j_ops import Query
 
 
 class Centerality:
@@ -15,7 +17,7 @@ class Centerality:
         """
         centerality algorithms
         """
-        self.neo4j_ops = Neo4jOps.get_instance()
+        self.neo4j_ops = CountedNeo4jOps.get_instance()
         self.platform_id = platform_id
         self.graph_schema = graph_schema
 
@@ -67,7 +69,6 @@ class Centerality:
             the degree centerality per date for each user
         """
 
-        node = self.graph_schema.user_label
         weighted = True if "weighted" not in kwargs.keys() else kwargs["weighted"]
         normalize = False if "normalize" not in kwargs.keys() else kwargs["normalize"]
         preserve_parallel = kwargs.get("preserve_parallel", True)
@@ -82,32 +83,14 @@ class Centerality:
                 could produce wrong results!"""
             )
 
-        interacted_with_label = self.graph_schema.interacted_with_rel
-        query = """
-        MATCH () -[r:INTERACTED_WITH {platformId: $platform_id}]-()
-        WITH max(r.date) as latest_date
-        """
-
-        # determining one line of the query useing the direction variable
-        interaction = f"[r:{interacted_with_label} {{date: latest_date}}]"
-        if direction == "in_degree":
-            query += f"MATCH (a:{node})<-{interaction}-(b:{node})"
-        elif direction == "out_degree":
-            query += f"MATCH (a:{node})-{interaction}->(b:{node})"
-        elif direction == "undirected":
-            query += f"MATCH (a:{node})-{interaction}-(b:{node})"
-
+        projection_utils = ProjectionUtils(self.platform_id, self.graph_schema)
+        latest_dates = projection_utils.get_dates()
         results = self.neo4j_ops.gds.run_cypher(
-            f"""
-                {query}
-                WHERE r.platformId = $platform_id
-                RETURN
-                    a.id as a_userId,
-                    r.date as date,
-                    r.weight as weight,
-                    b.id as b_userId
-            """,
-            params={"platform_id": self.platform_id},
+            self._degree_centerality_query(direction),
+            params={
+                "platform_id": self.platform_id,
+                "latest_date": max(latest_dates) if latest_dates else None,
+            },
         )
 
         dates_to_compute = set(results["date"].value_counts().index)
@@ -130,6 +113,84 @@ class Centerality:
 
         return degree_centerality
 
+    async def compute_degree_centerality_async(
+        self,
+        direction: str,
+        from_start: bool,
+        **kwargs,
+    ) -> dict[float, dict[str, float]]:
+        """
+        the async version of `compute_degree_centerality`
+        the parameters are the same as `compute_degree_centerality`
+        """
+        weighted = True if "weighted" not in kwargs.keys() else kwargs["weighted"]
+        normalize = False if "normalize" not in kwargs.keys() else kwargs["normalize"]
+        preserve_parallel = kwargs.get("preserve_parallel", True)
+
+        if weighted and not preserve_parallel:
+            logging.warning(
+                """preserver_parallel=False with weighted=True
+                could produce wrong results!"""
+            )
+
+        projection_utils = ProjectionUtils(self.platform_id, self.graph_schema)
+        latest_dates = await projection_utils.get_dates_async()
+        results = await AsyncNeo4jOps.get_instance().run_cypher(
+            self._degree_centerality_query(direction),
+            {
+                "platform_id": self.platform_id,
+                "latest_date": max(latest_dates) if latest_dates else None,
+            },
+        )
+
+        dates_to_compute = set(results["date"].value_counts().index)
+        degree_centerality = self.count_degrees(
+            computation_date=dates_to_compute,
+            results=results,
+            weighted=weighted,
+            normalize=normalize,
+            preserve_parallel=preserve_parallel,
+        )
+
+        return degree_centerality
+
+    def _degree_centerality_query(self, direction: str) -> str:
+        """
+        the query to get the relations of the latest date
+        to compute degree centerality with
+        the latest date is given as `$latest_date` parameter
+
+        Parameters
+        ------------
+        direction : str
+            the direction of relation
+            could be `in_degree`, `out_degree`, `undirected`
+        """
+        node = self.graph_schema.user_label
+        interacted_with_label = self.graph_schema.interacted_with_rel
+        query = """
+        WITH $latest_date as latest_date
+        """
+
+        # determining one line of the query useing the direction variable
+        interaction = f"[r:{interacted_with_label} {{date: latest_date}}]"
+        if direction == "in_degree":
+            query += f"MATCH (a:{node})<-{interaction}-(b:{node})"
+        elif direction == "out_degree":
+            query += f"MATCH (a:{node})-{interaction}->(b:{node})"
+        elif direction == "undirected":
+            query += f"MATCH (a:{node})-{interaction}-(b:{node})"
+
+        query += """
+                WHERE r.platformId = $platform_id
+                RETURN
+                    a.id as a_userId,
+                    r.date as date,
+                    r.weight as weight,
+                    b.id as b_userId
+            """
+        return query
+
     def _get_dates_to_compute(
         self,
         projection_utils: ProjectionUtils,
@@ -319,6 +380,44 @@ class Centerality:
             from_start=from_start,
         )
 
+        network_decentrality = self._compute_decentrality(results_undirected)
+
+        if save:
+            self.save_decentralization_score(network_decentrality)
+
+        return network_decentrality
+
+    async def compute_network_decentrality_async(
+        self,
+        from_start: bool,
+        save: bool = True,
+        weighted: bool = False,
+    ) -> dict[float, float | Literal[-1]]:
+        """
+        the async version of `compute_network_decentrality`
+        the parameters are the same as `compute_network_decentrality`
+        """
+        results_undirected = await self.compute_degree_centerality_async(
+            direction="undirected",
+            weighted=weighted,
+            normalize=True,
+            preserve_parallel=False,
+            from_start=from_start,
+        )
+        network_decentrality = self._compute_decentrality(results_undirected)
+
+        if save:
+            await self.save_decentralization_score_async(network_decentrality)
+
+        return network_decentrality
+
+    def _compute_decentrality(
+        self, results_undirected: dict[float, dict[str, float]]
+    ) -> dict[float, float | Literal[-1]]:
+        """
+        compute the network decentrality of each date
+        using the normalized undirected degree centerality of users
+        """
         neo4j_metrics = Neo4JMetrics()
 
         # saving each date network decentrality
@@ -329,9 +428,6 @@ class Centerality:
                 centerality
             )
 
-        if save:
-            self.save_decentralization_score(network_decentrality)
-
         return network_decentrality
 
     def save_decentralization_score(
@@ -348,7 +444,35 @@ class Centerality:
         decentrality_score : dict[float, float]
             the network decentrality scores over time
         """
-        # preparing the queries
+        queries = self._decentralization_queries(decentrality_score)
+
+        # retrying the deadlocks with the other metrics writing the same relationships
+        self.neo4j_ops.run_queries_in_transaction(
+            queries,
+            message=f"PLATFORMID: {self.platform_id}: Saving Network Decentrality:",
+        )
+
+    async def save_decentralization_score_async(
+        self,
+        decentrality_score: dict[float, float | Literal[-1]],
+    ) -> None:
+        """
+        the async version of `save_decentralization_score`
+        """
+        queries = self._decentralization_queries(decentrality_score)
+
+        await AsyncNeo4jOps.get_instance().run_queries_in_transaction(
+            queries,
+            message=f"PLATFORMID: {self.platform_id}: Saving Network Decentrality:",
+        )
+
+    def _decentralization_queries(
+        self,
+        decentrality_score: dict[float, float | Literal[-1]],
+    ) -> list[Query]:
+        """
+        prepare the queries to save the network decentrality scores
+        """
         queries: list[Query] = []
         for date in decentrality_score.keys():
             query_str = f"""
@@ -364,7 +488,4 @@ class Centerality:
             query = Query(query=query_str, parameters=parameters)
             queries.append(query)
 
-        self.neo4j_ops.run_queries_in_batch(
-            queries,
-            message=f"PLATFORMID: {self.platform_id}: Saving Network Decentrality:",
-        )
+        return queries
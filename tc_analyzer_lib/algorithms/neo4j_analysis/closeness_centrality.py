@@ -3,7 +3,7 @@ from uuid import uuid1
 
 from tc_analyzer_lib.algorithms.neo4j_analysis.utils import ProjectionUtils
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib.neo4j_ops import Neo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class ClosenessCentrality:
@@ -11,7 +11,7 @@ class ClosenessCentrality:
         """
         Closeness centrality algorithm wrapper to compute
         """
-        self.neo4j_ops = Neo4jOps.get_instance()
+        self.neo4j_ops = CountedNeo4jOps.get_instance()
         self.platform_id = platform_id
         self.graph_schema = graph_schema
 
@@ -51,6 +51,21 @@ class ClosenessCentrality:
                     f" computation for date: {date}, exp: {exp}"
                 )
 
+    async def compute_async(self, from_start: bool = False) -> None:
+        """
+        the async version of `compute`
+        """
+        computable_dates = await self.projection_utils.get_dates_async()
+
+        for date in computable_dates:
+            try:
+                await self.closeness_computation_wrapper_async(date)
+            except Exception as exp:
+                logging.error(
+                    f"Exception: {self.log_prefix}Closeness Centrality "
+                    f" computation for date: {date}, exp: {exp}"
+                )
+
     def closeness_computation_wrapper(self, date: float) -> None:
         """
         a wrapper for closeness centrality computation process
@@ -64,20 +79,12 @@ class ClosenessCentrality:
         """
         graph_projected_name = f"GraphClosenessCentrality_{uuid1()}"
 
-        user_label = self.graph_schema.user_label
-        relation_label = self.graph_schema.interacted_with_rel
-
         self.projection_utils.project_temp_graph(
             graph_name=graph_projected_name,
             weighted=False,
             date=date,
             relation_direction="NATURAL",
-            projection_query=f"""
-            MATCH (a:{user_label})-[
-                r:{relation_label} {{platformId: '{self.platform_id}', date: {date}}}
-            ]->(b:{user_label}),
-            (b)-[:{relation_label} {{platformId: '{self.platform_id}', date: {date}}}]->(a)
-            """,
+            projection_query=self._projection_query(date),
         )
 
         # get the results as pandas dataframe
@@ -93,6 +100,50 @@ class ClosenessCentrality:
             },
         )
 
+    async def closeness_computation_wrapper_async(self, date: float) -> None:
+        """
+        the async version of `closeness_computation_wrapper`
+        """
+        graph_projected_name = f"GraphClosenessCentrality_{uuid1()}"
+        await self.projection_utils.project_temp_graph_async(
+            graph_name=graph_projected_name,
+            weighted=False,
+            date=date,
+            relation_direction="NATURAL",
+            projection_query=self._projection_query(date),
+        )
+        try:
+            await self.projection_utils.async_ops.run_cypher(
+                self._closeness_query(),
+                {
+                    "graph_name": graph_projected_name,
+                    "date": date,
+                    "platform_id": self.platform_id,
+                },
+            )
+        except Exception as exp:
+            logging.error(
+                f"{self.log_prefix} Error in computing "
+                f"closeness centrality algorithm, {exp}"
+            )
+        finally:
+            await self.projection_utils.drop_temp_graph_async(graph_projected_name)
+
+    def _projection_query(self, date: float) -> str:
+        """
+        the projection query including just the two-way interactions of a date
+        """
+        user_label = self.graph_schema.user_label
+        relation_label = self.graph_schema.interacted_with_rel
+
+        query = f"""
+            MATCH (a:{user_label})-[
+                r:{relation_label} {{platformId: '{self.platform_id}', date: {date}}}
+            ]->(b:{user_label}),
+            (b)-[:{relation_label} {{platformId: '{self.platform_id}', date: {date}}}]->(a)
+            """
+        return query
+
     def get_computed_dates(self) -> set[float]:
         """
         get closeness centrality computed dates
@@ -129,19 +180,8 @@ class ClosenessCentrality:
             the operation would be done on the graph
         """
         try:
-            user_label = self.graph_schema.user_label
-
             _ = self.neo4j_ops.gds.run_cypher(
-                f"""
-                CALL gds.closeness.stream($graph_name)
-                YIELD nodeId, score
-                WITH gds.util.asNode(nodeId).id AS user_id, score
-                MATCH (user:{user_label} {{id: user_id}})
-                MERGE (user)
-                    -[r:HAVE_METRICS {{date: $date, platformId: $platform_id}}]
-                ->(user)
-                SET r.closenessCentrality = score
-                """,
+                self._closeness_query(),
                 {
                     "graph_name": graph_name,
                     "date": date,
@@ -153,3 +193,21 @@ class ClosenessCentrality:
                 f"{self.log_prefix} Error in computing "
                 f"closeness centrality algorithm, {exp}"
             )
+
+    def _closeness_query(self) -> str:
+        """
+        the query to compute closeness centrality on a projected graph
+        and save the results back into db
+        """
+        user_label = self.graph_schema.user_label
+        query = f"""
+            CALL gds.closeness.stream($graph_name)
+            YIELD nodeId, score
+            WITH gds.util.asNode(nodeId).id AS user_id, score
+            MATCH (user:{user_label} {{id: user_id}})
+            MERGE (user)
+                -[r:HAVE_METRICS {{date: $date, platformId: $platform_id}}]
+            ->(user)
+            SET r.closenessCentrality = score
+            """
+        return query
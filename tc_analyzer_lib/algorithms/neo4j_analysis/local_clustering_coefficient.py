@@ -3,12 +3,12 @@ from uuid import uuid1
 
 from tc_analyzer_lib.algorithms.neo4j_analysis.utils import ProjectionUtils
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib import Neo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class LocalClusteringCoeff:
     def __init__(self, platform_id: str, graph_schema: GraphSchema) -> None:
-        self.gds = Neo4jOps.get_instance().gds
+        self.gds = CountedNeo4jOps.get_instance().gds
         self.graph_schema = graph_schema
         self.platform_id = platform_id
 
@@ -52,6 +52,21 @@ class LocalClusteringCoeff:
                     f"date: {date}, exp: {exp}"
                 )
 
+    async def compute_async(self, from_start: bool = False) -> None:
+        """
+        the async version of `compute`
+        """
+        computable_dates = await self.projection_utils.get_dates_async()
+
+        for date in computable_dates:
+            try:
+                await self.local_clustering_computation_wrapper_async(date=date)
+            except Exception as exp:
+                logging.error(
+                    f"{self.log_prefix}localClustering computation for "
+                    f"date: {date}, exp: {exp}"
+                )
+
     def local_clustering_computation_wrapper(self, date: float) -> None:
         """
         a wrapper for local clustering coefficient computation process
@@ -88,6 +103,33 @@ class LocalClusteringCoeff:
             },
         )
 
+    async def local_clustering_computation_wrapper_async(self, date: float) -> None:
+        """
+        the async version of `local_clustering_computation_wrapper`
+        """
+        graph_projected_name = f"GraphLocalClustering_{uuid1()}"
+        await self.projection_utils.project_temp_graph_async(
+            graph_name=graph_projected_name,
+            weighted=True,
+            date=date,
+        )
+        try:
+            await self.projection_utils.async_ops.run_cypher(
+                self._lcc_query(),
+                {
+                    "graph_name": graph_projected_name,
+                    "platform_id": self.platform_id,
+                    "date": date,
+                },
+            )
+        except Exception as exp:
+            logging.error(
+                f"{self.log_prefix} error in computing localClusteringCoefficient!"
+                f" Exception: {exp}"
+            )
+        finally:
+            await self.projection_utils.drop_temp_graph_async(graph_projected_name)
+
     def get_computed_dates(self) -> set[float]:
         """
         get localClusteringCoeff computed dates
@@ -126,17 +168,7 @@ class LocalClusteringCoeff:
         """
         try:
             _ = self.gds.run_cypher(
-                f"""
-                    CALL gds.localClusteringCoefficient.stream(
-                        $graph_name
-                    ) YIELD nodeId, localClusteringCoefficient
-                    WITH
-                        gds.util.asNode(nodeId) as userNode,
-                        localClusteringCoefficient
-                    MATCH (g:{self.graph_schema.platform_label} {{id: $platform_id}})
-                    MERGE (userNode) -[r:{self.graph_schema.interacted_in_rel}  {{date: $date}}]-> (g)
-                    SET r.localClusteringCoefficient = localClusteringCoefficient
-                    """,
+                self._lcc_query(),
                 {
                     "graph_name": graph_name,
                     "platform_id": self.platform_id,
@@ -148,3 +180,21 @@ class LocalClusteringCoeff:
                 f"{self.log_prefix} error in computing localClusteringCoefficient!"
                 f" Exception: {exp}"
             )
+
+    def _lcc_query(self) -> str:
+        """
+        the query to compute the localClusteringCoefficient on a projected graph
+        and write the results back to the nodes
+        """
+        query = f"""
+            CALL gds.localClusteringCoefficient.stream(
+                $graph_name
+            ) YIELD nodeId, localClusteringCoefficient
+            WITH
+                gds.util.asNode(nodeId) as userNode,
+                localClusteringCoefficient
+            MATCH (g:{self.graph_schema.platform_label} {{id: $platform_id}})
+            MERGE (userNode) -[r:{self.graph_schema.interacted_in_rel}  {{date: $date}}]-> (g)
+            SET r.localClusteringCoefficient = localClusteringCoefficient
+            """
+        return query
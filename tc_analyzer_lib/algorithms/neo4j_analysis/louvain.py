@@ -3,7 +3,7 @@ from uuid import uuid1
 
 from tc_analyzer_lib.algorithms.neo4j_analysis.utils import ProjectionUtils
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib.neo4j_ops import Neo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class Louvain:
@@ -11,7 +11,7 @@ class Louvain:
         """
         louvain algorithm wrapper to compute
         """
-        self.neo4j_ops = Neo4jOps.get_instance()
+        self.neo4j_ops = CountedNeo4jOps.get_instance()
         self.platform_id = platform_id
         self.graph_schema = graph_schema
 
@@ -20,7 +20,11 @@ class Louvain:
         )
         self.log_prefix = f"PLATFORMID: {platform_id} "
 
-    def compute(self, from_start: bool = False) -> None:
+    def compute(
+        self,
+        from_start: bool = False,
+        projected_graphs: dict[float, str] | None = None,
+    ) -> None:
         """
         compute the louvain modularity score for a guild
 
@@ -30,7 +34,16 @@ class Louvain:
             whether to compute the metric from the first day or not
             if True, then would compute from start
             default is False
+        projected_graphs : dict[float, str] | None
+            already projected graphs (weighted with `NATURAL` direction) per date
+            to compute the metric on, instead of projecting a graph for each date
+            the graphs wouldn't be dropped here
+            default is `None` meaning the graphs would be projected here
         """
+        if projected_graphs is not None:
+            for date, graph_name in projected_graphs.items():
+                self.compute_graph_louvain(date=date, graph_name=graph_name)
+            return
 
         computable_dates = self.projection_utils.get_dates()
 
@@ -51,6 +64,30 @@ class Louvain:
                     f" computation for date: {date}, exp: {exp}"
                 )
 
+    async def compute_async(
+        self,
+        from_start: bool = False,
+        projected_graphs: dict[float, str] | None = None,
+    ) -> None:
+        """
+        the async version of `compute`
+        """
+        if projected_graphs is not None:
+            for date, graph_name in projected_graphs.items():
+                await self.compute_graph_louvain_async(date=date, graph_name=graph_name)
+            return
+
+        computable_dates = await self.projection_utils.get_dates_async()
+
+        for date in computable_dates:
+            try:
+                await self.louvain_computation_wrapper_async(date)
+            except Exception as exp:
+                logging.error(
+                    f"Exception: {self.log_prefix}Louvain Modularity "
+                    f" computation for date: {date}, exp: {exp}"
+                )
+
     def louvain_computation_wrapper(self, date: float) -> None:
         """
         a wrapper for louvain modularity computation process
@@ -83,6 +120,24 @@ class Louvain:
             },
         )
 
+    async def louvain_computation_wrapper_async(self, date: float) -> None:
+        """
+        the async version of `louvain_computation_wrapper`
+        """
+        graph_projected_name = f"GraphLouvain_{uuid1()}"
+        await self.projection_utils.project_temp_graph_async(
+            graph_name=graph_projected_name,
+            weighted=True,
+            date=date,
+            relation_direction="NATURAL",
+        )
+        try:
+            await self.compute_graph_louvain_async(
+                date=date, graph_name=graph_projected_name
+            )
+        finally:
+            await self.projection_utils.drop_temp_graph_async(graph_projected_name)
+
     def get_computed_dates(self) -> set[float]:
         """
         get localClusteringCoeff computed dates
@@ -118,17 +173,29 @@ class Louvain:
             the operation would be done on the graph
         """
         try:
-            _ = self.neo4j_ops.gds.run_cypher(
-                f"""
-                    CALL gds.louvain.stats($graph_name)
-                    YIELD modularity
-                    WITH modularity
-                    MATCH (g:{self.graph_schema.platform_label} {{id: $platform_id}})
-                    MERGE (g) -[r:HAVE_METRICS {{
-                        date: $date
-                    }}]-> (g)
-                    SET r.louvainModularityScore = modularity
-                    """,
+            # the metrics write the same relationships concurrently
+            # so the managed transaction is used to retry the deadlocks
+            _ = self.neo4j_ops.run_cypher(
+                self._louvain_query(),
+                {
+                    "graph_name": graph_name,
+                    "platform_id": self.platform_id,
+                    "date": date,
+                },
+            )
+        except Exception as exp:
+            logging.error(
+                f"{self.log_prefix} Error in computing "
+                f"louvain modularity algorithm, {exp}"
+            )
+
+    async def compute_graph_louvain_async(self, date: float, graph_name: str) -> None:
+        """
+        the async version of `compute_graph_louvain`
+        """
+        try:
+            await self.projection_utils.async_ops.run_cypher(
+                self._louvain_query(),
                 {
                     "graph_name": graph_name,
                     "platform_id": self.platform_id,
@@ -140,3 +207,20 @@ class Louvain:
                 f"{self.log_prefix} Error in computing "
                 f"louvain modularity algorithm, {exp}"
             )
+
+    def _louvain_query(self) -> str:
+        """
+        the query to compute louvain modularity on a projected graph
+        and save the results for the platform
+        """
+        query = f"""
+            CALL gds.louvain.stats($graph_name)
+            YIELD modularity
+            WITH modularity
+            MATCH (g:{self.graph_schema.platform_label} {{id: $platform_id}})
+            MERGE (g) -[r:HAVE_METRICS {{
+                date: $date
+            }}]-> (g)
+            SET r.louvainModularityScore = modularity
+            """
+        return query
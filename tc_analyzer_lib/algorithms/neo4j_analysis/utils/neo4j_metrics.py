@@ -2,7 +2,7 @@
 from typing import Literal
 
 import numpy as np
-from tc_neo4j_lib.neo4j_ops import Neo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class Neo4JMetrics:
@@ -15,7 +15,7 @@ class Neo4JMetrics:
         gds : GraphDataScience
             the GraphDataScience instance to query the DB
         """
-        self.gds = Neo4jOps.get_instance().gds
+        self.gds = CountedNeo4jOps.get_instance().gds
 
     def compute_degreeCenterality(self, graphProjection, method, configuration=None):
         """
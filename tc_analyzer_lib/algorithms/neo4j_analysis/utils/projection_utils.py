@@ -1,12 +1,13 @@
 import logging
 
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib.neo4j_ops import Neo4jOps
+from tc_analyzer_lib.utils.neo4j_async import AsyncNeo4jOps
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class ProjectionUtils:
     def __init__(self, platform_id: str, graph_schema: GraphSchema) -> None:
-        self.gds = Neo4jOps.get_instance().gds
+        self.gds = CountedNeo4jOps.get_instance().gds
         self.platform_id = platform_id
 
         self.user_label = graph_schema.user_label
@@ -15,6 +16,13 @@ class ProjectionUtils:
         self.between_user_platform_label = graph_schema.interacted_in_rel
         self.membership_label = graph_schema.member_relation
 
+    @property
+    def async_ops(self) -> AsyncNeo4jOps:
+        """
+        the async neo4j operations, used by the async methods
+        """
+        return AsyncNeo4jOps.get_instance()
+
     def project_temp_graph(
         self,
         graph_name: str,
@@ -47,7 +55,49 @@ class ProjectionUtils:
             date : float
                 if we want to include date in the graph projection query
         """
+        _ = self.gds.run_cypher(self._prepare_projection_query(graph_name, **kwargs))
+
+    async def project_temp_graph_async(
+        self,
+        graph_name: str,
+        **kwargs,
+    ) -> None:
+        """
+        the async version of `project_temp_graph`
+        the kwargs are the same as `project_temp_graph`
+        """
+        _ = await self.async_ops.run_cypher(
+            self._prepare_projection_query(graph_name, **kwargs)
+        )
+
+    def drop_temp_graph(self, graph_name: str) -> None:
+        """
+        drop a projected graph
+
+        Parameters
+        ------------
+        graph_name : str
+            the projected graph to drop
+        """
+        _ = self.gds.run_cypher(
+            "CALL gds.graph.drop($graph_name) YIELD graphName",
+            {"graph_name": graph_name},
+        )
+
+    async def drop_temp_graph_async(self, graph_name: str) -> None:
+        """
+        the async version of `drop_temp_graph`
+        """
+        _ = await self.async_ops.run_cypher(
+            "CALL gds.graph.drop($graph_name) YIELD graphName",
+            {"graph_name": graph_name},
+        )
 
+    def _prepare_projection_query(self, graph_name: str, **kwargs) -> str:
+        """
+        prepare the graph projection query
+        the kwargs are the same as `project_temp_graph`
+        """
         # getting kwargs
         weighted = False
         if "weighted" in kwargs:
@@ -94,8 +144,7 @@ class ProjectionUtils:
         else:
             rel_properties = "{.date}"
 
-        _ = self.gds.run_cypher(
-            f"""
+        query = f"""
             {projection_query}
             WITH gds.graph.project(
                 "{graph_name}",
@@ -109,30 +158,84 @@ class ProjectionUtils:
             RETURN
             g.graphName AS graph, g.nodeCount AS nodes, g.relationshipCount AS rels
             """
-        )
+        return query
 
     def get_dates(self) -> set[float]:
         """
         get all the dates we do have on the INTERACTED_WITH relations
         Note: returning just the only previous date
 
+        the latest date is read from the platform node (`latestGraphDate`)
+        and if it wasn't kept there (i.e. graphs written before it was added)
+        the relations would be scanned for it
+
         Parameters:
         ------------
         guildId : str
             the guild we do want the dates of relations
         """
         dates = self.gds.run_cypher(
-            f"""
-            MATCH (a:{self.user_label})
-                -[r:{self.between_user_label} {{platformId: $platform_id}}]-()
-            RETURN r.date as dates ORDER BY dates DESC LIMIT 1
-            """,
+            self._latest_date_query(),
             params={"platform_id": self.platform_id},
         )
+        if dates.empty:
+            logging.info(
+                f"PLATFORMID: {self.platform_id}: No latest graph date on "
+                "platform node! scanning the relations for it."
+            )
+            dates = self.gds.run_cypher(
+                self._dates_query(),
+                params={"platform_id": self.platform_id},
+            )
+        computable_dates_set = set(dates["dates"].values)
+
+        return computable_dates_set
+
+    async def get_dates_async(self) -> set[float]:
+        """
+        the async version of `get_dates`
+        """
+        dates = await self.async_ops.run_cypher(
+            self._latest_date_query(),
+            {"platform_id": self.platform_id},
+        )
+        if dates.empty:
+            logging.info(
+                f"PLATFORMID: {self.platform_id}: No latest graph date on "
+                "platform node! scanning the relations for it."
+            )
+            dates = await self.async_ops.run_cypher(
+                self._dates_query(),
+                {"platform_id": self.platform_id},
+            )
         computable_dates_set = set(dates["dates"].values)
 
         return computable_dates_set
 
+    def _latest_date_query(self) -> str:
+        """
+        the query to get the latest date of INTERACTED_WITH relations
+        kept on the platform node by the graph writer
+        """
+        query = f"""
+            MATCH (g:{self.platform_label} {{id: $platform_id}})
+            WHERE g.latestGraphDate IS NOT NULL
+            RETURN g.latestGraphDate as dates
+            """
+        return query
+
+    def _dates_query(self) -> str:
+        """
+        the query to get the latest date of INTERACTED_WITH relations
+        by scanning all the relations of platform
+        """
+        query = f"""
+            MATCH (a:{self.user_label})
+                -[r:{self.between_user_label} {{platformId: $platform_id}}]-()
+            RETURN r.date as dates ORDER BY dates DESC LIMIT 1
+            """
+        return query
+
     def get_computed_dates(self, query: str, **params) -> set[float]:
         """
         get the computed metric dates for that specific query
@@ -150,3 +253,12 @@ class ProjectionUtils:
         computed_dates = set(dates["computed_dates"].values)
 
         return computed_dates
+
+    async def get_computed_dates_async(self, query: str, **params) -> set[float]:
+        """
+        the async version of `get_computed_dates`
+        """
+        dates = await self.async_ops.run_cypher(query, params)
+        computed_dates = set(dates["computed_dates"].values)
+
+        return computed_dates
@@ -0,0 +1,84 @@
+import numpy as np
+import numpy.typing as npt
+
+
+class AccountDictionary:
+    def __init__(self) -> None:
+        """
+        the accounts of a platform interned into dense integer codes
+        the codes are assigned once per run, so the memberactivities could be
+        computed on integers and the ids are decoded just when storing the results
+        """
+        self.ids: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, account: str) -> bool:
+        return account in self._codes
+
+    def encode_one(self, account: str) -> int:
+        """
+        get the code of an account, assigning a new one if not seen before
+
+        Parameters
+        ------------
+        account : str
+            the account id
+
+        Returns
+        ---------
+        code : int
+            the integer code of the account
+        """
+        code = self._codes.get(account)
+        if code is None:
+            code = len(self.ids)
+            self._codes[account] = code
+            self.ids.append(account)
+
+        return code
+
+    def encode(self, accounts: list[str] | set[str]) -> npt.NDArray[np.int32]:
+        """
+        get the codes of the accounts in order
+
+        Parameters
+        ------------
+        accounts : list[str] | set[str]
+            the account ids
+
+        Returns
+        ---------
+        codes : npt.NDArray[np.int32]
+            the integer codes of the accounts
+        """
+        return np.fromiter(
+            (self.encode_one(account) for account in accounts),
+            dtype=np.int32,
+            count=len(accounts),
+        )
+
+    def encode_set(self, accounts: list[str] | set[str]) -> set[int]:
+        """
+        get the codes of the accounts as a set
+        to be used within the memberactivities categories
+        """
+        return {self.encode_one(account) for account in accounts}
+
+    def decode(self, codes: list[int] | set[int] | npt.NDArray[np.int32]) -> list[str]:
+        """
+        get the account ids of the codes in order
+
+        Parameters
+        ------------
+        codes : list[int] | set[int] | npt.NDArray[np.int32]
+            the integer codes of the accounts
+
+        Returns
+        ---------
+        accounts : list[str]
+            the account ids
+        """
+        return [self.ids[code] for code in codes]
@@ -63,6 +63,11 @@ def generate_interaction_matrix(
     """
     int_matrix = np.zeros((len(acc_names), len(acc_names)), dtype=np.uint16)
 
+    # the position of each account in matrix, looked up once
+    acc_positions: dict[str, int] = {}
+    for idx, acc_name in enumerate(acc_names):
+        acc_positions.setdefault(acc_name, idx)
+
     for acc in per_acc_interactions.keys():
         db_res_per_acc = per_acc_interactions[acc]
 
@@ -78,11 +83,11 @@ def generate_interaction_matrix(
         # for each interacting user
         for int_acc in acc_out_int.values():
             # if the interacting user is in acc_names
-            if int_acc["account"] in acc_names:
+            if int_acc["account"] in acc_positions:
                 # store data in int_network
                 int_matrix[
-                    np.where(np.array(acc_names) == acc)[0][0],
-                    np.where(np.array(acc_names) == int_acc["account"])[0][0],
+                    acc_positions[acc],
+                    acc_positions[int_acc["account"]],
                 ] = int_acc["count"]
 
     return int_matrix
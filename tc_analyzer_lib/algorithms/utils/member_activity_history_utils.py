@@ -1,8 +1,11 @@
 import logging
-from datetime import datetime, timedelta
+from collections import Counter
+from datetime import date, datetime, timedelta
 from typing import Any
 
+import numpy as np
 from numpy import array
+from tc_analyzer_lib.algorithms.utils.account_dictionary import AccountDictionary
 from tc_analyzer_lib.DB_operations.mongodb_access import DB_access
 
 
@@ -17,6 +20,7 @@ class MemberActivityPastUtils:
         all_joined_day: dict[str, set[str]],
         starting_key: int,
         window_d: int = 7,
+        account_dictionary: AccountDictionary | None = None,
     ):
         """
         Parameters:
@@ -36,7 +40,9 @@ class MemberActivityPastUtils:
         window_d : int
             the window days to include days
             default is 7 days
-
+        account_dictionary : AccountDictionary | None
+            if given, the joined accounts would be the integer codes of this dictionary
+            default is `None` meaning to keep the account ids
 
         Returns:
         ---------
@@ -51,7 +57,12 @@ class MemberActivityPastUtils:
         )
 
         all_joined_day = self.update_all_joined_day(
-            start_dt, end_dt, all_joined_day, starting_key, joined_acc
+            start_dt,
+            end_dt,
+            all_joined_day,
+            starting_key,
+            joined_acc,
+            account_dictionary=account_dictionary,
         )
 
         all_joined = self.get_users_past_days(all_joined_day, window_d)
@@ -81,20 +92,25 @@ class MemberActivityPastUtils:
         # looping up to the max key
         loop_max = array(list(all_joined_day.keys()), dtype=int).max() + 1
 
+        # the number of window days each user is in
+        # updated as the window slides, instead of re-unioning the window days
+        window_users: Counter = Counter()
         for day_idx in range(loop_max):
-            # how mAny days to look for past joined members
-            look_past = None
-            if day_idx - window_d > 0:
-                look_past = day_idx - window_d
-            else:
-                look_past = 0
+            window_users.update(all_joined_day[str(day_idx)])
 
-            joined_members_idx = array(range(look_past, day_idx + 1), dtype=str)
-            all_joined[str(look_past + 1)] = set()
-            for idx in joined_members_idx:
-                all_joined[str(look_past + 1)] = all_joined[str(look_past + 1)].union(
-                    all_joined_day[idx]
-                )
+            # the day getting out of the window
+            expired_idx = day_idx - window_d - 1
+            if expired_idx >= 0:
+                window_users.subtract(all_joined_day[str(expired_idx)])
+                window_users += Counter()
+
+            # how many days to look for past joined members
+            look_past = max(day_idx - window_d, 0)
+
+            # the windows starting from day 0 were all written in key `1`
+            # and just the last of them was kept
+            if day_idx >= window_d or day_idx == loop_max - 1:
+                all_joined[str(look_past + 1)] = set(window_users)
 
         return all_joined
 
@@ -105,6 +121,7 @@ class MemberActivityPastUtils:
         all_joined_day: dict[str, set[str]],
         starting_key: int,
         joined_acc: list[dict[str, str]],
+        account_dictionary: AccountDictionary | None = None,
     ) -> dict[str, set[str]]:
         """
         update the all_joined_day dict with new retrieved data
@@ -124,6 +141,9 @@ class MemberActivityPastUtils:
             list of retrieved data from db
             it is a list of dicionaries, each has the keys of
              `joinedAt`, and `discordId`
+        account_dictionary : AccountDictionary | None
+            if given, the joined accounts would be the integer codes of this dictionary
+            default is `None` meaning to keep the account ids
 
         Returns:
         ---------
@@ -131,12 +151,19 @@ class MemberActivityPastUtils:
             the updated joined dictionary
         """
 
+        joined_index = JoinedAccountsIndex(joined_acc)
+
         for i in range(0, (end_dt - start_dt).days + 1):
             date = (start_dt + timedelta(days=i)).date()
-            joined_accounts = self._get_accounts_per_date(joined_acc, date)
+            joined_accounts = joined_index.get_accounts(date)
 
             date_index = i + starting_key
-            all_joined_day[str(date_index)] = set(joined_accounts)
+            if account_dictionary is not None:
+                all_joined_day[str(date_index)] = account_dictionary.encode_set(
+                    joined_accounts
+                )
+            else:
+                all_joined_day[str(date_index)] = set(joined_accounts)
 
         return all_joined_day
 
@@ -168,116 +195,51 @@ class MemberActivityPastUtils:
 
         return query
 
-    def convert_back_to_old_schema(
+    def get_past_history(
         self,
-        retrieved_data: list[dict],
-        date_start: datetime,
-        window_param: dict[str, str],
-    ) -> dict:
+        date_range: tuple[datetime, datetime],
+        categories: list[str],
+        collection_name: str = "memberactivities",
+        account_dictionary: AccountDictionary | None = None,
+    ) -> "MemberActivityHistory":
         """
-        convert the retrieved data back to the old schema we had, to do the analysis
-
-        Parameters:
-        ---------------
-        retrieved_data : array
-            array of db returned records
-        date_start : datetime
-            the starting point of analysis
-        days_after_analysis_start : int
-            the day count after analysis which are available in DB
-        window_param : dict[str, str]
-            the window parameters containing the step_size and period_size
+        load the past memberactivities within the date range
+        just the given categories are projected and loaded into a columnar form
 
-        Returns:
+        Parameters
+        -------------
+        date_range: tuple[datetime, datetime]
+            a list of length 2, the first index has the start of the interval
+            and the second index is end of the interval
+        categories : list[str]
+            the memberactivities categories to load
+        collection_name: str
+            the collection of db to use
+            default is `memberactivities`
+        account_dictionary : AccountDictionary | None
+            the dictionary to intern the users with
+            default is `None` meaning a new dictionary would be used
+
+        Returns
         ----------
-        activity_dict : dict
-            the data converted to the old db schema
-        """
-        # make empty result dictionary
-        activity_dict = {}
-
-        # store results in dictionary
-        activity_dict["all_joined"] = {}
-        activity_dict["all_joined_day"] = {}
-        activity_dict["all_consistent"] = {}
-        activity_dict["all_vital"] = {}
-        activity_dict["all_active"] = {}
-        activity_dict["all_connected"] = {}
-        activity_dict["all_paused"] = {}
-        activity_dict["all_new_disengaged"] = {}
-        activity_dict["all_disengaged"] = {}
-        activity_dict["all_unpaused"] = {}
-        activity_dict["all_returned"] = {}
-        activity_dict["all_new_active"] = {}
-        activity_dict["all_still_active"] = {}
-        activity_dict["all_dropped"] = {}
-        activity_dict["all_disengaged_were_vital"] = {}
-        activity_dict["all_disengaged_were_newly_active"] = {}
-        activity_dict["all_disengaged_were_consistently_active"] = {}
-        activity_dict["all_lurker"] = {}
-        activity_dict["all_about_to_disengage"] = {}
-        activity_dict["all_disengaged_in_past"] = {}
-
-        for idx in range(len(retrieved_data)):
-            db_record = retrieved_data[idx]
-            # parser.parse(db_record["date"]) - timedelta(
-            #     days=window_param["period_size"]
-            # )
-
-            for activity in activity_dict.keys():
-                try:
-                    if db_record[activity] != []:
-                        # creating a dictionary of users
-                        users_name = db_record[activity]
-                        # make a dictionary of indexes and users for
-                        # a specific activity in an specific day
-                        activity_dict[activity][str(idx)] = set(users_name)
-                    else:
-                        activity_dict[activity][str(idx)] = set()
-                except KeyError:
-                    logging.error(
-                        f"KeyError: the key {activity} is not available in DB record!"
-                    )
-                except Exception as exp:
-                    logging.error(str(exp))
-
-        activity_dict["first_end_date"] = (
-            date_start - timedelta(days=window_param["period_size"])
-        ).isoformat()
-
-        return activity_dict
-
-    def _get_accounts_per_date(
-        self, joined_acc, date, date_key="joined_at", account_key="id"
-    ):
+        history : MemberActivityHistory
+            the past memberactivities, sorted ascending by date
         """
-        get the accounts for a special date
+        query = self.create_past_history_query(date_range)
 
-        Parameters:
-        -------------
-        joined_acc : list(dict[str, Any])
-            joined account retreived from database
-            it must be sorted by joinDate!
-        date : datetime.date
-            the date that we're going to retrieve accounts from
-        date_key : str
-            the key used to represent the date of user join
-        account_key : str
-            the key used to represent the account name
+        feature_projection = {category: 1 for category in categories}
+        feature_projection["date"] = 1
+        feature_projection["_id"] = 0
 
-        Returns:
-        ---------
-        account_names : list(str)
-            the list of accounts
-        """
-        account_names = []
+        cursor = self.db_access.query_db_find(
+            collection_name, query, feature_projection, ["date", 1]
+        )
 
-        for account in joined_acc:
-            account_join_date = account[date_key].date()
-            if account_join_date == date:
-                account_names.append(account[account_key])
+        history = MemberActivityHistory(categories, account_dictionary)
+        for document in cursor:
+            history.append(document)
 
-        return account_names
+        return history
 
     def _get_joined_accounts(
         self, date_range: tuple[datetime, datetime]
@@ -392,3 +354,150 @@ class MemberActivityPastUtils:
             max_key_val += int(max(indices_list))
 
         return data_dict_appended, max_key_val
+
+
+class JoinedAccountsIndex:
+    def __init__(
+        self,
+        joined_acc: list[dict[str, Any]],
+        date_key: str = "joined_at",
+        account_key: str = "id",
+    ) -> None:
+        """
+        the joined accounts bucketed by their join day
+        the days are sorted once so the accounts of each day could be found
+        with a binary search instead of scanning all the accounts per day
+
+        Parameters
+        ------------
+        joined_acc : list[dict[str, Any]]
+            joined account retreived from database
+        date_key : str
+            the key used to represent the date of user join
+        account_key : str
+            the key used to represent the account name
+        """
+        days = np.array(
+            [account[date_key].date() for account in joined_acc],
+            dtype="datetime64[D]",
+        )
+        # a stable sort to keep the order of accounts joined in the same day
+        order = np.argsort(days, kind="stable")
+
+        self.days = days[order]
+        self.accounts = [joined_acc[idx][account_key] for idx in order]
+
+    def get_accounts(self, day: date) -> list[str]:
+        """
+        get the accounts joined in a day
+
+        Parameters
+        ------------
+        day : date
+            the day to get its joined accounts
+
+        Returns
+        ---------
+        account_names : list[str]
+            the accounts joined within the day
+        """
+        day_value = np.datetime64(day, "D")
+        start = np.searchsorted(self.days, day_value, side="left")
+        end = np.searchsorted(self.days, day_value, side="right")
+
+        return self.accounts[start:end]
+
+
+class MemberActivityHistory:
+    def __init__(
+        self,
+        categories: list[str],
+        account_dictionary: AccountDictionary | None = None,
+    ) -> None:
+        """
+        the past memberactivities in a columnar form
+        each user is interned once into an integer code and each day of
+        a category is kept as an array of the user codes
+
+        Parameters
+        ------------
+        categories : list[str]
+            the memberactivities categories to keep, i.e. `all_active`
+        account_dictionary : AccountDictionary | None
+            the dictionary to intern the users with
+            default is `None` meaning a new dictionary would be used
+        """
+        self.categories = list(dict.fromkeys(categories))
+        self.account_dictionary = account_dictionary or AccountDictionary()
+
+        self.dates: list[datetime] = []
+        # per category, the user codes of each day
+        # `None` is for the days the category wasn't available in
+        self.columns: dict[str, list[np.ndarray | None]] = {
+            category: [] for category in self.categories
+        }
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def users(self) -> list[str]:
+        return self.account_dictionary.ids
+
+    def append(self, document: dict[str, Any]) -> None:
+        """
+        append a memberactivities document as the next day of history
+
+        Parameters
+        ------------
+        document : dict[str, Any]
+            the memberactivities document, having `date` and the categories
+        """
+        self.dates.append(document["date"])
+        for category in self.categories:
+            users = document.get(category)
+            if users is None:
+                self.columns[category].append(None)
+                continue
+
+            codes = self.account_dictionary.encode(users)
+            self.columns[category].append(codes)
+
+    def to_activity_dict(self, decode: bool = True) -> dict[str, dict[str, set]]:
+        """
+        convert the history back to the old schema to do the analysis
+
+        Parameters
+        ------------
+        decode : bool
+            if True, the sets would have the user ids
+            else the integer codes of the users would be kept
+            default is True
+
+        Returns
+        ---------
+        activity_dict : dict[str, dict[str, set]]
+            per each category, the users of each day index
+            the days a category wasn't available in are not included
+        """
+        users = np.array(self.users, dtype=object)
+
+        activity_dict: dict[str, dict[str, set]] = {}
+        for category, column in self.columns.items():
+            activity_dict[category] = {}
+            missing_count = 0
+            for idx, codes in enumerate(column):
+                if codes is None:
+                    missing_count += 1
+                elif decode:
+                    activity_dict[category][str(idx)] = set(users[codes].tolist())
+                else:
+                    activity_dict[category][str(idx)] = set(codes.tolist())
+
+            if missing_count:
+                logging.error(
+                    f"KeyError: the key {category} is not available "
+                    f"in {missing_count} DB record(s)!"
+                )
+
+        return activity_dict
@@ -1,6 +1,7 @@
 import logging
-from datetime import datetime, timedelta
-from typing import Any
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator
 
 import numpy as np
 import pymongo
@@ -9,7 +10,9 @@ from tc_analyzer_lib.algorithms.assessment.engagement import EngagementAssessmen
 from tc_analyzer_lib.algorithms.compute_interaction_matrix_discord import (
     compute_interaction_matrix_discord,
 )
+from tc_analyzer_lib.algorithms.utils.account_dictionary import AccountDictionary
 from tc_analyzer_lib.DB_operations.mongodb_access import DB_access
+from tc_analyzer_lib.metrics.heatmaps.heatmaps_buffer import HeatmapsBuffer
 from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
 
 
@@ -48,6 +51,8 @@ def store_based_date(
     analytics_day_range,
     joined_acc_dict,
     load_past,
+    from_date: datetime | None = None,
+    account_dictionary: AccountDictionary | None = None,
     **kwargs,
 ):
     """
@@ -70,6 +75,13 @@ def store_based_date(
     load_past : bool
         whether we loaded the past data or start processing from scratch
         If True, indicates that the past data is loaded beside the analytics data
+    from_date : datetime | None
+        if given, just the records after this date would be returned
+        i.e. the date of latest record already stored in database
+        default is `None` meaning to return records for all the dates
+    account_dictionary : AccountDictionary | None
+        the dictionary the activities users are encoded with
+        if given, the users would be decoded back to their ids
     **kwargs :
         empty_channel_acc : bool
             whether the channel and acc are empty
@@ -80,20 +92,62 @@ def store_based_date(
         if not kwargs["empty_channel_acc"]:
             return []
 
-    # post processing the
-    account_names = list(map(lambda record: record["id"], joined_acc_dict))
-    acc_join_date = list(
-        map(
-            lambda record: record["joined_at"].date(),
-            joined_acc_dict,
+    all_data_records = list(
+        generate_based_date(
+            start_date=start_date,
+            all_activities=all_activities,
+            analytics_day_range=analytics_day_range,
+            joined_acc_dict=joined_acc_dict,
+            load_past=load_past,
+            from_date=from_date,
+            account_dictionary=account_dictionary,
         )
     )
-    # converting to numpy to be easier to use
-    account_names = np.array(account_names)
-    acc_join_date = np.array(acc_join_date)
 
-    # the data converted to multiple db records
-    all_data_records = []
+    return all_data_records
+
+
+def generate_based_date(
+    start_date: datetime,
+    all_activities: dict[str, dict[str, set[str]]],
+    analytics_day_range: int,
+    joined_acc_dict: list[dict[str, Any]],
+    load_past: bool,
+    from_date: datetime | None = None,
+    account_dictionary: AccountDictionary | None = None,
+) -> Iterator[dict[str, Any]]:
+    """
+    generate the memberactivities documents one by one based on their date
+    the dates not after `from_date` are skipped before building their document
+
+    Parameters:
+    -------------
+    start_date : datetime
+        datetime object showing the start date of analysis
+    all_activities : dict[str, dict[str, set[str]]]
+        the `all_*` activities dictionary
+    analytics_day_range : int
+        the range window of analytics
+    joined_acc_dict : list[dict[str, Any]]
+        an array of dictionaries, each dictionary has `id` and `joined_at` member
+    load_past : bool
+        whether we loaded the past data or start processing from scratch
+    from_date : datetime | None
+        if given, just the documents after this date would be generated
+        default is `None` meaning to generate documents for all the dates
+    account_dictionary : AccountDictionary | None
+        the dictionary the activities users are encoded with
+        if given, the users would be decoded back to their ids
+
+    Yields:
+    ---------
+    data_record : dict[str, Any]
+        the memberactivities document of a date
+    """
+    # grouping the joined accounts by their join date once
+    joined_per_date: dict[date, list[str]] = defaultdict(list)
+    for record in joined_acc_dict:
+        joined_per_date[record["joined_at"].date()].append(record["id"])
 
     # using the 3rd activity (2)
     # we do know it is always complete and have all the keys
@@ -103,44 +157,47 @@ def store_based_date(
     for day_index in range(max_days_after):
         analytics_date = start_date + timedelta(days=day_index)
         analytics_end_date = analytics_date + timedelta(days=analytics_day_range)
-        # saving the data of a record
-        data_record = {}
 
         if not load_past:
             date_using = analytics_end_date
         else:
             date_using = analytics_date
 
+        # the document was already stored
+        if from_date is not None and date_using <= from_date:
+            continue
+
+        # saving the data of a record
+        data_record: dict[str, Any] = {}
         data_record["date"] = date_using
 
         # analytics that were done in that date
-        for activity in all_activities.keys():
-            # if an analytics for that day was available
-            if str(day_index) in all_activities[activity].keys():
-                data_record[activity] = list(all_activities[activity][str(day_index)])
+        day_key = str(day_index)
+        for activity, activity_data in all_activities.items():
+            users = activity_data.get(day_key)
             # if there was no analytics in that day
-            else:
+            if users is None:
                 data_record[activity] = []
+            elif account_dictionary is not None:
+                data_record[activity] = account_dictionary.decode(users)
+            else:
+                data_record[activity] = list(users)
 
         # fill in the all_joined_day member
-        data_record["all_joined_day"] = list(
-            account_names[date_using.date() == acc_join_date]
-        )
+        data_record["all_joined_day"] = list(joined_per_date.get(date_using.date(), []))
 
-        # all_data_records[str(day_index)] = data_record
-        all_data_records.append(data_record)
+        yield data_record
 
     # if there was no data just save empty date records
     if max_days_after == 0:
         data_record = {}
         data_record["date"] = start_date + timedelta(days=analytics_day_range)
 
-        for activity in all_activities.keys():
-            data_record[activity] = []
-
-        all_data_records = [data_record]
+        if from_date is None or data_record["date"] > from_date:
+            for activity in all_activities.keys():
+                data_record[activity] = []
 
-    return all_data_records
+            yield data_record
 
 
 def update_activities(past_activities, activities_list):
@@ -183,6 +240,7 @@ def get_users_past_window(
     window_start_date: datetime,
     window_end_date: datetime,
     collection: pymongo.collection.Collection,
+    heatmaps_buffer: HeatmapsBuffer | None = None,
 ) -> list[str]:
     """
     get all users in the past date window from specific collection
@@ -197,32 +255,49 @@ def get_users_past_window(
             must be in format of the database which for now is %Y-%m-%d
     collection : pymongo.collection.Collection
         the mongodb collection to do the aggregation
+    heatmaps_buffer : HeatmapsBuffer | None
+        the in-memory heatmaps of the current run
+        if given, the days covered by the buffer would be read from it
+        and just the days before it would be read from the collection
 
     Returns:
     ---------
     user_names : list[str]
         the user names for the past 7 days
     """
-    pipeline = [
-        # Filter documents based on date
-        {"$match": {"date": {"$gte": window_start_date, "$lt": window_end_date}}},
-        {"$group": {"_id": "$user"}},
-        {
-            "$group": {
-                "_id": None,
-                "uniqueAccounts": {"$push": "$_id"},
-            }
-        },
-    ]
-    result = list(collection.aggregate(pipeline))
+    database_end_date = window_end_date
+    if heatmaps_buffer is not None:
+        heatmaps_buffer.wait_until(window_end_date)
+        database_end_date = heatmaps_buffer.split_date(
+            window_start_date, window_end_date
+        )
 
     # in case of no data we would return empty string
     user_names = []
-    if result != []:
-        user_names = result[0]["uniqueAccounts"]
-        # removing remainder category
-        if "remainder" in user_names:
-            user_names.remove("remainder")
+    if window_start_date < database_end_date:
+        pipeline = [
+            # Filter documents based on date
+            {"$match": {"date": {"$gte": window_start_date, "$lt": database_end_date}}},
+            {"$group": {"_id": "$user"}},
+            {
+                "$group": {
+                    "_id": None,
+                    "uniqueAccounts": {"$push": "$_id"},
+                }
+            },
+        ]
+        result = list(collection.aggregate(pipeline))
+        if result != []:
+            user_names = result[0]["uniqueAccounts"]
+
+    if heatmaps_buffer is not None:
+        for user in heatmaps_buffer.get_users(database_end_date, window_end_date):
+            if user not in user_names:
+                user_names.append(user)
+
+    # removing remainder category
+    if "remainder" in user_names:
+        user_names.remove("remainder")
 
     return user_names
 
@@ -268,9 +343,16 @@ def assess_engagement(
     activities_name: list[str],
     activity_dict: dict[str, dict],
     analyzer_config: PlatformConfigBase,
-) -> tuple[DiGraph, dict[str, dict]]:
+    heatmaps_buffer: HeatmapsBuffer | None = None,
+    build_graph: bool = True,
+    account_dictionary: AccountDictionary | None = None,
+) -> tuple[DiGraph | None, dict[str, dict]]:
     """
     assess engagement of a window index for users
+    the `heatmaps_buffer` if given, is used to read the heatmaps
+    of the current run that might not be stored yet
+    the graph of the window is `None` if `build_graph` is False
+    the activities would have the codes of `account_dictionary` if given
     """
 
     hourly_analytics_using: list[str] = []
@@ -313,15 +395,21 @@ def assess_engagement(
         platform_id=platform_id,
         actions=hourly_analytics_using,
         interactions=raw_analytics_using,
+        heatmaps_buffer=heatmaps_buffer,
     )
 
     # assess engagement
     (graph_out, *activity_dict) = assess_engagment.compute(
         int_mat=int_mat,
         w_i=w_i,
-        acc_names=np.asarray(accounts),
+        acc_names=(
+            account_dictionary.encode(accounts)
+            if account_dictionary is not None
+            else np.asarray(accounts)
+        ),
         act_param=action_params,
         WINDOW_D=period_size,
+        build_graph=build_graph,
         **activity_dict,
     )
 
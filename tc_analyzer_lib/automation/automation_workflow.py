@@ -1,9 +1,11 @@
 import logging
 from typing import Any
 
-from pybars import Compiler
 from tc_analyzer_lib.automation.utils.automation_base import AutomationBase
+from tc_analyzer_lib.automation.utils.category_diff import CategoryDiff
+from tc_analyzer_lib.automation.utils.guild_member_names import GuildMemberNames
 from tc_analyzer_lib.automation.utils.model import AutomationDB
+from tc_analyzer_lib.automation.utils.template_cache import TemplateCache
 from tc_messageBroker.rabbit_mq.event import Event
 from tc_messageBroker.rabbit_mq.queue import Queue
 
@@ -13,7 +15,12 @@ class AutomationWorkflow(AutomationBase):
         super().__init__()
         self.automation_db = AutomationDB()
 
-    def start(self, platform_id: str, guild_id: str):
+    def start(
+        self,
+        platform_id: str,
+        guild_id: str,
+        memberactivities: list[dict[str, Any]] | None = None,
+    ):
         """
         start the automation workflow for a guild
 
@@ -21,6 +28,10 @@ class AutomationWorkflow(AutomationBase):
         -----------
         guild_id : str
             to select the right automation
+        memberactivities : list[dict[str, Any]] | None
+            the memberactivities documents already in memory (i.e. right after
+            the analyzer run) to get the trigger categories users from
+            default is `None` meaning to get them from database
         """
         log_prefix = f"GUILDID: {guild_id}: "
         automations = self.automation_db.load_from_db(guild_id)
@@ -30,6 +41,23 @@ class AutomationWorkflow(AutomationBase):
             msg = f"{log_prefix}Starting automation!"
             logging.info(f"{msg} number of automation fetched: {len(automations)}")
 
+        # the categories users are fetched once for all automations
+        category_diff = CategoryDiff(
+            self.mongo_client,
+            db_name=platform_id,
+            categories=self._get_trigger_categories(automations),
+            memberactivities=memberactivities,
+        )
+        # the names of all the users are fetched once and reused for all actions
+        member_names = GuildMemberNames(self.mongo_client, guild_id)
+        member_names.load(
+            {
+                user_id
+                for category in category_diff.categories
+                for user_id in category_diff.get_new_users(category)
+            }
+        )
+
         for at in automations:
             at_pre = f"{log_prefix}: automation id: {at.id}: "
             if at.enabled:
@@ -46,10 +74,7 @@ class AutomationWorkflow(AutomationBase):
 
                         members_by_category[category] = []
 
-                        users1, users2 = self._get_users_from_memberactivities(
-                            platform_id, category
-                        )
-                        users = self._subtract_users(users1, users2)
+                        users = category_diff.get_new_users(category)
 
                         for action in at.actions:
                             if action.enabled:
@@ -66,9 +91,13 @@ class AutomationWorkflow(AutomationBase):
                                     prepared_id_name = list(zip(users, users))
                                 else:
                                     prepared_id_name = self.prepare_names(
-                                        guild_id, list(users), user_field=type
+                                        guild_id,
+                                        list(users),
+                                        user_field=type,
+                                        member_names=member_names,
                                     )
 
+                                data_list: list[dict[str, Any]] = []
                                 for user_id, user_name in prepared_id_name:
                                     compiled_message: str
                                     if type is not None:
@@ -82,17 +111,20 @@ class AutomationWorkflow(AutomationBase):
                                     data = self._prepare_saga_data(
                                         platform_id, user_id, compiled_message
                                     )
-                                    saga_id = self._create_manual_saga(data)
-                                    logging.info(
-                                        f"{at_pre}Started to fire events for user {user_id}!"
-                                    )
-                                    # firing the event
-                                    self.fire_event(saga_id, data)
+                                    data_list.append(data)
 
                                     members_by_category[category].append(
                                         {"user_id": user_id, "user_name": user_name}
                                     )
 
+                                # creating all sagas at once and then firing the events
+                                saga_ids = self._create_manual_sagas(data_list)
+                                logging.info(
+                                    f"{at_pre}Started to fire events for "
+                                    f"{len(saga_ids)} users!"
+                                )
+                                self.fire_events(saga_ids, data_list)
+
                 if at.report.enabled:
                     # setting up the names to send message
                     # to avoid duplicate we used dictionary
@@ -108,14 +140,39 @@ class AutomationWorkflow(AutomationBase):
                         list(report_users.values()), at.report.template
                     )
 
-                    for recipent in at.report.recipientIds:
-                        data = self._prepare_saga_data(
-                            platform_id, recipent, compiled_message
-                        )
-                        saga_id = self._create_manual_saga(data)
+                    data_list = [
+                        self._prepare_saga_data(platform_id, recipent, compiled_message)
+                        for recipent in at.report.recipientIds
+                    ]
+                    saga_ids = self._create_manual_sagas(data_list)
+
+                    # firing the events
+                    self.fire_events(saga_ids, data_list)
 
-                        # firing the event
-                        self.fire_event(saga_id, data)
+    def _get_trigger_categories(self, automations: list) -> list[str]:
+        """
+        get the memberactivities categories of the enabled triggers
+
+        Parameters
+        ------------
+        automations : list[Automation]
+            the automations of a guild
+
+        Returns
+        ---------
+        categories : list[str]
+            the unique categories used within the automations
+        """
+        categories: list[str] = []
+        for at in automations:
+            if not at.enabled:
+                continue
+            for trigger in at.triggers:
+                category = trigger.options.get("category")
+                if trigger.enabled and isinstance(category, str):
+                    categories.append(category)
+
+        return list(dict.fromkeys(categories))
 
     def _prepare_report_compiled_message(
         self, user_names: list[str], template: str
@@ -145,6 +202,7 @@ class AutomationWorkflow(AutomationBase):
         and the output would be `username`
 
         Note: for now it just support returning one handlebar.
+        the types are cached per template, see `TemplateCache`
 
         Parameters
         ------------
@@ -156,11 +214,7 @@ class AutomationWorkflow(AutomationBase):
         type : str
             the handlebar type to use
         """
-        start_index = template.find("{{") + 2
-        end_index = template.find("}}")
-        if start_index == -1 or end_index == -1:
-            return None
-        return template[start_index:end_index]
+        return TemplateCache.get_instance().get_handlebar_type(template)
 
     def _compile_message(self, data: dict[str, str], message: str) -> str:
         """
@@ -173,8 +227,7 @@ class AutomationWorkflow(AutomationBase):
         message : str
             the string message that contain the handlebars
         """
-        compiler = Compiler()
-        template = compiler.compile(message)
+        template = TemplateCache.get_instance().get_template(message)
         compiled_message = template(data)
 
         return compiled_message
@@ -207,6 +260,7 @@ class AutomationWorkflow(AutomationBase):
     def fire_event(self, saga_id: str, data: dict[str, Any]) -> None:
         """
         fire the event `SEND_MESSAGE` to the user of a guild
+        the event is buffered and would be sent on the next flush of the publisher
 
         Parameters:
         ------------
@@ -224,3 +278,30 @@ class AutomationWorkflow(AutomationBase):
                 "data": data,
             },
         )
+
+    def fire_events(
+        self,
+        saga_ids: list[str],
+        data_list: list[dict[str, Any]],
+        batch_size: int = 500,
+    ) -> None:
+        """
+        fire the `SEND_MESSAGE` events for multiple users in batches
+        the events are buffered by the publisher and flushed after each batch
+
+        Parameters:
+        ------------
+        saga_ids : list[str]
+            the saga_id of each event
+        data_list : list[dict[str, Any]]
+            the data to fire for each saga, with the same order as `saga_ids`
+        batch_size : int
+            the number of events to publish before flushing
+        """
+        for idx in range(0, len(saga_ids), batch_size):
+            for saga_id, data in zip(
+                saga_ids[idx : idx + batch_size], data_list[idx : idx + batch_size]
+            ):
+                self.fire_event(saga_id, data)
+
+            self.rabbitmq.flush()
@@ -1,7 +1,9 @@
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timezone
 from typing import Any
 from uuid import uuid1
 
+from tc_analyzer_lib.automation.utils.category_diff import CategoryDiff
+from tc_analyzer_lib.automation.utils.guild_member_names import GuildMemberNames
 from tc_analyzer_lib.utils.mongo import MongoSingleton
 from tc_analyzer_lib.utils.rabbitmq import RabbitMQAccess
 
@@ -12,54 +14,8 @@ class AutomationBase:
         utilities for automation workflow
         """
         self.mongo_client = MongoSingleton.get_instance().get_client()
-        self.rabbitmq = RabbitMQAccess.get_instance().get_client()
-
-    def _get_users_from_guildmembers(
-        self, guild_id: str, user_ids: list[str], strategy: str = "ngu"
-    ) -> list[dict[str, str | None]]:
-        """
-        get the name of the users based on a strategy
-        - `n`: nickname
-        - `g`: global name
-        - `u`: username
-
-        Parameters
-        -------------
-        guild_id : str
-            the guild_id to find users from
-        user_ids : list[str]
-            a list of user id to get the data
-        strategy : str
-            what fields of the user to select from
-            can be either one of the `n`, `g`, `u` or any combination of them
-
-        Returns
-        ----------
-        users_data : list[dict[str, str | None]]
-            a dictionary of users with ngu names to use
-        """
-        user_fields = {"discordId": 1}
-        for field in strategy:
-            if field == "n":
-                user_fields["nickname"] = 1
-            elif field == "g":
-                user_fields["globalName"] = 1
-            elif field == "u":
-                user_fields["username"] = 1
-            else:
-                msg = "Wrong strategy given!"
-                msg += "should be either on of the `n`, `g`, or `u`!"
-                raise ValueError(msg)
-
-        user_fields["_id"] = 0
-
-        curosr = self.mongo_client[guild_id]["guildmembers"].find(
-            {"discordId": {"$in": user_ids}},
-            user_fields,
-        )
-
-        users_data = list(curosr)
-        return users_data
+        # the long-lived publisher, reusing the broker connection between runs
+        self.rabbitmq = RabbitMQAccess.get_instance().get_publisher()
 
     def _get_users_from_memberactivities(
         self, db_name: str, category: str
@@ -82,35 +38,10 @@ class AutomationBase:
         users2: list[str]
             the users from past two days
         """
-        projection = {category: 1, "date": 1, "_id": 0}
-        date_yesterday = (datetime.now() - timedelta(days=1)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        date_two_past_days = (datetime.now() - timedelta(days=2)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-
-        users = (
-            self.mongo_client[db_name]["memberactivities"]
-            .find(
-                {
-                    "date": {
-                        "$gte": date_two_past_days,
-                        "$lte": date_yesterday,
-                    }
-                },
-                projection,
-            )
-            .limit(2)
+        category_diff = CategoryDiff(
+            self.mongo_client, db_name=db_name, categories=[category]
         )
-
-        users1: list[str] = []
-        users2: list[str] = []
-        for users_data in users:
-            if users_data["date"] == date_yesterday:
-                users1 = users_data[category]
-            else:
-                users2 = users_data[category]
+        users1, users2 = category_diff.get_users(category)
 
         return users1, users2
 
@@ -150,32 +81,75 @@ class AutomationBase:
             the id of created saga
         """
 
-        saga_id = str(uuid1())
-        self.mongo_client["Saga"]["sagas"].insert_one(
-            {
-                "choreography": {
-                    "name": "DISCORD_NOTIFY_USERS",
-                    "transactions": [
-                        {
-                            "queue": "DISCORD_BOT",
-                            "event": "SEND_MESSAGE",
-                            "order": 1,
-                            "status": "NOT_STARTED",
-                        }
-                    ],
-                },
-                "status": "IN_PROGRESS",
-                "data": data,
-                "sagaId": saga_id,
-                "createdAt": datetime.now(timezone.utc),
-                "updatedAt": datetime.now(timezone.utc),
-            }
-        )
+        saga = self._prepare_manual_saga(data)
+        self.mongo_client["Saga"]["sagas"].insert_one(saga)
+
+        return saga["sagaId"]
+
+    def _create_manual_sagas(self, data_list: list[dict[str, Any]]) -> list[str]:
+        """
+        create multiple manual sagas using just one database round-trip
+
+        Parameters:
+        ------------
+        data_list : list[dict[str, Any]]
+            the data of each saga
+
+        Returns:
+        ---------
+        saga_ids : list[str]
+            the id of created sagas, with the same order as `data_list`
+        """
+        if len(data_list) == 0:
+            return []
+
+        sagas = [self._prepare_manual_saga(data) for data in data_list]
+        self.mongo_client["Saga"]["sagas"].insert_many(sagas)
+
+        saga_ids = [saga["sagaId"] for saga in sagas]
+        return saga_ids
+
+    def _prepare_manual_saga(self, data: dict[str, Any]) -> dict[str, Any]:
+        """
+        prepare the manual saga document
+
+        Parameters:
+        ------------
+        data : dict[str, Any]
+            the data we want to have on the saga
 
-        return saga_id
+        Returns:
+        ---------
+        saga : dict[str, Any]
+            the saga document to be saved
+        """
+        saga = {
+            "choreography": {
+                "name": "DISCORD_NOTIFY_USERS",
+                "transactions": [
+                    {
+                        "queue": "DISCORD_BOT",
+                        "event": "SEND_MESSAGE",
+                        "order": 1,
+                        "status": "NOT_STARTED",
+                    }
+                ],
+            },
+            "status": "IN_PROGRESS",
+            "data": data,
+            "sagaId": str(uuid1()),
+            "createdAt": datetime.now(timezone.utc),
+            "updatedAt": datetime.now(timezone.utc),
+        }
+
+        return saga
 
     def prepare_names(
-        self, guild_id: str, user_ids: list[str], user_field: str = "username"
+        self,
+        guild_id: str,
+        user_ids: list[str],
+        user_field: str = "username",
+        member_names: GuildMemberNames | None = None,
     ) -> list[tuple[str, str]]:
         """
         prepare the name to use in message
@@ -195,6 +169,9 @@ class AutomationBase:
             - `globalName`
             - `ngu` -> is the combination of above
             - default is `username`
+        member_names : GuildMemberNames | None
+            the already loaded names of the guild members to reuse
+            default is `None` meaning to fetch the names from database
 
         Returns:
         --------
@@ -203,30 +180,8 @@ class AutomationBase:
             the reason we're returning the id again is we want to
             have the right alignment of id and name
         """
-        # strategy selection
-        fields: str
-        if user_field == "ngu":
-            fields = "ngu"
-        else:
-            fields = user_field[0]  # choose the first character
-
-        users_data = self._get_users_from_guildmembers(
-            guild_id=guild_id, user_ids=user_ids, strategy=fields
-        )
-
-        prepared_id_name: list[tuple[str, str]] = []
-
-        if user_field == "ngu":
-            for user in users_data:
-                if user["nickname"] is not None:
-                    prepared_id_name.append((user["discordId"], user["nickname"]))  # type: ignore
-                elif user["globalName"] is not None:
-                    prepared_id_name.append((user["discordId"], user["globalName"]))  # type: ignore
-                else:
-                    # this would never be None
-                    prepared_id_name.append((user["discordId"], user["username"]))  # type: ignore
-        else:
-            for user in users_data:
-                prepared_id_name.append((user["discordId"], user[user_field]))  # type: ignore
+        if member_names is None:
+            member_names = GuildMemberNames(self.mongo_client, guild_id)
 
+        prepared_id_name = member_names.get_names(user_ids, user_field=user_field)
         return prepared_id_name
@@ -0,0 +1,168 @@
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from pymongo import MongoClient
+
+
+class CategoryDiff:
+    def __init__(
+        self,
+        mongo_client: MongoClient,
+        db_name: str,
+        categories: list[str],
+        memberactivities: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """
+        the users of memberactivities categories from yesterday
+        and the day before, and their difference (the newly added users)
+
+        the two memberactivities documents are fetched once, projected to just
+        the needed categories and the differences are cached per category
+        so they could be shared between all the automations of a platform
+
+        Parameters
+        ------------
+        mongo_client : MongoClient
+            the client to access the database
+        db_name : str
+            the database to get the memberactivities
+        categories : list[str]
+            the categories to get, i.e. the categories of all automation triggers
+        memberactivities : list[dict[str, Any]] | None
+            the memberactivities documents that are already in memory
+            (i.e. the results of the analyzer run)
+            if both days are available within them no database query would be made
+            default is `None` meaning to fetch the documents from database
+        """
+        self.mongo_client = mongo_client
+        self.db_name = db_name
+        self.categories = list(dict.fromkeys(categories))
+        self.memberactivities = memberactivities
+
+        self.date_yesterday = (datetime.now() - timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.date_two_past_days = (datetime.now() - timedelta(days=2)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+        self._users: dict[str, tuple[list[str], list[str]]] = {}
+        self._new_users: dict[str, set[str]] = {}
+
+    def get_users(self, category: str) -> tuple[list[str], list[str]]:
+        """
+        get the users of a memberactivities category
+
+        Parameters
+        ------------
+        category : str
+            the category of memberactivities
+
+        Returns
+        ---------
+        users1: list[str]
+            the users for yesterday
+        users2: list[str]
+            the users from past two days
+        """
+        if category not in self._users:
+            # loading all the categories not loaded yet at once
+            categories = [item for item in self.categories if item not in self._users]
+            if category not in categories:
+                categories.append(category)
+            self._load(categories)
+
+        return self._users[category]
+
+    def get_new_users(self, category: str) -> set[str]:
+        """
+        get the users of a category for yesterday that weren't in it the day before
+
+        Parameters
+        ------------
+        category : str
+            the category of memberactivities
+
+        Returns
+        ---------
+        new_users : set[str]
+            the users of yesterday subtracted by the users of the day before
+        """
+        if category not in self._new_users:
+            users1, users2 = self.get_users(category)
+            self._new_users[category] = set(users1) - set(users2)
+
+        return self._new_users[category]
+
+    def _load(self, categories: list[str]) -> None:
+        """
+        load the users of the given categories
+        either from the in-memory documents or the database
+        """
+        documents = self._find_in_memory()
+        if documents is None:
+            logging.info(
+                f"Fetching memberactivities categories {categories} "
+                f"from database {self.db_name}"
+            )
+            documents = self._find_in_db(categories)
+
+        yesterday_document = documents.get(self.date_yesterday.date(), {})
+        two_days_document = documents.get(self.date_two_past_days.date(), {})
+        for category in categories:
+            self._users[category] = (
+                yesterday_document.get(category, []),
+                two_days_document.get(category, []),
+            )
+
+    def _find_in_memory(self) -> dict[date, dict[str, Any]] | None:
+        """
+        get the documents of the two days from the in-memory memberactivities
+
+        Returns
+        ---------
+        documents : dict[date, dict[str, Any]] | None
+            the documents per day, `None` if either of the days wasn't in memory
+        """
+        if self.memberactivities is None:
+            return None
+
+        days = {self.date_yesterday.date(), self.date_two_past_days.date()}
+        documents: dict[date, dict[str, Any]] = {}
+        for document in self.memberactivities:
+            if isinstance(document.get("date"), datetime):
+                day = document["date"].date()
+                if day in days:
+                    documents[day] = document
+
+        if len(documents) != len(days):
+            return None
+
+        return documents
+
+    def _find_in_db(self, categories: list[str]) -> dict[date, dict[str, Any]]:
+        """
+        fetch the documents of the two days from database
+        projected to just the given categories
+        """
+        projection = {category: 1 for category in categories}
+        projection["date"] = 1
+        projection["_id"] = 0
+
+        cursor = (
+            self.mongo_client[self.db_name]["memberactivities"]
+            .find(
+                {
+                    "date": {
+                        "$gte": self.date_two_past_days,
+                        "$lte": self.date_yesterday,
+                    }
+                },
+                projection,
+            )
+            .limit(2)
+        )
+
+        documents = {document["date"].date(): document for document in cursor}
+        return documents
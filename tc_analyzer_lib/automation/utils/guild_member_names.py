@@ -0,0 +1,108 @@
+from pymongo import MongoClient
+
+
+class GuildMemberNames:
+    def __init__(self, mongo_client: MongoClient, guild_id: str) -> None:
+        """
+        the names of guild members, loaded from `guildmembers` collection
+        the members are fetched once and memoized so they could be reused
+        for all the actions and the report of an automation run
+
+        Parameters
+        ------------
+        mongo_client : MongoClient
+            the client to access the database
+        guild_id : str
+            the guild to get its members names
+        """
+        self.mongo_client = mongo_client
+        self.guild_id = guild_id
+
+        self._members: dict[str, dict[str, str | None]] = {}
+        # the ids that weren't available in guildmembers
+        self._unavailable: set[str] = set()
+
+    def load(self, user_ids: list[str] | set[str]) -> None:
+        """
+        fetch the names of the users that weren't fetched before
+        all the name fields are fetched at once, so any strategy could be used after
+
+        Parameters
+        ------------
+        user_ids : list[str] | set[str]
+            the user ids to fetch their names
+        """
+        to_fetch = [
+            user_id
+            for user_id in dict.fromkeys(user_ids)
+            if user_id not in self._members and user_id not in self._unavailable
+        ]
+        if len(to_fetch) == 0:
+            return
+
+        cursor = self.mongo_client[self.guild_id]["guildmembers"].find(
+            {"discordId": {"$in": to_fetch}},
+            {
+                "discordId": 1,
+                "nickname": 1,
+                "globalName": 1,
+                "username": 1,
+                "_id": 0,
+            },
+        )
+        for member in cursor:
+            self._members[member["discordId"]] = member
+
+        self._unavailable.update(set(to_fetch) - set(self._members.keys()))
+
+    def get_names(
+        self, user_ids: list[str], user_field: str = "username"
+    ) -> list[tuple[str, str]]:
+        """
+        get the names of the users to use in the message
+        the users not available in guildmembers are skipped
+
+        Parameters
+        ------------
+        user_ids : list[str]
+            a list of user ids to prepare their name
+        user_field : str
+            the field to choose from the user
+            can be either one of below
+            - `username`
+            - `nickname`
+            - `globalName`
+            - `ngu` -> is the combination of above
+
+        Returns
+        ---------
+        prepared_id_name : list[tuple[str, str]]
+            the ids and the names of users
+        """
+        if user_field not in ["ngu", "username", "nickname", "globalName"]:
+            msg = "Wrong user_field given! should be either one of "
+            msg += "`ngu`, `username`, `nickname`, or `globalName`!"
+            raise ValueError(msg)
+
+        self.load(user_ids)
+
+        prepared_id_name: list[tuple[str, str]] = []
+        for user_id in dict.fromkeys(user_ids):
+            if user_id not in self._members:
+                continue
+
+            user = self._members[user_id]
+            if user_field == "ngu":
+                if user.get("nickname") is not None:
+                    name = user["nickname"]
+                elif user.get("globalName") is not None:
+                    name = user["globalName"]
+                else:
+                    # this would never be None
+                    name = user.get("username")
+            else:
+                name = user.get(user_field)
+
+            prepared_id_name.append((user_id, name))  # type: ignore
+
+        return prepared_id_name
@@ -0,0 +1,110 @@
+import sys
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from pybars import Compiler
+
+
+class TemplateCache:
+    __instance = None
+
+    def __init__(self, max_size: int = 128) -> None:
+        """
+        the cache of compiled handlebar templates, keyed by the template text
+        shared across automations and guilds, evicting the least recently used ones
+
+        Note: pybars registers a module for each compiled template,
+        so recompiling the same template for each user would also grow the memory
+
+        Parameters
+        ------------
+        max_size : int
+            the maximum number of templates to keep compiled
+        """
+        if TemplateCache.__instance is not None:
+            raise Exception("Singletone class! use `get_instance` method always.")
+        else:
+            self.max_size = max_size
+            self._templates: OrderedDict[str, Callable] = OrderedDict()
+            self._handlebar_types: OrderedDict[str, str | None] = OrderedDict()
+            self._lock = threading.Lock()
+            TemplateCache.__instance = self
+
+    @staticmethod
+    def get_instance():
+        if TemplateCache.__instance is None:
+            TemplateCache()
+        return TemplateCache.__instance
+
+    def get_template(self, template: str) -> Callable:
+        """
+        get the compiled template, compiling it just if it wasn't cached
+
+        Parameters
+        ------------
+        template : str
+            the template message with handlebars
+
+        Returns
+        ---------
+        compiled_template : Callable
+            the compiled template to be called with the handlebars data
+        """
+        with self._lock:
+            if template in self._templates:
+                self._templates.move_to_end(template)
+                return self._templates[template]
+
+            # the pybars compiler isn't thread-safe, so compiling under the lock
+            compiled_template = Compiler().compile(template)
+            self._templates[template] = compiled_template
+            if len(self._templates) > self.max_size:
+                _, evicted = self._templates.popitem(last=False)
+                sys.modules.pop(evicted.__module__, None)
+
+            return compiled_template
+
+    def get_handlebar_type(self, template: str) -> str | None:
+        """
+        get the handlebar type of a template, parsing it just if it wasn't cached
+        see `AutomationWorkflow._get_handlebar_type` for more information
+
+        Parameters
+        ------------
+        template : str
+            the template message to extract the type
+
+        Returns
+        ---------
+        type : str | None
+            the handlebar type to use
+        """
+        with self._lock:
+            if template in self._handlebar_types:
+                self._handlebar_types.move_to_end(template)
+                return self._handlebar_types[template]
+
+            start_index = template.find("{{") + 2
+            end_index = template.find("}}")
+            type: str | None
+            if start_index == -1 or end_index == -1:
+                type = None
+            else:
+                type = template[start_index:end_index]
+
+            self._handlebar_types[template] = type
+            if len(self._handlebar_types) > self.max_size:
+                self._handlebar_types.popitem(last=False)
+
+            return type
+
+    def clear(self) -> None:
+        """
+        remove all the cached templates
+        """
+        with self._lock:
+            for compiled_template in self._templates.values():
+                sys.modules.pop(compiled_template.__module__, None)
+            self._templates.clear()
+            self._handlebar_types.clear()
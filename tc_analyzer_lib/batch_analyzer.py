@@ -0,0 +1,285 @@
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any
+
+from tc_analyzer_lib.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from tc_analyzer_lib.schemas.platform_configs import DiscordAnalyzerConfig
+from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
+from tc_analyzer_lib.tc_analyzer import TCAnalyzer
+from tc_analyzer_lib.utils.instrumentation import MetricsSink
+from tc_analyzer_lib.utils.neo4j_async import AsyncNeo4jOps
+
+
+class AnalyzerJob:
+    def __init__(
+        self,
+        platform_id: str,
+        resources: list[str],
+        period: datetime,
+        action: dict[str, int],
+        window: dict[str, int],
+        analyzer_config: PlatformConfigBase = DiscordAnalyzerConfig(),
+        recompute: bool = False,
+    ) -> None:
+        """
+        a platform to be analyzed within a batch
+
+        Parameters
+        ------------
+        platform_id : str
+            platform to analyze its data
+        resources : list[str]
+            the resources id for filtering on data
+        period : datetime
+            the period to compute the analytics for
+        action : dict[str, int]
+            Parameters for computing different memberactivities
+        window : dict[str, int]
+            Parameters for the whole analyzer, includes the step size and window size
+        analyzer_config : PlatformConfigBase
+            the config for analyzer to use
+        recompute : bool
+            if True, the analytics would be recomputed from the start
+            else the analytics would be appended to the previous ones
+        """
+        self.platform_id = platform_id
+        self.resources = resources
+        self.period = period
+        self.action = action
+        self.window = window
+        self.analyzer_config = analyzer_config
+        self.recompute = recompute
+
+
+class AnalyzerJobReport:
+    def __init__(
+        self,
+        platform_id: str,
+        status: str,
+        duration_seconds: float,
+        error: str | None = None,
+        run_report: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        the result of analyzing a platform within a batch
+
+        Parameters
+        ------------
+        platform_id : str
+            the analyzed platform
+        status : str
+            either `succeeded` or `failed`
+        duration_seconds : float
+            the time it took to analyze the platform
+        error : str | None
+            the error message in case of failure
+        run_report : dict[str, Any] | None
+            the instrumentation report of the analyzer run (if any)
+        """
+        self.platform_id = platform_id
+        self.status = status
+        self.duration_seconds = duration_seconds
+        self.error = error
+        self.run_report = run_report
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "platform_id": self.platform_id,
+            "status": self.status,
+            "duration_seconds": self.duration_seconds,
+            "error": self.error,
+            "run_report": self.run_report,
+        }
+
+
+class BatchAnalyzerRunner:
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        metrics_sink: MetricsSink | None = None,
+        pipelined: bool = False,
+        async_neo4j: bool = False,
+        server_side_heatmaps: bool = False,
+        track_dirty_days: bool = False,
+        skip_unchanged: bool = False,
+        checkpoint_days: int | None = None,
+        delta_graph: bool = False,
+        ensure_graph_schema: bool = False,
+    ) -> None:
+        """
+        analyze multiple platforms with a bounded concurrency
+        all the analyzers would share the same database connections
+
+        Parameters
+        ------------
+        max_concurrency : int
+            the maximum number of platforms to be analyzed at the same time
+        metrics_sink : MetricsSink | None
+            where to emit the run report of each platform
+        pipelined : bool
+            whether to run the analyzers in pipelined mode or not
+            see `TCAnalyzer` for more information
+        async_neo4j : bool
+            whether to use the async neo4j driver for the graph or not
+            see `TCAnalyzer` for more information
+        server_side_heatmaps : bool
+            whether to compute the heatmaps on database server or not
+            see `TCAnalyzer` for more information
+        track_dirty_days : bool
+            whether to recompute the changed days of raw data or not
+            see `TCAnalyzer` for more information
+        skip_unchanged : bool
+            whether to skip the stages with unchanged inputs or not
+            see `TCAnalyzer` for more information
+        checkpoint_days : int | None
+            the days to checkpoint the recomputes on
+            see `TCAnalyzer` for more information
+        delta_graph : bool
+            whether to write just the changes of the graph or not
+            see `TCAnalyzer` for more information
+        ensure_graph_schema : bool
+            whether to create the missing neo4j constraints and indexes or not
+            see `TCAnalyzer` for more information
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency should be at least 1!")
+
+        self.max_concurrency = max_concurrency
+        self.metrics_sink = metrics_sink
+        self.pipelined = pipelined
+        self.async_neo4j = async_neo4j
+        self.server_side_heatmaps = server_side_heatmaps
+        self.track_dirty_days = track_dirty_days
+        self.skip_unchanged = skip_unchanged
+        self.checkpoint_days = checkpoint_days
+        self.delta_graph = delta_graph
+        self.ensure_graph_schema = ensure_graph_schema
+        self._db_connections: MongoNeo4jDB | None = None
+
+    def get_db_connections(self) -> MongoNeo4jDB:
+        """
+        get the database connections shared between the analyzers
+        the connection would be set up just once for the runner
+        """
+        if self._db_connections is None:
+            self._db_connections = MongoNeo4jDB(testing=False)
+            self._db_connections.set_mongo_db_ops()
+
+        return self._db_connections
+
+    async def run(self, jobs: list[AnalyzerJob]) -> list[AnalyzerJobReport]:
+        """
+        analyze the given platforms
+
+        Parameters
+        ------------
+        jobs : list[AnalyzerJob]
+            the platforms to analyze
+            a platform cannot be given more than once within the jobs
+
+        Returns
+        ---------
+        reports : list[AnalyzerJobReport]
+            the report of each job, with the same order as given jobs
+            a failing job wouldn't stop the other ones
+        """
+        platform_ids = [job.platform_id for job in jobs]
+        duplicates = {
+            platform_id
+            for platform_id in platform_ids
+            if platform_ids.count(platform_id) > 1
+        }
+        if duplicates:
+            raise ValueError(
+                f"Each platform can be analyzed once within a batch! duplicates: {duplicates}"
+            )
+
+        logging.info(
+            f"Analyzing {len(jobs)} platforms with max concurrency "
+            f"of {self.max_concurrency}!"
+        )
+
+        # setting up the connections before starting the jobs
+        # so they wouldn't race creating it
+        db_connections = await asyncio.to_thread(self.get_db_connections)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # keeping the async neo4j driver for the whole batch
+        # so it wouldn't be closed and created again between the jobs
+        async_neo4j_scope = nullcontext()
+        if self.async_neo4j:
+            async_neo4j_scope = AsyncNeo4jOps.get_instance().use()
+        async with async_neo4j_scope:
+            reports = await asyncio.gather(
+                *[self._run_job(job, semaphore, db_connections) for job in jobs]
+            )
+
+        failed_count = sum(report.status == "failed" for report in reports)
+        logging.info(
+            f"Batch analyze finished! succeeded: {len(reports) - failed_count}, "
+            f"failed: {failed_count}"
+        )
+        return list(reports)
+
+    async def _run_job(
+        self,
+        job: AnalyzerJob,
+        semaphore: asyncio.Semaphore,
+        db_connections: MongoNeo4jDB,
+    ) -> AnalyzerJobReport:
+        """
+        analyze one platform
+        all the exceptions are caught so a job wouldn't affect the others
+        """
+        async with semaphore:
+            start = time.perf_counter()
+            analyzer: TCAnalyzer | None = None
+            try:
+                analyzer = await asyncio.to_thread(
+                    TCAnalyzer,
+                    platform_id=job.platform_id,
+                    resources=job.resources,
+                    period=job.period,
+                    action=job.action,
+                    window=job.window,
+                    analyzer_config=job.analyzer_config,
+                    metrics_sink=self.metrics_sink,
+                    pipelined=self.pipelined,
+                    db_connections=db_connections,
+                    offload_blocking=True,
+                    async_neo4j=self.async_neo4j,
+                    server_side_heatmaps=self.server_side_heatmaps,
+                    track_dirty_days=self.track_dirty_days,
+                    skip_unchanged=self.skip_unchanged,
+                    checkpoint_days=self.checkpoint_days,
+                    delta_graph=self.delta_graph,
+                    ensure_graph_schema=self.ensure_graph_schema,
+                )
+                if job.recompute:
+                    await analyzer.recompute()
+                else:
+                    await analyzer.run_once()
+
+                status = "succeeded"
+                error = None
+            except Exception as exp:
+                logging.error(
+                    f"PLATFORMID: {job.platform_id}: Failed to analyze platform, {exp}"
+                )
+                status = "failed"
+                error = repr(exp)
+
+            run_report = None
+            if analyzer is not None and analyzer.instrumentation is not None:
+                run_report = analyzer.instrumentation.report()
+
+            return AnalyzerJobReport(
+                platform_id=job.platform_id,
+                status=status,
+                duration_seconds=time.perf_counter() - start,
+                error=error,
+                run_report=run_report,
+            )
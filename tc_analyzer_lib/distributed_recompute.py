@@ -0,0 +1,361 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from redis import Redis
+from rq import Queue
+from rq.job import Job
+from tc_analyzer_lib.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from tc_analyzer_lib.metrics.heatmaps import Heatmaps
+from tc_analyzer_lib.schemas import GraphSchema
+from tc_analyzer_lib.schemas.platform_configs import DiscordAnalyzerConfig
+from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
+from tc_analyzer_lib.tc_analyzer import TCAnalyzer
+from tc_analyzer_lib.utils.mongo import MongoSingleton
+from tc_analyzer_lib.utils.redis import RedisSingleton
+
+
+class RecomputeProgress:
+    def __init__(self, redis_client: Redis, platform_id: str) -> None:
+        """
+        the progress of a distributed recompute, tracked on redis
+
+        Parameters
+        ------------
+        redis_client : Redis
+            the redis connection to track the progress on
+        platform_id : str
+            the platform being recomputed
+        """
+        self.redis_client = redis_client
+        self.key = f"analyzer:recompute:{platform_id}"
+
+    def start(self, total_shards: int) -> None:
+        """
+        reset the progress for a new recompute
+        """
+        self.redis_client.delete(self.key)
+        self.redis_client.hset(
+            self.key,
+            mapping={
+                "status": "heatmaps",
+                "total_shards": total_shards,
+                "completed_shards": 0,
+                "started_at": datetime.now(tz=timezone.utc).isoformat(),
+            },
+        )
+
+    def shard_done(self) -> int:
+        """
+        mark a heatmaps shard as completed
+
+        Returns
+        ---------
+        completed_shards : int
+            the count of completed shards
+        """
+        return self.redis_client.hincrby(self.key, "completed_shards", 1)
+
+    def set_status(self, status: str) -> None:
+        """
+        set the status of the recompute
+        could be `heatmaps`, `memberactivities`, `done`, or `failed`
+        """
+        self.redis_client.hset(self.key, "status", status)
+
+    def get(self) -> dict[str, str]:
+        """
+        get the progress of the recompute
+
+        Returns
+        ---------
+        progress : dict[str, str]
+            the progress fields
+            would be empty if no recompute was started for the platform
+        """
+        progress = self.redis_client.hgetall(self.key)
+        return {
+            (key.decode() if isinstance(key, bytes) else key): (
+                value.decode() if isinstance(value, bytes) else value
+            )
+            for key, value in progress.items()
+        }
+
+
+class DistributedRecompute:
+    def __init__(
+        self,
+        platform_id: str,
+        resources: list[str],
+        period: datetime,
+        action: dict[str, int],
+        window: dict[str, int],
+        analyzer_config: PlatformConfigBase = DiscordAnalyzerConfig(),
+        shard_days: int = 30,
+        queue: Queue | None = None,
+        redis_client: Redis | None = None,
+        job_timeout: int = 3 * 60 * 60,
+    ) -> None:
+        """
+        recompute the analytics of a platform across the RQ workers
+        the heatmaps are computed per day, so their date range is sharded
+        into jobs to be computed in parallel, and the memberactivities
+        and graph analytics are computed in a job after all the shards are done
+
+        Parameters
+        ------------
+        platform_id : str
+            platform to recompute its analytics
+        resources : list[str]
+            the resources id for filtering on data
+        period : datetime
+            the period to compute the analytics for
+        action : dict[str, int]
+            Parameters for computing different memberactivities
+        window : dict[str, int]
+            Parameters for the whole analyzer, includes the step size and window size
+        analyzer_config : PlatformConfigBase
+            the config for analyzer to use
+        shard_days : int
+            the count of days of heatmaps to compute in each job
+        queue : Queue | None
+            the RQ queue to enqueue the jobs in
+            default is `None` meaning the `analyzer` queue on `redis_client`
+        redis_client : Redis | None
+            the redis connection to track the progress on
+            default is `None` meaning the connection of `RedisSingleton`
+        job_timeout : int
+            the maximum seconds each job could take
+        """
+        if shard_days < 1:
+            raise ValueError("shard_days should be at least 1!")
+
+        self.platform_id = platform_id
+        self.resources = resources
+        self.period = period.astimezone(tz=timezone.utc)
+        self.action = action
+        self.window = window
+        self.analyzer_config = analyzer_config
+        self.shard_days = shard_days
+        self.job_timeout = job_timeout
+
+        if redis_client is None:
+            redis_client = RedisSingleton.get_instance().get_client()
+        self.redis_client = redis_client
+        self.queue = queue or Queue("analyzer", connection=redis_client)
+        self.progress = RecomputeProgress(redis_client, platform_id)
+
+    def shard_date_range(self) -> list[tuple[datetime, datetime]]:
+        """
+        split the days from period until today into shards
+
+        Returns
+        ---------
+        shards : list[tuple[datetime, datetime]]
+            the start day and end day (not included) of each shard
+        """
+        start_day = self.period.replace(hour=0, minute=0, second=0, microsecond=0)
+        today = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+
+        shards: list[tuple[datetime, datetime]] = []
+        while start_day < today:
+            end_day = min(start_day + timedelta(days=self.shard_days), today)
+            shards.append((start_day, end_day))
+            start_day = end_day
+
+        return shards
+
+    def enqueue(self) -> Job:
+        """
+        remove the previous heatmaps and enqueue the recompute jobs
+
+        Returns
+        ---------
+        job : Job
+            the memberactivities and graph analytics job
+            which would be run after all the heatmaps shards were done
+        """
+        log_prefix = f"PLATFORMID: {self.platform_id}:"
+
+        # the same as the single process recompute
+        # the heatmaps would be computed from scratch
+        client = MongoSingleton.get_instance().get_client()
+        client[self.platform_id]["heatmaps"].delete_many({})
+
+        shards = self.shard_date_range()
+        self.progress.start(total_shards=len(shards))
+
+        job_kwargs = {
+            "platform_id": self.platform_id,
+            "resources": self.resources,
+            "period": self.period,
+            "analyzer_config": self.analyzer_config.to_dict(),
+        }
+        shard_jobs = [
+            self.queue.enqueue(
+                compute_heatmaps_shard,
+                kwargs={**job_kwargs, "start_day": start_day, "end_day": end_day},
+                job_timeout=self.job_timeout,
+                description=(
+                    f"{log_prefix} heatmaps {start_day.date()} - {end_day.date()}"
+                ),
+            )
+            for start_day, end_day in shards
+        ]
+        logging.info(f"{log_prefix} Enqueued {len(shard_jobs)} heatmaps shards!")
+
+        return self.queue.enqueue(
+            finish_distributed_recompute,
+            kwargs={**job_kwargs, "action": self.action, "window": self.window},
+            depends_on=shard_jobs,
+            job_timeout=self.job_timeout,
+            description=f"{log_prefix} memberactivities and graph analytics",
+        )
+
+    def get_progress(self) -> dict[str, str]:
+        """
+        get the progress of the recompute
+        """
+        return self.progress.get()
+
+
+def compute_heatmaps_shard(
+    platform_id: str,
+    resources: list[str],
+    period: datetime,
+    analyzer_config: dict,
+    start_day: datetime,
+    end_day: datetime,
+    redis_client: Redis | None = None,
+) -> int:
+    """
+    the RQ job computing and storing the heatmaps of a shard of days
+    the heatmaps of the shard are removed first, so the job could be retried
+
+    Parameters
+    ------------
+    platform_id : str
+        the platform to compute its heatmaps
+    resources : list[str]
+        the resources id for filtering on data
+    period : datetime
+        the period of the analytics
+    analyzer_config : dict
+        the config for analyzer, in dictionary form
+    start_day : datetime
+        the first day of the shard
+    end_day : datetime
+        the day to compute the shard until (not included)
+    redis_client : Redis | None
+        the redis connection to track the progress on
+        default is `None` meaning the connection of `RedisSingleton`
+
+    Returns
+    ---------
+    documents_count : int
+        the count of heatmaps documents stored
+    """
+    if redis_client is None:
+        redis_client = RedisSingleton.get_instance().get_client()
+    progress = RecomputeProgress(redis_client, platform_id)
+
+    try:
+        documents_count = asyncio.run(
+            _compute_heatmaps_shard(
+                platform_id,
+                resources,
+                max(period, start_day),
+                PlatformConfigBase.from_dict(analyzer_config),
+                start_day,
+                end_day,
+            )
+        )
+    except Exception:
+        progress.set_status("failed")
+        raise
+
+    completed_shards = progress.shard_done()
+    logging.info(
+        f"PLATFORMID: {platform_id}: Heatmaps shard {start_day.date()} - "
+        f"{end_day.date()} done! completed shards: {completed_shards}"
+    )
+    return documents_count
+
+
+async def _compute_heatmaps_shard(
+    platform_id: str,
+    resources: list[str],
+    shard_period: datetime,
+    analyzer_config: PlatformConfigBase,
+    start_day: datetime,
+    end_day: datetime,
+) -> int:
+    heatmaps_analysis = Heatmaps(
+        platform_id=platform_id,
+        period=shard_period,
+        resources=resources,
+        analyzer_config=analyzer_config,
+    )
+    await heatmaps_analysis.utils.remove_heatmaps_from(start_day, until=end_day)
+
+    db_connections = MongoNeo4jDB()
+    db_connections.set_mongo_db_ops()
+    graph_schema = GraphSchema(platform=analyzer_config.platform)
+
+    documents_count = 0
+    async for heatmaps_data in heatmaps_analysis.start(
+        from_start=True, end_date=end_day
+    ):
+        # just the heatmaps are written, the memberactivities are left untouched
+        db_connections.store_analytics_data(
+            analytics_data={
+                "heatmaps": heatmaps_data,
+                "memberactivities": (None, None),
+            },
+            platform_id=platform_id,
+            graph_schema=graph_schema,
+            remove_memberactivities=False,
+            remove_heatmaps=False,
+        )
+        documents_count += len(heatmaps_data)
+
+    return documents_count
+
+
+def finish_distributed_recompute(
+    platform_id: str,
+    resources: list[str],
+    period: datetime,
+    analyzer_config: dict,
+    action: dict[str, int],
+    window: dict[str, int],
+    redis_client: Redis | None = None,
+) -> None:
+    """
+    the RQ job computing the memberactivities and graph analytics
+    after all the heatmaps shards were stored
+
+    the parameters are the same as `DistributedRecompute`
+    """
+    if redis_client is None:
+        redis_client = RedisSingleton.get_instance().get_client()
+    progress = RecomputeProgress(redis_client, platform_id)
+    progress.set_status("memberactivities")
+
+    try:
+        analyzer = TCAnalyzer(
+            platform_id=platform_id,
+            resources=resources,
+            period=period,
+            action=action,
+            window=window,
+            analyzer_config=PlatformConfigBase.from_dict(analyzer_config),
+        )
+        asyncio.run(analyzer.recompute_memberactivities())
+    except Exception:
+        progress.set_status("failed")
+        raise
+
+    progress.set_status("done")
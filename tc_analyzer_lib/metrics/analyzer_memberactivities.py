@@ -2,6 +2,7 @@ import logging
 from datetime import datetime, timedelta, timezone
 
 from tc_analyzer_lib.algorithms.compute_member_activity import compute_member_activity
+from tc_analyzer_lib.metrics.heatmaps.heatmaps_buffer import HeatmapsBuffer
 from tc_analyzer_lib.metrics.memberactivity_utils import MemberActivityUtils
 from tc_analyzer_lib.models.MemberActivityModel import MemberActivityModel
 from tc_analyzer_lib.models.RawInfoModel import RawInfoModel
@@ -28,7 +29,11 @@ class MemberActivities:
         self.utils = MemberActivityUtils()
 
     def analysis_member_activity(
-        self, from_start: bool = False
+        self,
+        from_start: bool = False,
+        heatmaps_buffer: HeatmapsBuffer | None = None,
+        latest_graph_only: bool = False,
+        until: datetime | None = None,
     ) -> tuple[list[dict], list]:
         """
         Based on the rawdata creates and stores the member activity data
@@ -39,6 +44,17 @@ class MemberActivities:
             do the analytics from scrach or not
             if True, if wouldn't pay attention to the existing data in memberactivities
             and will do the analysis from the first date
+        heatmaps_buffer : HeatmapsBuffer | None
+            the heatmaps being produced concurrently in the current run
+            if given, the heatmaps would be read from it instead of database
+            for the days it covers
+        latest_graph_only : bool
+            if True, just the networkx graph of the latest window would be returned
+            the graphs of the other windows are not kept in memory
+            default is False meaning to return the graphs of all windows
+        until : datetime | None
+            the last date to compute the memberactivities for
+            default is `None` meaning until yesterday
 
         Returns:
         ---------
@@ -98,31 +114,30 @@ class MemberActivities:
             return None, None
 
         last_date = today - timedelta(days=1)
+        if until is not None:
+            last_date = min(
+                last_date,
+                until.replace(
+                    hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
+                ),
+            )
 
         date_range: list[datetime] = [first_date, last_date]
 
         if load_past_data:
-            period_size = self.window_config["period_size"]
-            num_days_to_load = (
-                max(
-                    [
-                        self.action_config["CON_T_THR"],
-                        self.action_config["VITAL_T_THR"],
-                        self.action_config["STILL_T_THR"],
-                        self.action_config["PAUSED_T_THR"],
-                    ]
-                )
-                + 1
-            ) * period_size
-            date_range[0] = date_range[1] - timedelta(days=num_days_to_load)
-
-            # if the date range goes back more than the "7 days `period` forward"
-            if date_range[0] < self.analyzer_period + timedelta(days=period_size):
-                date_range[0] = self.analyzer_period + timedelta(days=period_size)
+            date_range[0] = self._get_past_data_start(date_range[1])
 
         # get all users during date_range
         all_users = self.utils.get_all_users(self.platform_id)
 
+        # first date of storing the data
+        # the dates already stored would be skipped
+        first_storing_date = None
+        if not from_start:
+            first_storing_date = member_activity_c.get_last_date()
+            if first_storing_date:
+                first_storing_date = first_storing_date.replace(tzinfo=timezone.utc)
+
         networkx_objects, activities = compute_member_activity(
             platform_id=self.platform_id,
             resources=self.resources,
@@ -133,19 +148,90 @@ class MemberActivities:
             act_param=self.action_config,
             load_past_data=load_past_data,
             analyzer_config=self.analyzer_config,
+            heatmaps_buffer=heatmaps_buffer,
+            from_date=first_storing_date,
+            latest_graph_only=latest_graph_only,
         )
 
-        if not from_start:
-            # first date of storing the data
-            first_storing_date = member_activity_c.get_last_date()
-            if first_storing_date:
-                first_storing_date = first_storing_date.replace(tzinfo=timezone.utc)
-
-            activities = self.utils.refine_memberactivities_data(
-                activities, first_storing_date
-            )
-
         memberactivity_results = activities
         memberactivity_networkx_results = networkx_objects
 
         return memberactivity_results, memberactivity_networkx_results
+
+    def remove_from_date(self, day: datetime) -> None:
+        """
+        remove the memberactivities affected by a change of data on a day
+        so they would be recomputed on the next analysis
+
+        the memberactivities of each date depend on the ones before it
+        so all the dates from the given day would be removed
+        and if the day was before the past data loaded on analysis
+        all the memberactivities would be removed to be computed from start
+
+        Parameters
+        ------------
+        day : datetime
+            the first day that its data was changed
+        """
+        guild_msg = f"PLATFORMID: {self.platform_id}:"
+
+        client = MongoSingleton.get_instance().get_client()
+        member_activity_c = MemberActivityModel(client[self.platform_id])
+
+        day = day.replace(
+            hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
+        )
+        last_date = datetime.now().replace(
+            hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
+        ) - timedelta(days=1)
+
+        if day - timedelta(days=1) > self._get_past_data_start(last_date):
+            logging.info(
+                f"{guild_msg} Removing memberactivities from date {day.date()}!"
+            )
+            member_activity_c.collection.delete_many({"date": {"$gte": day}})
+        else:
+            logging.info(
+                f"{guild_msg} Changed day {day.date()} is before the past data loaded"
+                " on analysis! Removing all memberactivities."
+            )
+            member_activity_c.remove_all_data()
+
+    def get_max_continue_days(self) -> int:
+        """
+        the maximum days the analysis could be continued from the last stored date
+        so the stored memberactivities would be within the past data loaded
+        """
+        return self._get_past_data_days() - 1
+
+    def _get_past_data_days(self) -> int:
+        """
+        the number of days of past memberactivities loaded to continue the analysis
+        """
+        period_size = self.window_config["period_size"]
+        num_days_to_load = (
+            max(
+                [
+                    self.action_config["CON_T_THR"],
+                    self.action_config["VITAL_T_THR"],
+                    self.action_config["STILL_T_THR"],
+                    self.action_config["PAUSED_T_THR"],
+                ]
+            )
+            + 1
+        ) * period_size
+        return num_days_to_load
+
+    def _get_past_data_start(self, last_date: datetime) -> datetime:
+        """
+        the date to load the past memberactivities from
+        for continuing the analysis until the `last_date`
+        """
+        period_size = self.window_config["period_size"]
+        start_date = last_date - timedelta(days=self._get_past_data_days())
+
+        # if the date range goes back more than the "7 days `period` forward"
+        if start_date < self.analyzer_period + timedelta(days=period_size):
+            start_date = self.analyzer_period + timedelta(days=period_size)
+
+        return start_date
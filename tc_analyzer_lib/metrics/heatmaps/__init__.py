@@ -2,3 +2,5 @@
 from .analytics_hourly import AnalyticsHourly
 from .analytics_raw import AnalyticsRaw
 from .heatmaps import Heatmaps
+from .heatmaps_buffer import HeatmapsBuffer
+from .heatmaps_server_side import HeatmapsServerSide
@@ -3,10 +3,20 @@ from datetime import date, datetime, timedelta, timezone
 from typing import Any
 
 from tc_analyzer_lib.metrics.heatmaps import AnalyticsHourly, AnalyticsRaw
+from tc_analyzer_lib.metrics.heatmaps.heatmaps_buffer import HeatmapsBuffer
 from tc_analyzer_lib.metrics.heatmaps.heatmaps_utils import HeatmapsUtils
-from tc_analyzer_lib.schemas import RawAnalyticsItem
+from tc_analyzer_lib.schemas import HourlyAnalytics, RawAnalytics, RawAnalyticsItem
 from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
 
+PREDEFINED_HOURLY_ANALYTICS = [
+    "replied",
+    "replier",
+    "mentioner",
+    "mentioned",
+    "reacter",
+    "reacted",
+]
+
 
 class Heatmaps:
     def __init__(
@@ -43,6 +53,8 @@ class Heatmaps:
         self,
         from_start: bool = False,
         batch_return: int = 5,
+        heatmaps_buffer: HeatmapsBuffer | None = None,
+        end_date: datetime | None = None,
     ):
         """
         Based on the rawdata creates and stores the heatmap data
@@ -53,6 +65,15 @@ class Heatmaps:
             do the analytics from scrach or not
             if True, if wouldn't pay attention to the existing data in heatmaps
             and will do the analysis from the first date
+        batch_return : int
+            the number of days to analyze before yielding the results
+        heatmaps_buffer : HeatmapsBuffer | None
+            if given, the documents of each day would be added to it
+            as soon as the day is analyzed, so the memberactivities could
+            use them without waiting for them to be stored in database
+        end_date : datetime | None
+            the day to analyze the heatmaps until (not included)
+            default is `None` meaning until today
 
         Returns:
         ---------
@@ -63,31 +84,23 @@ class Heatmaps:
         """
         log_prefix = f"PLATFORMID: {self.platform_id}:"
 
-        last_date = await self.utils.get_last_date()
-
-        analytics_date: datetime
-        if last_date is None or from_start:
-            # Ensure self.period is offset-aware
-            analytics_date = (
-                self.period.replace(tzinfo=timezone.utc)
-                if self.period.tzinfo is None
-                else self.period
-            )
-        else:
-            # Ensure last_date is offset-aware and add a day
-            analytics_date = last_date.astimezone(timezone.utc) + timedelta(days=1)
+        analytics_date = await self._get_analytics_date(from_start)
 
         # in order to skip bots
-        bot_ids = []
-        bot_cursor = await self.utils.get_users(is_bot=True)
-        async for bot in bot_cursor:
-            bot_ids.append(bot["id"])
+        bot_ids = await self._get_bot_ids()
 
         # initialize the data array
         heatmaps_results = []
 
+        if heatmaps_buffer is not None:
+            heatmaps_buffer.set_start_date(
+                analytics_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            )
+
         index = 0
         today = datetime.now(tz=timezone.utc)
+        if end_date is not None:
+            today = min(today, end_date)
         max_index = (analytics_date - today).days
         while analytics_date.date() < today.date():
             start_day = analytics_date.replace(
@@ -116,42 +129,15 @@ class Heatmaps:
                     f"{start_day.date()} - {end_day.date()}"
                 )
 
-            for _, resource_id in enumerate(period_resources):
-                user_ids = await self.utils.get_active_users(
-                    start_day,
-                    end_day,
-                    metadata_filter={
-                        "metadata."
-                        + self.analyzer_config.resource_identifier: resource_id,
-                    },
-                )
-                if len(user_ids) == 0:
-                    logging.warning(
-                        f"{log_prefix} No users interacting for the time window: "
-                        f"{start_day.date()} - {end_day.date()} for resource: {resource_id}"
-                        " Skipping the day."
-                    )
-                    continue
-
-                hourly_analytics = await self._process_hourly_analytics(
-                    day=analytics_date,
-                    resource=resource_id,
-                    user_ids=user_ids,
-                )
-                raw_analytics = await self._process_raw_analytics(
-                    day=analytics_date,
-                    resource=resource_id,
-                    user_ids=user_ids,
-                )
-                heatmaps_doc = await self._init_heatmaps_documents(
-                    hourly_analytics=hourly_analytics,
-                    raw_analytics=raw_analytics,
-                    resource_id=resource_id,
-                    user_ids=user_ids,
-                    bot_ids=bot_ids,
-                    date=start_day,
-                )
-                heatmaps_results.extend(heatmaps_doc)
+            day_results = await self._analyze_day(
+                start_day=start_day,
+                resources=period_resources,
+                bot_ids=bot_ids,
+            )
+
+            if heatmaps_buffer is not None:
+                heatmaps_buffer.add_day(start_day, day_results)
+            heatmaps_results.extend(day_results)
 
             if index % batch_return == 0:
                 yield heatmaps_results
@@ -163,9 +149,114 @@ class Heatmaps:
             # analyze next day
             analytics_date += timedelta(days=1)
 
+        if heatmaps_buffer is not None:
+            heatmaps_buffer.close()
+
         # returning any other values
         yield heatmaps_results
 
+    async def recompute_buckets(self, buckets: dict[datetime, list[str]]):
+        """
+        recompute the heatmaps of the given (day, resource) buckets
+        the previous heatmaps of the buckets would be removed before
+
+        Parameters
+        ------------
+        buckets : dict[datetime, list[str]]
+            the resources to recompute their heatmaps per each day
+
+        Returns
+        ---------
+        heatmaps_results : list[dict]
+            the recomputed heatmaps documents of each day
+        """
+        log_prefix = f"PLATFORMID: {self.platform_id}:"
+        bot_ids = await self._get_bot_ids()
+
+        for day, resources in buckets.items():
+            start_day = day.replace(
+                hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
+            )
+            logging.info(
+                f"{log_prefix} RECOMPUTING HEATMAPS {start_day.date()}"
+                f" for {len(resources)} resources!"
+            )
+            await self.utils.remove_heatmaps(
+                day=start_day,
+                resource_identifier=self.analyzer_config.resource_identifier,
+                resources=resources,
+            )
+            yield await self._analyze_day(
+                start_day=start_day,
+                resources=resources,
+                bot_ids=bot_ids,
+            )
+
+    async def _analyze_day(
+        self,
+        start_day: datetime,
+        resources: list[str],
+        bot_ids: list[str],
+    ) -> list[dict[str, Any]]:
+        """
+        compute the heatmaps documents of a day for the given resources
+
+        Parameters
+        ------------
+        start_day : datetime
+            the start of the day to analyze
+        resources : list[str]
+            the resources to compute their heatmaps
+        bot_ids : list[str]
+            the bots to skip their documents
+
+        Returns
+        ---------
+        day_results : list[dict[str, Any]]
+            the heatmaps documents of the day
+        """
+        log_prefix = f"PLATFORMID: {self.platform_id}:"
+        end_day = start_day + timedelta(days=1)
+
+        day_results = []
+        for resource_id in resources:
+            user_ids = await self.utils.get_active_users(
+                start_day,
+                end_day,
+                metadata_filter={
+                    "metadata." + self.analyzer_config.resource_identifier: resource_id,
+                },
+            )
+            if len(user_ids) == 0:
+                logging.warning(
+                    f"{log_prefix} No users interacting for the time window: "
+                    f"{start_day.date()} - {end_day.date()} for resource: {resource_id}"
+                    " Skipping the day."
+                )
+                continue
+
+            hourly_analytics = await self._process_hourly_analytics(
+                day=start_day,
+                resource=resource_id,
+                user_ids=user_ids,
+            )
+            raw_analytics = await self._process_raw_analytics(
+                day=start_day,
+                resource=resource_id,
+                user_ids=user_ids,
+            )
+            heatmaps_doc = await self._init_heatmaps_documents(
+                hourly_analytics=hourly_analytics,
+                raw_analytics=raw_analytics,
+                resource_id=resource_id,
+                user_ids=user_ids,
+                bot_ids=bot_ids,
+                date=start_day,
+            )
+            day_results.extend(heatmaps_doc)
+
+        return day_results
+
     async def _process_hourly_analytics(
         self,
         day: date,
@@ -190,23 +281,10 @@ class Heatmaps:
         # second dict each hourly analytics item
         analytics: dict[str, dict[str, list[int]]] = {}
         for config in self.analyzer_config.hourly_analytics:
-            # if it was a predefined analytics
-            if config.name in [
-                "replied",
-                "replier",
-                "mentioner",
-                "mentioned",
-                "reacter",
-                "reacted",
-            ]:
-                activity_name: str
-                if config.name in ["replied", "replier"]:
-                    activity_name = "reply"
-                elif config.name in ["mentioner", "mentioned"]:
-                    activity_name = "mention"
-                else:
-                    activity_name = "reaction"
+            activity_name = self._hourly_activity_name(config)
 
+            # if it was a predefined analytics
+            if config.name in PREDEFINED_HOURLY_ANALYTICS:
                 analytics_vector = await analytics_hourly.analyze(
                     day=day,
                     activity=config.type.value,
@@ -225,14 +303,6 @@ class Heatmaps:
             else:
                 conditions = config.rawmemberactivities_condition
 
-                if config.activity_name is None or conditions is None:
-                    raise ValueError(
-                        "For custom analytics the `activity_name` and `conditions`"
-                        "in analyzer config shouldn't be None"
-                    )
-
-                activity_name = config.activity_name
-
                 analytics_vector = await analytics_hourly.analyze(
                     day=day,
                     activity=config.type.value,
@@ -259,21 +329,7 @@ class Heatmaps:
         analytics: dict[str, dict[str, list[RawAnalyticsItem]]] = {}
 
         for config in self.analyzer_config.raw_analytics:
-            # default analytics that we always can have
-            activity_name: str
-            if config.name == "reacted_per_acc":
-                activity_name = "reaction"
-            elif config.name == "mentioner_per_acc":
-                activity_name = "mention"
-            elif config.name == "replied_per_acc":
-                activity_name = "reply"
-            else:
-                # custom analytics
-                if config.activity_name is None:
-                    raise ValueError(
-                        "`activity_name` for custom analytics should be provided"
-                    )
-                activity_name = config.activity_name
+            activity_name = self._raw_activity_name(config)
 
             additional_filters: dict[str, str] = {
                 f"metadata.{self.analyzer_config.resource_identifier}": resource,
@@ -301,6 +357,78 @@ class Heatmaps:
 
         return analytics
 
+    async def _get_analytics_date(self, from_start: bool) -> datetime:
+        """
+        get the date to start the analytics from
+        the day after the last stored heatmaps or the period if there wasn't any
+        """
+        last_date = await self.utils.get_last_date()
+
+        analytics_date: datetime
+        if last_date is None or from_start:
+            # Ensure self.period is offset-aware
+            analytics_date = (
+                self.period.replace(tzinfo=timezone.utc)
+                if self.period.tzinfo is None
+                else self.period
+            )
+        else:
+            # Ensure last_date is offset-aware and add a day
+            analytics_date = last_date.astimezone(timezone.utc) + timedelta(days=1)
+
+        return analytics_date
+
+    async def _get_bot_ids(self) -> list[str]:
+        """
+        get the bot ids of the platform to skip them in heatmaps
+        """
+        bot_ids = []
+        bot_cursor = await self.utils.get_users(is_bot=True)
+        async for bot in bot_cursor:
+            bot_ids.append(bot["id"])
+
+        return bot_ids
+
+    @staticmethod
+    def _hourly_activity_name(config: HourlyAnalytics) -> str:
+        """
+        get the activity name on `rawmemberactivities` for an hourly analytics
+        """
+        # default analytics that we always can have
+        if config.name in ["replied", "replier"]:
+            return "reply"
+        elif config.name in ["mentioner", "mentioned"]:
+            return "mention"
+        elif config.name in ["reacter", "reacted"]:
+            return "reaction"
+
+        # if it was a custom analytics that we didn't write code
+        # the mongodb condition is given in their configuration
+        if config.activity_name is None or config.rawmemberactivities_condition is None:
+            raise ValueError(
+                "For custom analytics the `activity_name` and `conditions`"
+                "in analyzer config shouldn't be None"
+            )
+        return config.activity_name
+
+    @staticmethod
+    def _raw_activity_name(config: RawAnalytics) -> str:
+        """
+        get the activity name on `rawmemberactivities` for a raw analytics
+        """
+        # default analytics that we always can have
+        if config.name == "reacted_per_acc":
+            return "reaction"
+        elif config.name == "mentioner_per_acc":
+            return "mention"
+        elif config.name == "replied_per_acc":
+            return "reply"
+
+        # custom analytics
+        if config.activity_name is None:
+            raise ValueError("`activity_name` for custom analytics should be provided")
+        return config.activity_name
+
     def _compute_iteration_counts(
         self,
         analytics_date: datetime,
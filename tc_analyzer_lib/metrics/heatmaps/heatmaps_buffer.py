@@ -0,0 +1,218 @@
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any
+
+
+class HeatmapsBuffer:
+    def __init__(self) -> None:
+        """
+        an in-memory buffer of heatmaps documents
+        that are being produced by the heatmaps analytics of the current run
+
+        the heatmaps analytics (producer) would add the documents of each day
+        as soon as they are computed and the memberactivities (consumer)
+        could read them before they are persisted in database.
+        the days before the `start_date` are not covered by the buffer
+        and should be read from the database.
+        """
+        self.start_date: date | None = None
+        # the last day that all its documents are added to buffer
+        self.produced_until: date | None = None
+        self.closed = False
+        self.failed = False
+
+        self._documents: dict[date, list[dict[str, Any]]] = {}
+        self._condition = threading.Condition()
+
+    def set_start_date(self, start_date: datetime) -> None:
+        """
+        set the first day that the producer would compute heatmaps for
+
+        Parameters
+        ------------
+        start_date : datetime
+            the first day of heatmaps analytics in this run
+        """
+        with self._condition:
+            self.start_date = start_date.date()
+            self.produced_until = self.start_date - timedelta(days=1)
+            self._condition.notify_all()
+
+    def add_day(self, day: datetime, documents: list[dict[str, Any]]) -> None:
+        """
+        add the heatmaps documents of a completely analyzed day
+
+        Parameters
+        ------------
+        day : datetime
+            the day of the analytics
+        documents : list[dict[str, Any]]
+            the heatmaps documents of that day
+        """
+        with self._condition:
+            # copying since the documents would be modified while inserting
+            # (i.e. adding the `_id` field) which could be in another thread
+            self._documents[day.date()] = [dict(document) for document in documents]
+            self.produced_until = day.date()
+            self._condition.notify_all()
+
+    def close(self, failed: bool = False) -> None:
+        """
+        mark the buffer as complete, no more days would be added to it
+
+        Parameters
+        ------------
+        failed : bool
+            whether the producer stopped because of an error
+            if True, the consumers waiting for the data would raise an error
+        """
+        with self._condition:
+            self.closed = True
+            self.failed = self.failed or failed
+            self._condition.notify_all()
+
+    def wait_until(self, end_date: datetime) -> None:
+        """
+        block until all the days before the `end_date` are produced
+        or the producer is finished
+
+        Parameters
+        ------------
+        end_date : datetime
+            the end of the window (exclusive)
+        """
+        last_day = end_date.date() - timedelta(days=1)
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self.closed
+                or (self.produced_until is not None and self.produced_until >= last_day)
+            )
+            if self.failed:
+                raise RuntimeError(
+                    "Heatmaps analytics failed before producing the requested days!"
+                )
+
+    def split_date(self, start_date: datetime, end_date: datetime) -> datetime:
+        """
+        the date which the window data should be read from the buffer
+        the days before it should be read from database
+
+        Parameters
+        ------------
+        start_date : datetime
+            the start of the window
+        end_date : datetime
+            the end of the window (exclusive)
+
+        Returns
+        ---------
+        split_date : datetime
+            the window range `[start_date, split_date)` is available in database
+            and `[split_date, end_date)` is available in the buffer
+        """
+        if self.start_date is None:
+            return end_date
+
+        buffer_start = datetime.combine(
+            self.start_date, datetime.min.time(), tzinfo=start_date.tzinfo
+        )
+        return min(max(start_date, buffer_start), end_date)
+
+    def find(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        users: list[str] | None = None,
+        resources: list[str] | None = None,
+        resource_identifier: str | None = None,
+        projection: list[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        find the heatmaps documents within a date range
+        the in-memory equivalent of querying the `heatmaps` collection
+
+        Parameters
+        ------------
+        start_date : datetime
+            the start of the date range
+        end_date : datetime
+            the end of the date range (exclusive)
+        users : list[str] | None
+            the users to filter documents for
+            if `None` no filtering on users would be applied
+        resources : list[str] | None
+            the resources to filter documents for
+            if `None` no filtering on resources would be applied
+        resource_identifier : str | None
+            the field representing the resource within documents
+            required if `resources` is given
+        projection : list[str] | None
+            the fields to include in the returned documents
+            if `None` all fields would be returned
+
+        Returns
+        ---------
+        documents : list[dict[str, Any]]
+            the documents matching the filters
+        """
+        users_set = set(users) if users is not None else None
+        resources_set = set(resources) if resources is not None else None
+
+        documents: list[dict[str, Any]] = []
+        with self._condition:
+            day = start_date.date()
+            while day < end_date.date():
+                for document in self._documents.get(day, []):
+                    if users_set is not None and document["user"] not in users_set:
+                        continue
+                    if (
+                        resources_set is not None
+                        and document[resource_identifier] not in resources_set
+                    ):
+                        continue
+
+                    if projection is not None:
+                        document = {
+                            field: document[field]
+                            for field in projection
+                            if field in document
+                        }
+                    documents.append(document)
+                day += timedelta(days=1)
+
+        return documents
+
+    def get_users(self, start_date: datetime, end_date: datetime) -> list[str]:
+        """
+        get the unique users having heatmaps documents within the date range
+
+        Parameters
+        ------------
+        start_date : datetime
+            the start of the date range
+        end_date : datetime
+            the end of the date range (exclusive)
+
+        Returns
+        ---------
+        users : list[str]
+            the unique users in order of their first appearance
+        """
+        documents = self.find(start_date, end_date, projection=["user"])
+        users = list(dict.fromkeys(document["user"] for document in documents))
+        return users
+
+    def discard_before(self, day: datetime) -> None:
+        """
+        remove the documents of days before the given day from the buffer
+        to release the memory of days that are not going to be used anymore
+
+        Parameters
+        ------------
+        day : datetime
+            the days before this would be removed
+        """
+        with self._condition:
+            for buffered_day in list(self._documents.keys()):
+                if buffered_day < day.date():
+                    del self._documents[buffered_day]
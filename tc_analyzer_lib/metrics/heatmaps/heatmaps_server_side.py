@@ -0,0 +1,407 @@
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from tc_analyzer_lib.metrics.heatmaps.heatmaps import (
+    PREDEFINED_HOURLY_ANALYTICS,
+    Heatmaps,
+)
+from tc_analyzer_lib.schemas import HourlyAnalytics, RawAnalytics
+
+
+class HeatmapsServerSide(Heatmaps):
+    """
+    Heatmaps analytics computed completely on database server
+
+    the documents per (date, resource, user) are built by one aggregation pipeline
+    on `rawmemberactivities` per day that is merged into `heatmaps` collection
+    so the data wouldn't be transferred to the analyzer and back
+    """
+
+    async def materialize(self, from_start: bool = False) -> None:
+        """
+        create and store the heatmaps documents for the days not analyzed yet
+
+        the days are computed one by one in date order, so a failing run would
+        leave just its last stored day partially written. that day is computed
+        again on the next run and its documents are replaced
+        (merged on their date, resource, and user)
+
+        Parameters
+        ------------
+        from_start : bool
+            do the analytics from scrach or not
+            if True, if wouldn't pay attention to the existing data in heatmaps
+            and will do the analysis from the first date
+        """
+        log_prefix = f"PLATFORMID: {self.platform_id}:"
+
+        last_date = await self.utils.get_last_date()
+        if from_start or last_date is None:
+            analytics_date = await self._get_analytics_date(from_start=True)
+        else:
+            analytics_date = last_date.astimezone(timezone.utc)
+        start_day = analytics_date.replace(
+            hour=0, minute=0, second=0, microsecond=0, tzinfo=timezone.utc
+        )
+        end_day = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        if start_day >= end_day:
+            logging.info(f"{log_prefix} No new days to analyze heatmaps for!")
+            return
+
+        logging.info(
+            f"{log_prefix} ANALYZING HEATMAPS {start_day.date()} - {end_day.date()}"
+            " on database server!"
+        )
+        await self._ensure_merge_index()
+        # the documents of a previous failing run
+        await self.utils.remove_heatmaps_from(start_day)
+
+        bot_ids = await self._get_bot_ids()
+        day = start_day
+        while day < end_day:
+            next_day = day + timedelta(days=1)
+            pipeline = self.build_pipeline(day, next_day, bot_ids)
+
+            # the `$merge` stage wouldn't return any document
+            # but the cursor should be consumed for the pipeline to be run
+            cursor = self.utils.database["rawmemberactivities"].aggregate(
+                pipeline, allowDiskUse=True
+            )
+            await cursor.to_list(length=None)
+            day = next_day
+
+    async def _ensure_merge_index(self) -> None:
+        """
+        create the unique index on heatmaps that `$merge` needs for its `on` fields
+        """
+        await self.utils.database["heatmaps"].create_index(
+            [
+                ("date", 1),
+                (self.analyzer_config.resource_identifier, 1),
+                ("user", 1),
+            ],
+            unique=True,
+        )
+
+    def build_pipeline(
+        self,
+        start_day: datetime,
+        end_day: datetime,
+        bot_ids: list[str],
+    ) -> list[dict[str, Any]]:
+        """
+        build the aggregation pipeline creating the heatmaps documents
+
+        each analytics of the config is computed into rows of
+        `{date, resource, user, analytics, hour | account, count}`
+        and the rows are unioned with the active users of each day and resource
+        then grouped to be the heatmaps documents
+
+        Parameters
+        ------------
+        start_day : datetime
+            the first day to compute the heatmaps for
+        end_day : datetime
+            the day to compute the heatmaps until (not included)
+        bot_ids : list[str]
+            the bots to skip their documents
+
+        Returns
+        ---------
+        pipeline : list[dict[str, Any]]
+            the pipeline to run on `rawmemberactivities` collection
+        """
+        resource_field = f"metadata.{self.analyzer_config.resource_identifier}"
+        base_match = {
+            "date": {"$gte": start_day, "$lt": end_day},
+            resource_field: {"$in": self.resources},
+            "metadata.bot_activity": False,
+        }
+
+        pipeline = self._active_users_stages(base_match)
+        for hourly_config in self.analyzer_config.hourly_analytics:
+            pipeline.append(
+                {
+                    "$unionWith": {
+                        "coll": "rawmemberactivities",
+                        "pipeline": self._hourly_stages(hourly_config, base_match),
+                    }
+                }
+            )
+        for raw_config in self.analyzer_config.raw_analytics:
+            pipeline.append(
+                {
+                    "$unionWith": {
+                        "coll": "rawmemberactivities",
+                        "pipeline": self._raw_stages(raw_config, base_match),
+                    }
+                }
+            )
+
+        pipeline.extend(
+            [
+                {"$match": {"user": {"$nin": bot_ids}}},
+                {
+                    "$group": {
+                        "_id": {
+                            "date": "$date",
+                            "resource": "$resource",
+                            "user": "$user",
+                        },
+                        "rows": {
+                            "$push": {
+                                "analytics": "$analytics",
+                                "hour": "$hour",
+                                "account": "$account",
+                                "count": "$count",
+                            }
+                        },
+                    }
+                },
+                {"$project": self._document_projection()},
+                {
+                    "$merge": {
+                        "into": "heatmaps",
+                        "on": [
+                            "date",
+                            self.analyzer_config.resource_identifier,
+                            "user",
+                        ],
+                        "whenMatched": "replace",
+                        "whenNotMatched": "insert",
+                    }
+                },
+            ]
+        )
+        return pipeline
+
+    def _row_keys(self) -> dict[str, Any]:
+        """
+        the date and resource of the rawmemberactivities to group the rows by
+        """
+        return {
+            "date": {
+                "$dateFromParts": {
+                    "year": {"$year": "$date"},
+                    "month": {"$month": "$date"},
+                    "day": {"$dayOfMonth": "$date"},
+                }
+            },
+            "resource": f"$metadata.{self.analyzer_config.resource_identifier}",
+        }
+
+    def _active_users_stages(self, base_match: dict) -> list[dict[str, Any]]:
+        """
+        the users doing activity per day and resource
+        the same as `HeatmapsUtils.get_active_users`
+        """
+        return [
+            {"$match": base_match},
+            {"$unwind": {"path": "$interactions", "preserveNullAndEmptyArrays": True}},
+            {
+                "$unwind": {
+                    "path": "$interactions.users_engaged_id",
+                    "preserveNullAndEmptyArrays": True,
+                }
+            },
+            {
+                "$group": {
+                    "_id": self._row_keys(),
+                    "all_ids": {"$addToSet": "$interactions.users_engaged_id"},
+                    "author_ids": {"$addToSet": "$author_id"},
+                }
+            },
+            {"$project": {"users": {"$setUnion": ["$all_ids", "$author_ids"]}}},
+            {"$unwind": "$users"},
+            {
+                "$project": {
+                    "_id": 0,
+                    "date": "$_id.date",
+                    "resource": "$_id.resource",
+                    "user": "$users",
+                }
+            },
+        ]
+
+    def _hourly_stages(
+        self, config: HourlyAnalytics, base_match: dict
+    ) -> list[dict[str, Any]]:
+        """
+        the hourly activity counts of an analytics per day, resource, and user
+        the same as `AnalyticsHourly.get_hourly_analytics`
+        """
+        activity = config.type.value
+        activity_name = self._hourly_activity_name(config)
+
+        match = base_match
+        # custom analytics have their conditions given in configuration
+        if config.name not in PREDEFINED_HOURLY_ANALYTICS:
+            match = {**base_match, **config.rawmemberactivities_condition}
+
+        stages: list[dict[str, Any]] = [
+            {"$match": match},
+            {"$unwind": f"${activity}"},
+            {
+                "$match": {
+                    f"{activity}.name": activity_name,
+                    f"{activity}.type": config.direction.value,
+                }
+            },
+        ]
+        if activity == "interactions":
+            stages.extend(
+                [
+                    {"$unwind": "$interactions.users_engaged_id"},
+                    # ignoring self-interactions
+                    {
+                        "$match": {
+                            "$expr": {
+                                "$ne": ["$interactions.users_engaged_id", "$author_id"]
+                            }
+                        }
+                    },
+                ]
+            )
+
+        stages.extend(
+            [
+                {
+                    "$group": {
+                        "_id": {
+                            **self._row_keys(),
+                            "user": "$author_id",
+                            "hour": {"$hour": "$date"},
+                        },
+                        "count": {"$sum": 1},
+                    }
+                },
+                {
+                    "$project": {
+                        "_id": 0,
+                        "date": "$_id.date",
+                        "resource": "$_id.resource",
+                        "user": "$_id.user",
+                        "analytics": {"$literal": config.name},
+                        "hour": "$_id.hour",
+                        "count": 1,
+                    }
+                },
+            ]
+        )
+        return stages
+
+    def _raw_stages(
+        self, config: RawAnalytics, base_match: dict
+    ) -> list[dict[str, Any]]:
+        """
+        the count of engagements of an analytics per day, resource, user, and account
+        the same as `AnalyticsRaw.get_analytics_count`
+        """
+        activity = config.type.value
+        activity_name = self._raw_activity_name(config)
+
+        match = base_match
+        if config.rawmemberactivities_condition is not None:
+            match = {**base_match, **config.rawmemberactivities_condition}
+
+        return [
+            {"$match": match},
+            {"$unwind": f"${activity}"},
+            {
+                "$match": {
+                    f"{activity}.name": activity_name,
+                    f"{activity}.type": config.direction.value,
+                }
+            },
+            {"$unwind": f"${activity}.users_engaged_id"},
+            {
+                "$match": {
+                    "$expr": {"$ne": ["$interactions.users_engaged_id", "$author_id"]}
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        **self._row_keys(),
+                        "user": "$author_id",
+                        "account": "$interactions.users_engaged_id",
+                    },
+                    "count": {"$sum": 1},
+                }
+            },
+            {
+                "$project": {
+                    "_id": 0,
+                    "date": "$_id.date",
+                    "resource": "$_id.resource",
+                    "user": "$_id.user",
+                    "analytics": {"$literal": config.name},
+                    "account": "$_id.account",
+                    "count": 1,
+                }
+            },
+        ]
+
+    def _document_projection(self) -> dict[str, Any]:
+        """
+        restructure the grouped rows into a heatmaps document
+        the hourly analytics with no activity would be zero vectors
+        and the raw analytics with no engagement would be empty lists
+        """
+        projection: dict[str, Any] = {
+            "_id": 0,
+            self.analyzer_config.resource_identifier: "$_id.resource",
+            "date": "$_id.date",
+            "user": "$_id.user",
+        }
+        for hourly_config in self.analyzer_config.hourly_analytics:
+            projection[hourly_config.name] = {
+                "$map": {
+                    "input": {"$range": [0, 24]},
+                    "as": "hour",
+                    "in": {
+                        "$sum": {
+                            "$map": {
+                                "input": {
+                                    "$filter": {
+                                        "input": "$rows",
+                                        "as": "row",
+                                        "cond": {
+                                            "$and": [
+                                                {
+                                                    "$eq": [
+                                                        "$$row.analytics",
+                                                        hourly_config.name,
+                                                    ]
+                                                },
+                                                {"$eq": ["$$row.hour", "$$hour"]},
+                                            ]
+                                        },
+                                    }
+                                },
+                                "as": "row",
+                                "in": "$$row.count",
+                            }
+                        }
+                    },
+                }
+            }
+        for raw_config in self.analyzer_config.raw_analytics:
+            projection[raw_config.name] = {
+                "$map": {
+                    "input": {
+                        "$filter": {
+                            "input": "$rows",
+                            "as": "row",
+                            "cond": {"$eq": ["$$row.analytics", raw_config.name]},
+                        }
+                    },
+                    "as": "row",
+                    "in": {"account": "$$row.account", "count": "$$row.count"},
+                }
+            }
+
+        return projection
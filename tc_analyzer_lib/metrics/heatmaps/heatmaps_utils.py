@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from pymongo.cursor import Cursor
 from tc_analyzer_lib.utils.mongo import MongoSingleton
@@ -191,3 +191,61 @@ class HeatmapsUtils:
         last_date = documents[0]["date"] if documents != [] else None
 
         return last_date
+
+    async def remove_heatmaps(
+        self,
+        day: datetime,
+        resource_identifier: str,
+        resources: list[str],
+    ) -> int:
+        """
+        remove the heatmaps documents of a day for the given resources
+
+        Parameters
+        ------------
+        day : datetime
+            the day to remove its heatmaps
+        resource_identifier : str
+            the resource identifier on database for a platform
+            i.e.: could be `channel_id` for discord
+        resources : list[str]
+            the resources to remove their heatmaps
+
+        Returns
+        ---------
+        deleted_count : int
+            the count of removed documents
+        """
+        result = await self.database["heatmaps"].delete_many(
+            {
+                "date": {"$gte": day, "$lt": day + timedelta(days=1)},
+                resource_identifier: {"$in": resources},
+            }
+        )
+        return result.deleted_count
+
+    async def remove_heatmaps_from(
+        self, day: datetime, until: datetime | None = None
+    ) -> int:
+        """
+        remove the heatmaps documents from a day onwards
+
+        Parameters
+        ------------
+        day : datetime
+            the first day to remove its heatmaps
+        until : datetime | None
+            the day to remove the heatmaps until (not included)
+            default is `None` meaning to remove all the days after
+
+        Returns
+        ---------
+        deleted_count : int
+            the count of removed documents
+        """
+        date_filter = {"$gte": day}
+        if until is not None:
+            date_filter["$lt"] = until
+
+        result = await self.database["heatmaps"].delete_many({"date": date_filter})
+        return result.deleted_count
@@ -8,26 +8,6 @@ class MemberActivityUtils:
     def __init__(self) -> None:
         self.client = MongoSingleton.get_instance().get_client()
 
-    def refine_memberactivities_data(self, all_member_activities, first_date):
-        """
-        refine the data of memberactivities (don't use the data that are not needed)
-        it would save the data from the first_date
-
-        Parameters:
-        --------------
-        all_member_activities : array of dict
-            the memberactivities for the whole date
-        first_date : datetime
-            the first date of saving date
-            we would use this to specify the exact data activity to save
-        """
-        data_to_save = []
-        for activity in all_member_activities:
-            if first_date is None or activity["date"] > first_date:
-                data_to_save.append(activity)
-
-        return data_to_save
-
     # get detailed info from one guild
     def get_one_guild(self, guild):
         """Get one guild setting from guilds collection by guild"""
@@ -1,5 +1,6 @@
 # A wrapper to compute the neo4j metrics in cron-job
 import logging
+from uuid import uuid1
 
 from tc_analyzer_lib.algorithms.neo4j_analysis.analyzer_node_stats import NodeStats
 from tc_analyzer_lib.algorithms.neo4j_analysis.centrality import Centerality
@@ -10,12 +11,21 @@ from tc_analyzer_lib.algorithms.neo4j_analysis.local_clustering_coefficient impo
     LocalClusteringCoeff,
 )
 from tc_analyzer_lib.algorithms.neo4j_analysis.louvain import Louvain
+from tc_analyzer_lib.algorithms.neo4j_analysis.utils import ProjectionUtils
+from tc_analyzer_lib.metrics.utils.metrics_scheduler import MetricsScheduler
 from tc_analyzer_lib.schemas import GraphSchema
-from tc_neo4j_lib.neo4j_ops import Neo4jOps
+from tc_analyzer_lib.utils.instrumentation import stage
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
 
 
 class Neo4JAnalytics:
-    def __init__(self, platform_id: str, graph_schema: GraphSchema) -> None:
+    def __init__(
+        self,
+        platform_id: str,
+        graph_schema: GraphSchema,
+        max_workers: int = 5,
+        metric_timeout: float | None = None,
+    ) -> None:
         """
         neo4j metrics to be compute
 
@@ -25,11 +35,23 @@ class Neo4JAnalytics:
             the platform to compute analytics for
         graph_schema : GraphSchema
             the graph schema representative of node and relationship labels
+        max_workers : int
+            the maximum number of metrics to be computed concurrently
+            default is 5 meaning all the metrics would be computed at the same time
+            1 means computing the metrics one after another
+        metric_timeout : float | None
+            the maximum seconds each metric could take
+            default is `None` meaning no timeout
         """
-        self.neo4j_ops = Neo4jOps.get_instance()
+        self.neo4j_ops = CountedNeo4jOps.get_instance()
         self.platform_id = platform_id
         self.log_prefix = f"PLATFORMID: {platform_id} "
         self.graph_schema = graph_schema
+        self.scheduler = MetricsScheduler(
+            max_workers=max_workers,
+            metric_timeout=metric_timeout,
+            log_prefix=self.log_prefix,
+        )
 
     def compute_metrics(self, from_start: bool) -> None:
         """
@@ -48,11 +70,165 @@ class Neo4JAnalytics:
         # if from_start:
         #     self._remove_analytics_interacted_in(guildId)
 
-        self.compute_louvain_algorithm(from_start)
-        self.compute_local_clustering_coefficient(from_start)
-        self.compute_network_decentrality(from_start)
-        self.compute_node_stats(from_start)
-        self.compute_closeness_centrality(from_start)
+        # the metrics are independent of each other, reading the same interactions
+        # and writing different properties, so they're computed concurrently
+        # louvain and node stats are computed on the same projection
+        projection_utils = ProjectionUtils(self.platform_id, self.graph_schema)
+        shared_graphs = self._project_shared_graphs(projection_utils)
+
+        def drop_shared_graphs() -> None:
+            for graph_name in (shared_graphs or {}).values():
+                self._drop_graph(projection_utils.drop_temp_graph, graph_name)
+
+        # a timed out metric could still be using the shared projections
+        # so they're dropped once every metric is finished
+        self.scheduler.run(
+            {
+                "louvain": lambda: self.compute_louvain_algorithm(
+                    from_start, projected_graphs=shared_graphs
+                ),
+                "local_clustering_coefficient": lambda: (
+                    self.compute_local_clustering_coefficient(from_start)
+                ),
+                "network_decentrality": lambda: self.compute_network_decentrality(
+                    from_start
+                ),
+                "node_stats": lambda: self.compute_node_stats(
+                    from_start, projected_graphs=shared_graphs
+                ),
+                "closeness_centrality": lambda: self.compute_closeness_centrality(
+                    from_start
+                ),
+            },
+            on_finished=drop_shared_graphs,
+        )
+
+    async def compute_metrics_async(self, from_start: bool) -> None:
+        """
+        the async version of `compute_metrics`
+        the metrics are computed over the async neo4j driver
+
+        Parameters:
+        ------------
+        from_start : bool
+            compute metrics from start or not
+            Note: only some metrics support this
+            others would be computed from_start=True
+        """
+        projection_utils = ProjectionUtils(self.platform_id, self.graph_schema)
+        shared_graphs = await self._project_shared_graphs_async(projection_utils)
+        try:
+            await self.scheduler.run_async(
+                {
+                    "louvain": lambda: Louvain(
+                        self.platform_id, self.graph_schema
+                    ).compute_async(from_start, projected_graphs=shared_graphs),
+                    "local_clustering_coefficient": lambda: LocalClusteringCoeff(
+                        self.platform_id, self.graph_schema
+                    ).compute_async(from_start=from_start),
+                    "network_decentrality": lambda: Centerality(
+                        self.platform_id, self.graph_schema
+                    ).compute_network_decentrality_async(from_start=from_start),
+                    "node_stats": lambda: NodeStats(
+                        platform_id=self.platform_id,
+                        graph_schema=self.graph_schema,
+                        threshold=2,
+                    ).compute_stats_async(from_start, projected_graphs=shared_graphs),
+                    "closeness_centrality": lambda: ClosenessCentrality(
+                        self.platform_id, self.graph_schema
+                    ).compute_async(from_start),
+                }
+            )
+        finally:
+            for graph_name in (shared_graphs or {}).values():
+                try:
+                    await projection_utils.drop_temp_graph_async(graph_name)
+                except Exception as exp:
+                    logging.error(
+                        f"{self.log_prefix}Failed to drop projected graph "
+                        f"{graph_name}, {exp}"
+                    )
+
+    def _project_shared_graphs(
+        self, projection_utils: ProjectionUtils
+    ) -> dict[float, str] | None:
+        """
+        project the weighted graph with `NATURAL` direction for each date
+        to be shared between the metrics computed on it
+
+        Returns
+        ---------
+        shared_graphs : dict[float, str] | None
+            the projected graph name per date
+            `None` if the projection failed,
+            so each metric would do its own projection
+        """
+        shared_graphs: dict[float, str] = {}
+        with stage("neo4j_metrics.shared_projection"):
+            try:
+                for date in projection_utils.get_dates():
+                    graph_name = f"GraphShared_{uuid1()}"
+                    projection_utils.project_temp_graph(
+                        graph_name=graph_name,
+                        weighted=True,
+                        relation_direction="NATURAL",
+                        date=date,
+                    )
+                    shared_graphs[date] = graph_name
+            except Exception as exp:
+                logging.error(
+                    f"{self.log_prefix}Exception in projecting the shared graph, {exp}"
+                )
+                for graph_name in shared_graphs.values():
+                    self._drop_graph(projection_utils.drop_temp_graph, graph_name)
+                return None
+
+        return shared_graphs
+
+    async def _project_shared_graphs_async(
+        self, projection_utils: ProjectionUtils
+    ) -> dict[float, str] | None:
+        """
+        the async version of `_project_shared_graphs`
+        """
+        shared_graphs: dict[float, str] = {}
+        with stage("neo4j_metrics.shared_projection"):
+            try:
+                for date in await projection_utils.get_dates_async():
+                    graph_name = f"GraphShared_{uuid1()}"
+                    await projection_utils.project_temp_graph_async(
+                        graph_name=graph_name,
+                        weighted=True,
+                        relation_direction="NATURAL",
+                        date=date,
+                    )
+                    shared_graphs[date] = graph_name
+            except Exception as exp:
+                logging.error(
+                    f"{self.log_prefix}Exception in projecting the shared graph, {exp}"
+                )
+                for graph_name in shared_graphs.values():
+                    try:
+                        await projection_utils.drop_temp_graph_async(graph_name)
+                    except Exception as drop_exp:
+                        logging.error(
+                            f"{self.log_prefix}Failed to drop projected graph "
+                            f"{graph_name}, {drop_exp}"
+                        )
+                return None
+
+        return shared_graphs
+
+    def _drop_graph(self, drop_function, graph_name: str) -> None:
+        """
+        drop a projected graph, just logging the errors
+        """
+        try:
+            drop_function(graph_name)
+        except Exception as exp:
+            logging.error(
+                f"{self.log_prefix}Failed to drop projected graph {graph_name}, {exp}"
+            )
 
     def compute_local_clustering_coefficient(self, from_start: bool):
         """
@@ -144,13 +320,21 @@ class Neo4JAnalytics:
                 f"{self.log_prefix}Exception occured in computing Network decentrality, {exp}!"
             )
 
-    def compute_node_stats(self, from_start: bool):
+    def compute_node_stats(
+        self,
+        from_start: bool,
+        projected_graphs: dict[float, str] | None = None,
+    ):
         """
         compute node stats
         each DiscordAccount node could be either
         - "0": meaning Sender
         - "1": Receiver
         - "2": Balanced
+
+        projected_graphs : dict[float, str] | None
+            the already projected graphs per date to compute the stats on
+            if `None` the graphs would be projected for the computation
         """
         try:
             logging.info(f"{self.log_prefix} computing node stats")
@@ -159,7 +343,7 @@ class Neo4JAnalytics:
                 graph_schema=self.graph_schema,
                 threshold=2,
             )
-            node_stats.compute_stats(from_start)
+            node_stats.compute_stats(from_start, projected_graphs=projected_graphs)
         except Exception as exp:
             logging.error(
                 f"{self.log_prefix}Exception occured in node stats computation, {exp}"
@@ -184,7 +368,11 @@ class Neo4JAnalytics:
             """
             session.run(query=query, platform_id=self.platform_id)
 
-    def compute_louvain_algorithm(self, from_start: bool) -> None:
+    def compute_louvain_algorithm(
+        self,
+        from_start: bool,
+        projected_graphs: dict[float, str] | None = None,
+    ) -> None:
         """
         compute the louvain algorithm and save the results within the db
 
@@ -194,6 +382,9 @@ class Neo4JAnalytics:
             the guild string that the algorithm would be computed on
         from_start : bool
             compute from the start of the data available or continue the previous
+        projected_graphs : dict[float, str] | None
+            the already projected graphs per date to compute the algorithm on
+            if `None` the graphs would be projected for the computation
         """
         louvain = Louvain(self.platform_id, self.graph_schema)
-        louvain.compute(from_start)
+        louvain.compute(from_start, projected_graphs=projected_graphs)
@@ -1,2 +1,6 @@
 # flake8: noqa
 from .platform import Platform
+from .metrics_scheduler import MetricsScheduler
+from .dirty_day_ledger import DirtyDayLedger
+from .run_fingerprint import RunFingerprint, RunFingerprintStore
+from .recompute_checkpoint import RecomputeCheckpoint
@@ -8,9 +8,18 @@ class AnalyzerDBManager:
         """
         pass
 
-    def database_connect(self):
+    def database_connect(self, db_connections: MongoNeo4jDB | None = None):
         """
         Connect to the database
+
+        Parameters
+        ------------
+        db_connections : MongoNeo4jDB | None
+            an already connected database operations instance to reuse
+            if `None`, a new one would be created and connected
         """
-        self.DB_connections = MongoNeo4jDB(testing=False)
-        self.DB_connections.set_mongo_db_ops()
+        if db_connections is not None:
+            self.DB_connections = db_connections
+        else:
+            self.DB_connections = MongoNeo4jDB(testing=False)
+            self.DB_connections.set_mongo_db_ops()
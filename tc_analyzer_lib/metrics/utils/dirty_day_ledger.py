@@ -0,0 +1,196 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any
+
+from tc_analyzer_lib.utils.mongo import MongoSingleton
+
+# a snapshot of the raw data, per (day, resource) bucket
+RawDataSnapshot = dict[tuple[datetime, str], dict[str, Any]]
+
+
+class DirtyDayLedger:
+    def __init__(self, platform_id: str, resource_identifier: str) -> None:
+        """
+        the ledger of the (day, resource) buckets of `rawmemberactivities`
+        that were changed or gained data since the last analysis
+
+        the buckets are compared using a snapshot of their count of documents,
+        the maximum `_id`, and the count of engaged users
+        so the late-arriving data (larger `_id`) and the edited interactions
+        (i.e. reactions changed) could be detected
+
+        Parameters
+        ------------
+        platform_id : str
+            the platform to track its raw data
+        resource_identifier : str
+            the resource identifier on database for the platform
+            i.e.: could be `channel_id` for discord
+        """
+        self.platform_id = platform_id
+        self.resource_identifier = resource_identifier
+        self.log_prefix = f"PLATFORMID: {platform_id}:"
+
+        client = MongoSingleton.get_instance().get_async_client()
+        self.database = client[platform_id]
+        self.collection_name = "rawactivitysnapshots"
+
+    async def take_snapshot(
+        self,
+        start_day: datetime,
+        end_day: datetime,
+        resources: list[str],
+    ) -> RawDataSnapshot:
+        """
+        compute the current snapshot of the raw data buckets
+
+        Parameters
+        ------------
+        start_day : datetime
+            the first day to take the snapshot for
+        end_day : datetime
+            the day to take the snapshot until (not included)
+        resources : list[str]
+            the resources to take the snapshot of their data
+
+        Returns
+        ---------
+        snapshot : RawDataSnapshot
+            the state of each (day, resource) bucket
+        """
+        pipeline = [
+            {
+                "$match": {
+                    "date": {"$gte": start_day, "$lt": end_day},
+                    f"metadata.{self.resource_identifier}": {"$in": resources},
+                }
+            },
+            {
+                "$group": {
+                    "_id": {
+                        "date": {
+                            "$dateFromParts": {
+                                "year": {"$year": "$date"},
+                                "month": {"$month": "$date"},
+                                "day": {"$dayOfMonth": "$date"},
+                            }
+                        },
+                        "resource": f"$metadata.{self.resource_identifier}",
+                    },
+                    "count": {"$sum": 1},
+                    "max_id": {"$max": "$_id"},
+                    "engagements": {
+                        "$sum": {
+                            "$sum": {
+                                "$map": {
+                                    "input": {"$ifNull": ["$interactions", []]},
+                                    "as": "interaction",
+                                    "in": {
+                                        "$size": {
+                                            "$ifNull": [
+                                                "$$interaction.users_engaged_id",
+                                                [],
+                                            ]
+                                        }
+                                    },
+                                }
+                            }
+                        }
+                    },
+                }
+            },
+        ]
+
+        snapshot: RawDataSnapshot = {}
+        cursor = self.database["rawmemberactivities"].aggregate(pipeline)
+        async for doc in cursor:
+            snapshot[self._bucket_key(doc["_id"]["date"], doc["_id"]["resource"])] = {
+                "count": doc["count"],
+                "max_id": doc["max_id"],
+                "engagements": doc["engagements"],
+            }
+
+        return snapshot
+
+    async def get_dirty_buckets(
+        self,
+        snapshot: RawDataSnapshot,
+        until: datetime | None = None,
+    ) -> dict[datetime, list[str]]:
+        """
+        compare the given snapshot with the one stored on last analysis
+
+        Parameters
+        ------------
+        snapshot : RawDataSnapshot
+            the current snapshot of raw data
+        until : datetime | None
+            just the buckets up to this day (included) would be compared
+            the days after are not analyzed before and so are not dirty
+            default is `None` meaning to compare all the days
+
+        Returns
+        ---------
+        dirty_buckets : dict[datetime, list[str]]
+            the dirty resources per each day, sorted by day
+            the buckets removed from raw data are also dirty
+            if there wasn't any stored snapshot, nothing would be dirty
+        """
+        stored = await self.load()
+        if len(stored) == 0:
+            logging.info(f"{self.log_prefix} No raw data snapshot stored before!")
+            return {}
+
+        dirty_buckets: dict[datetime, list[str]] = {}
+        for key in set(snapshot.keys()) | set(stored.keys()):
+            day, resource = key
+            if until is not None and day > until:
+                continue
+            if snapshot.get(key) != stored.get(key):
+                dirty_buckets.setdefault(day, []).append(resource)
+
+        return {day: sorted(dirty_buckets[day]) for day in sorted(dirty_buckets)}
+
+    async def load(self) -> RawDataSnapshot:
+        """
+        load the snapshot stored on the last analysis
+        """
+        stored: RawDataSnapshot = {}
+        cursor = self.database[self.collection_name].find({}, {"_id": 0})
+        async for doc in cursor:
+            stored[self._bucket_key(doc["date"], doc["resource"])] = {
+                "count": doc["count"],
+                "max_id": doc["max_id"],
+                "engagements": doc["engagements"],
+            }
+
+        return stored
+
+    async def commit(self, snapshot: RawDataSnapshot) -> None:
+        """
+        store the snapshot as the state of the analyzed raw data
+        should be called after the analysis was finished successfully
+
+        Parameters
+        ------------
+        snapshot : RawDataSnapshot
+            the snapshot taken before the analysis
+        """
+        collection = self.database[self.collection_name]
+        await collection.delete_many({})
+        if len(snapshot) == 0:
+            return
+
+        await collection.insert_many(
+            [
+                {"date": day, "resource": resource, **state}
+                for (day, resource), state in snapshot.items()
+            ]
+        )
+        logging.info(
+            f"{self.log_prefix} Stored the snapshot of {len(snapshot)} raw data buckets!"
+        )
+
+    def _bucket_key(self, day: datetime, resource: str) -> tuple[datetime, str]:
+        # the dates returned from database are naive
+        return day.replace(tzinfo=timezone.utc), resource
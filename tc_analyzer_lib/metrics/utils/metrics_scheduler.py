@@ -0,0 +1,194 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Awaitable, Callable
+
+from tc_analyzer_lib.utils.instrumentation import stage
+
+
+class MetricsScheduler:
+    def __init__(
+        self,
+        max_workers: int = 5,
+        metric_timeout: float | None = None,
+        log_prefix: str = "",
+    ) -> None:
+        """
+        run independent metrics concurrently
+        a failing (or timed out) metric wouldn't affect the others
+        and its error would be just logged
+
+        Parameters
+        ------------
+        max_workers : int
+            the maximum number of metrics to compute at the same time
+        metric_timeout : float | None
+            the maximum seconds each metric could take from its start
+            default is `None` meaning no timeout
+        log_prefix : str
+            the prefix for logs
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers should be at least 1!")
+
+        self.max_workers = max_workers
+        self.metric_timeout = metric_timeout
+        self.log_prefix = log_prefix
+
+    def run(
+        self,
+        metrics: dict[str, Callable[[], None]],
+        on_finished: Callable[[], None] | None = None,
+    ) -> None:
+        """
+        compute the metrics in a thread pool
+
+        Note: a thread cannot be stopped, so a timed out metric is just abandoned
+        and would keep its worker busy until it is finished.
+        anything the metrics share (i.e. the projected graphs) should be released
+        in `on_finished`, which is called once the abandoned metrics are finished too
+
+        Parameters
+        ------------
+        metrics : dict[str, Callable[[], None]]
+            the metric names and the functions computing them
+        on_finished : Callable[[], None] | None
+            to be called after all the metrics, including the timed out ones,
+            are finished. it would be called in the thread finishing the
+            last metric if any was abandoned, otherwise before returning.
+            default is `None` meaning nothing to call
+        """
+        executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="metrics_scheduler"
+        )
+        started_at: dict[str, float] = {}
+        futures: dict[Future, str] = {}
+
+        poll_interval = None
+        if self.metric_timeout is not None:
+            poll_interval = min(1.0, self.metric_timeout)
+
+        pending: set[Future] = set()
+        abandoned: set[Future] = set()
+        try:
+            for name, compute in metrics.items():
+                # to keep the instrumentation of the run within the threads
+                context = contextvars.copy_context()
+                future = executor.submit(
+                    context.run, self._run_metric, name, compute, started_at
+                )
+                futures[future] = name
+                pending.add(future)
+
+            while pending:
+                _, pending = wait(
+                    pending, timeout=poll_interval, return_when=FIRST_COMPLETED
+                )
+                if self.metric_timeout is None:
+                    continue
+
+                now = time.monotonic()
+                for future in list(pending):
+                    name = futures[future]
+                    if (
+                        name in started_at
+                        and now - started_at[name] > self.metric_timeout
+                    ):
+                        self._log_timeout(name)
+                        pending.discard(future)
+                        abandoned.add(future)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+            if on_finished is not None:
+                self._call_when_done(abandoned | pending, on_finished)
+
+    async def run_async(self, metrics: dict[str, Callable[[], Awaitable]]) -> None:
+        """
+        compute the metrics concurrently in the event loop
+
+        Parameters
+        ------------
+        metrics : dict[str, Callable[[], Awaitable]]
+            the metric names and the functions creating their coroutines
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        await asyncio.gather(
+            *[
+                self._run_metric_async(name, compute, semaphore)
+                for name, compute in metrics.items()
+            ]
+        )
+
+    def _run_metric(
+        self,
+        name: str,
+        compute: Callable[[], None],
+        started_at: dict[str, float],
+    ) -> None:
+        with stage(f"neo4j_metrics.{name}"):
+            started_at[name] = time.monotonic()
+            try:
+                logging.info(f"{self.log_prefix}Computing {name}")
+                compute()
+            except Exception as exp:
+                logging.error(f"{self.log_prefix}Exception in computing {name}, {exp}")
+
+    async def _run_metric_async(
+        self,
+        name: str,
+        compute: Callable[[], Awaitable],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        async with semaphore:
+            with stage(f"neo4j_metrics.{name}"):
+                try:
+                    logging.info(f"{self.log_prefix}Computing {name}")
+                    await asyncio.wait_for(compute(), timeout=self.metric_timeout)
+                except asyncio.TimeoutError:
+                    self._log_timeout(name)
+                except Exception as exp:
+                    logging.error(
+                        f"{self.log_prefix}Exception in computing {name}, {exp}"
+                    )
+
+    def _call_when_done(
+        self, futures: set[Future], callback: Callable[[], None]
+    ) -> None:
+        """
+        call the callback once all the given futures are done
+        the errors of callback would be just logged
+        """
+        context = contextvars.copy_context()
+        remaining = len(futures)
+        lock = threading.Lock()
+
+        def call(*_) -> None:
+            nonlocal remaining
+            with lock:
+                remaining -= 1
+                if remaining > 0:
+                    return
+            try:
+                context.run(callback)
+            except Exception as exp:
+                logging.error(
+                    f"{self.log_prefix}Exception after computing the metrics, {exp}"
+                )
+
+        if not futures:
+            remaining = 1
+            call()
+            return
+
+        for future in futures:
+            # called right away for the already done (or cancelled) futures
+            future.add_done_callback(call)
+
+    def _log_timeout(self, name: str) -> None:
+        logging.error(
+            f"{self.log_prefix}Timeout in computing {name}, "
+            f"took more than {self.metric_timeout} seconds!"
+        )
@@ -0,0 +1,108 @@
+import logging
+from datetime import datetime, timezone
+
+from tc_analyzer_lib.utils.mongo import MongoSingleton
+
+
+class RecomputeCheckpoint:
+    # the phases of a recompute, in order
+    PHASES = ("heatmaps", "memberactivities", "graph")
+
+    def __init__(self, platform_id: str) -> None:
+        """
+        the progress of a recompute persisted on database
+        so an interrupted recompute could be resumed from its last checkpoint
+
+        the checkpoint document is as below
+        ```
+        {
+            "phase": "heatmaps" | "memberactivities" | "graph",
+            "heatmaps_until": datetime | None,
+            "memberactivities_until": datetime | None,
+            "started_at": datetime,
+            "updated_at": datetime,
+        }
+        ```
+        where the `*_until` fields are the last days completely stored
+
+        Parameters
+        ------------
+        platform_id : str
+            the platform being recomputed
+        """
+        self.platform_id = platform_id
+        self.log_prefix = f"PLATFORMID: {platform_id}:"
+
+        client = MongoSingleton.get_instance().get_async_client()
+        self.collection = client[platform_id]["recomputecheckpoint"]
+
+    async def load(self) -> dict | None:
+        """
+        load the checkpoint of the interrupted recompute
+
+        Returns
+        ---------
+        checkpoint : dict | None
+            the checkpoint document
+            would be `None` if there wasn't any recompute in progress
+        """
+        checkpoint = await self.collection.find_one({}, {"_id": 0})
+        if checkpoint is None:
+            return None
+
+        for field in ["heatmaps_until", "memberactivities_until"]:
+            # the dates returned from database are naive
+            if checkpoint.get(field) is not None:
+                checkpoint[field] = checkpoint[field].replace(tzinfo=timezone.utc)
+
+        return checkpoint
+
+    async def start(self) -> dict:
+        """
+        start a new recompute, overwriting any previous checkpoint
+
+        Returns
+        ---------
+        checkpoint : dict
+            the initial checkpoint document
+        """
+        now = datetime.now(tz=timezone.utc)
+        checkpoint = {
+            "phase": "heatmaps",
+            "heatmaps_until": None,
+            "memberactivities_until": None,
+            "started_at": now,
+            "updated_at": now,
+        }
+        await self.collection.replace_one({}, checkpoint, upsert=True)
+        return checkpoint
+
+    async def update(self, **progress) -> None:
+        """
+        persist the progress of the recompute
+
+        Parameters
+        ------------
+        **progress :
+            the fields of the checkpoint to update
+            could be `phase`, `heatmaps_until`, or `memberactivities_until`
+        """
+        if "phase" in progress:
+            if progress["phase"] not in self.PHASES:
+                raise ValueError(
+                    f"Wrong phase given! should be either one of {self.PHASES}"
+                )
+            logging.info(
+                f"{self.log_prefix} Recompute checkpoint phase: {progress['phase']}"
+            )
+
+        await self.collection.update_one(
+            {},
+            {"$set": {**progress, "updated_at": datetime.now(tz=timezone.utc)}},
+        )
+
+    async def clear(self) -> None:
+        """
+        remove the checkpoint after the recompute was finished
+        """
+        await self.collection.delete_many({})
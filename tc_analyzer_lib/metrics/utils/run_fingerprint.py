@@ -0,0 +1,205 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
+from tc_analyzer_lib.utils.mongo import MongoSingleton
+
+
+class RunFingerprint:
+    def __init__(
+        self,
+        config_hash: str,
+        raw_max_id: ObjectId | None,
+        last_activity_date: datetime | None,
+        analyzed_until: datetime | None = None,
+        members_max_id: ObjectId | None = None,
+        members_updated_at: datetime | None = None,
+        members_count: int | None = None,
+    ) -> None:
+        """
+        the fingerprint of the inputs of an analyzer run
+        to check if anything was changed since the previous run
+
+        Parameters
+        ------------
+        config_hash : str
+            the hash of the configs and the resources of the analysis
+        raw_max_id : ObjectId | None
+            the largest `_id` of the raw data of the resources
+            would be `None` if there wasn't any raw data
+        last_activity_date : datetime | None
+            the date of the latest activity on raw data of the resources
+        analyzed_until : datetime | None
+            the day the run analyzed the data until (not included)
+            would be set when the run was finished
+        members_max_id : ObjectId | None
+            the largest `_id` of the raw members
+            would be `None` if there wasn't any member
+        members_updated_at : datetime | None
+            the latest `updatedAt` of the raw members
+            would be `None` if the members didn't have it
+        members_count : int | None
+            the count of raw members, so the deleted members could be detected
+        """
+        self.config_hash = config_hash
+        self.raw_max_id = raw_max_id
+        self.last_activity_date = last_activity_date
+        self.analyzed_until = analyzed_until
+        self.members_max_id = members_max_id
+        self.members_updated_at = members_updated_at
+        self.members_count = members_count
+
+    def is_unchanged(self, previous: "RunFingerprint") -> bool:
+        """
+        check if the configs were the same and no raw data was added
+        and no member was added, updated, or removed since the previous run
+        """
+        return (
+            self.config_hash == previous.config_hash
+            and self.raw_max_id == previous.raw_max_id
+            and self.members_max_id == previous.members_max_id
+            and self.members_updated_at == previous.members_updated_at
+            and self.members_count == previous.members_count
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "config_hash": self.config_hash,
+            "raw_max_id": self.raw_max_id,
+            "last_activity_date": self.last_activity_date,
+            "analyzed_until": self.analyzed_until,
+            "members_max_id": self.members_max_id,
+            "members_updated_at": self.members_updated_at,
+            "members_count": self.members_count,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunFingerprint":
+        return cls(
+            config_hash=data["config_hash"],
+            raw_max_id=data.get("raw_max_id"),
+            last_activity_date=cls._to_utc(data.get("last_activity_date")),
+            analyzed_until=cls._to_utc(data.get("analyzed_until")),
+            members_max_id=data.get("members_max_id"),
+            members_updated_at=cls._to_utc(data.get("members_updated_at")),
+            members_count=data.get("members_count"),
+        )
+
+    @staticmethod
+    def compute_config_hash(
+        analyzer_config: PlatformConfigBase,
+        action: dict[str, int],
+        window: dict[str, int],
+        resources: list[str],
+        period: datetime,
+    ) -> str:
+        """
+        hash the configs of an analysis, so any change on them could be detected
+        """
+        config = {
+            "analyzer_config": analyzer_config.to_dict(),
+            "action": action,
+            "window": window,
+            "resources": sorted(resources),
+            "period": period.isoformat(),
+        }
+        config_str = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(config_str.encode()).hexdigest()
+
+    @staticmethod
+    def _to_utc(date: datetime | None) -> datetime | None:
+        # the dates returned from database are naive
+        return date.replace(tzinfo=timezone.utc) if date is not None else None
+
+
+class RunFingerprintStore:
+    def __init__(self, platform_id: str, resource_identifier: str) -> None:
+        """
+        persist the fingerprint of the last successful analyzer run of a platform
+
+        Parameters
+        ------------
+        platform_id : str
+            the platform to store its analyzer run fingerprint
+        resource_identifier : str
+            the resource identifier on database for the platform
+            i.e.: could be `channel_id` for discord
+        """
+        self.resource_identifier = resource_identifier
+
+        client = MongoSingleton.get_instance().get_async_client()
+        self.database = client[platform_id]
+        self.collection_name = "analyzerfingerprint"
+
+    async def get_current(
+        self, config_hash: str, resources: list[str]
+    ) -> RunFingerprint:
+        """
+        get the fingerprint of the current inputs
+        the latest `_id` and `date` of the raw activities, and the latest `_id`
+        and `updatedAt` of the raw members alongside their count are read
+        Note: the `_id` lookups use the default index, but the others are
+        index lookups only if `date` and `updatedAt` are indexed,
+        and counting the members goes over all of them
+
+        Parameters
+        ------------
+        config_hash : str
+            the hash of the current configs
+            see `RunFingerprint.compute_config_hash`
+        resources : list[str]
+            the resources to be analyzed
+        """
+        raw_collection = self.database["rawmemberactivities"]
+        query = {f"metadata.{self.resource_identifier}": {"$in": resources}}
+
+        last_inserted = await raw_collection.find_one(
+            query, {"_id": 1}, sort=[("_id", -1)]
+        )
+        last_activity = await raw_collection.find_one(
+            query, {"_id": 0, "date": 1}, sort=[("date", -1)]
+        )
+
+        members_collection = self.database["rawmembers"]
+        last_member = await members_collection.find_one(
+            {}, {"_id": 1}, sort=[("_id", -1)]
+        )
+        last_updated_member = await members_collection.find_one(
+            {"updatedAt": {"$ne": None}},
+            {"_id": 0, "updatedAt": 1},
+            sort=[("updatedAt", -1)],
+        )
+        members_count = await members_collection.count_documents({})
+
+        return RunFingerprint(
+            config_hash=config_hash,
+            raw_max_id=last_inserted["_id"] if last_inserted else None,
+            last_activity_date=RunFingerprint._to_utc(
+                last_activity["date"] if last_activity else None
+            ),
+            members_max_id=last_member["_id"] if last_member else None,
+            members_updated_at=RunFingerprint._to_utc(
+                last_updated_member["updatedAt"] if last_updated_member else None
+            ),
+            members_count=members_count,
+        )
+
+    async def load(self) -> RunFingerprint | None:
+        """
+        load the fingerprint of the last successful run
+        """
+        document = await self.database[self.collection_name].find_one({}, {"_id": 0})
+        if document is None:
+            return None
+
+        return RunFingerprint.from_dict(document)
+
+    async def save(self, fingerprint: RunFingerprint) -> None:
+        """
+        store the fingerprint of a successful run
+        """
+        await self.database[self.collection_name].replace_one(
+            {}, fingerprint.to_dict(), upsert=True
+        )
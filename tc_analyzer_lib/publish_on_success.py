@@ -39,7 +39,7 @@ def publish_on_success(platform_id: str, recompute: bool) -> None:
     # working specifically for discord
     if platform_name == "discord" and recompute:
         logging.info(f"{msg}Sending job finished message & starting automation!")
-        rabbitmq = RabbitMQAccess.get_instance().get_client()
+        rabbitmq = RabbitMQAccess.get_instance().get_publisher()
 
         message = (
             "Your data import into TogetherCrew is complete! "
@@ -63,6 +63,7 @@ def publish_on_success(platform_id: str, recompute: bool) -> None:
             event=Event.DISCORD_BOT.SEND_MESSAGE,
             content={"uuid": saga_id},
         )
+        rabbitmq.flush()
         automation_workflow.start(platform_id, guild_id)
 
     elif recompute is False:
@@ -5,6 +5,7 @@ class GraphSchema:
         interacted_with_rel: str = "INTERACTED_WITH",
         interacted_in_rel: str = "INTERACTED_IN",
         member_relation: str = "IS_MEMBER",
+        have_metrics_rel: str = "HAVE_METRICS",
     ) -> None:
         """
         the graph schema
@@ -26,11 +27,16 @@ class GraphSchema:
         member_relation : str
             the membership relation label
             default is always to be `IS_MEMBER`
+        have_metrics_rel : str
+            the relation name holding the platform metrics of each date
+            default is always to be `HAVE_METRICS`
+            is always from a platform to itself
         """
         platform = self._capitalize_first_letter(platform)
         self.interacted_with_rel = interacted_with_rel
         self.interacted_in_rel = interacted_in_rel
         self.member_relation = member_relation
+        self.have_metrics_rel = have_metrics_rel
 
         self.user_label = platform + "Member"
         self.platform_label = platform + "Platform"
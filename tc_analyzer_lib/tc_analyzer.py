@@ -1,14 +1,37 @@
+import asyncio
 import logging
-from datetime import datetime, timezone
+from contextlib import nullcontext
+from datetime import datetime, timedelta, timezone
 
+from tc_analyzer_lib.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from tc_analyzer_lib.DB_operations.neo4j_schema import Neo4jSchemaBootstrap
 from tc_analyzer_lib.metrics.analyzer_memberactivities import MemberActivities
-from tc_analyzer_lib.metrics.heatmaps import Heatmaps
+from tc_analyzer_lib.metrics.heatmaps import (
+    Heatmaps,
+    HeatmapsBuffer,
+    HeatmapsServerSide,
+)
 from tc_analyzer_lib.metrics.neo4j_analytics import Neo4JAnalytics
 from tc_analyzer_lib.metrics.utils.analyzer_db_manager import AnalyzerDBManager
+from tc_analyzer_lib.metrics.utils.dirty_day_ledger import (
+    DirtyDayLedger,
+    RawDataSnapshot,
+)
 from tc_analyzer_lib.metrics.utils.platform import Platform
+from tc_analyzer_lib.metrics.utils.recompute_checkpoint import RecomputeCheckpoint
+from tc_analyzer_lib.metrics.utils.run_fingerprint import (
+    RunFingerprint,
+    RunFingerprintStore,
+)
 from tc_analyzer_lib.schemas import GraphSchema
 from tc_analyzer_lib.schemas.platform_configs import DiscordAnalyzerConfig
 from tc_analyzer_lib.schemas.platform_configs.config_base import PlatformConfigBase
+from tc_analyzer_lib.utils.instrumentation import (
+    MetricsSink,
+    RunInstrumentation,
+    stage,
+)
+from tc_analyzer_lib.utils.neo4j_async import AsyncNeo4jOps
 
 
 class TCAnalyzer(AnalyzerDBManager):
@@ -25,6 +48,19 @@ class TCAnalyzer(AnalyzerDBManager):
         action: dict[str, int],
         window: dict[str, int],
         analyzer_config: PlatformConfigBase = DiscordAnalyzerConfig(),
+        metrics_sink: MetricsSink | None = None,
+        pipelined: bool = False,
+        db_connections: MongoNeo4jDB | None = None,
+        offload_blocking: bool = False,
+        async_neo4j: bool = False,
+        metrics_max_workers: int = 5,
+        metrics_timeout: float | None = None,
+        server_side_heatmaps: bool = False,
+        track_dirty_days: bool = False,
+        skip_unchanged: bool = False,
+        checkpoint_days: int | None = None,
+        delta_graph: bool = False,
+        ensure_graph_schema: bool = False,
     ):
         """
         analyze the platform's data
@@ -44,6 +80,64 @@ class TCAnalyzer(AnalyzerDBManager):
             Parameters for the whole analyzer, includes the step size and window size
         analyzer_config : PlatformConfigBase
             the config for analyzer to use
+        metrics_sink : MetricsSink | None
+            where to emit the run report (stage timings, db round-trips, memory)
+            default is `None` meaning the report would be just available
+            under `self.instrumentation` after each run
+        pipelined : bool
+            if True, the memberactivities would be computed while the heatmaps
+            are being computed and stored, reading the heatmaps of the run
+            from memory as soon as the days of each window are complete
+            default is False meaning the stages would be run one after another
+        db_connections : MongoNeo4jDB | None
+            already connected database operations to share between analyzers
+            default is `None` meaning a new connection would be set up
+        offload_blocking : bool
+            if True, the blocking (sync database and computation) stages would be
+            run in a worker thread so the event loop could serve other analyzers
+            used when multiple platforms are analyzed concurrently
+        async_neo4j : bool
+            if True, the graph would be written and its metrics would be computed
+            using the async neo4j driver, running the metrics concurrently
+            default is False meaning the sync neo4j driver would be used
+        metrics_max_workers : int
+            the maximum number of graph metrics to be computed concurrently
+            default is 5 meaning all of them at once
+        metrics_timeout : float | None
+            the maximum seconds each graph metric could take
+            default is `None` meaning no timeout
+        server_side_heatmaps : bool
+            if True, the heatmaps would be computed and stored by an aggregation
+            pipeline on database server, without transferring the data to analyzer
+            can't be used with `pipelined` since the documents wouldn't be in memory
+            default is False meaning the heatmaps would be computed in analyzer
+        track_dirty_days : bool
+            if True, the (day, resource) buckets of raw data that were changed
+            since the last analysis would be recomputed on `run_once`
+            the heatmaps of just the changed buckets would be recomputed
+            and the memberactivities would be recomputed from the first changed day
+            default is False meaning the already analyzed days are not checked
+        skip_unchanged : bool
+            if True, the fingerprint of the inputs (configs and the latest raw data)
+            would be stored after each `run_once` and compared on the next one
+            if nothing was changed the stages already done would be skipped
+            the heatmaps if no raw data was added, and the whole run if it was
+            already done for today
+            default is False meaning to always run all the stages
+        checkpoint_days : int | None
+            if given, the progress of `recompute` would be checkpointed on database
+            so it could be continued using `resume_recompute` if it was interrupted
+            the heatmaps are checkpointed per each stored batch
+            and the memberactivities are computed and stored every `checkpoint_days`
+            default is `None` meaning the recompute wouldn't be checkpointed
+        delta_graph : bool
+            if True, the graph would be compared with the one persisted on neo4j
+            and just the new members and interactions would be written
+            default is False meaning the whole graph would be written
+        ensure_graph_schema : bool
+            if True, the neo4j constraints and indexes used by the analyzer queries
+            would be created if they didn't exist (once within a process)
+            default is False meaning the neo4j schema wouldn't be checked
         """
         logging.basicConfig()
         logging.getLogger().setLevel(logging.INFO)
@@ -54,15 +148,38 @@ class TCAnalyzer(AnalyzerDBManager):
         self.action = action
         self.window = window
         self.analyzer_config = analyzer_config
+        self.metrics_sink = metrics_sink
+        self.pipelined = pipelined
+        self.server_side_heatmaps = server_side_heatmaps
+        self.track_dirty_days = track_dirty_days
+        self.skip_unchanged = skip_unchanged
+        self.checkpoint_days = checkpoint_days
+        self.delta_graph = delta_graph
+        if pipelined and server_side_heatmaps:
+            logging.warning(
+                f"PLATFORMID: {platform_id}: pipelined mode isn't available with "
+                "server side heatmaps! Running the stages one after another."
+            )
+            self.pipelined = False
+        self.offload_blocking = offload_blocking
+        self.async_neo4j = async_neo4j
+        self.instrumentation: RunInstrumentation | None = None
 
         self.platform_utils = Platform(platform_id)
         self.community_id = self.platform_utils.get_community_id()
 
         self.graph_schema = GraphSchema(platform=analyzer_config.platform)
-        self.neo4j_analytics = Neo4JAnalytics(platform_id, self.graph_schema)
+        self.neo4j_analytics = Neo4JAnalytics(
+            platform_id,
+            self.graph_schema,
+            max_workers=metrics_max_workers,
+            metric_timeout=metrics_timeout,
+        )
 
         # connect to Neo4j & MongoDB database
-        self.database_connect()
+        self.database_connect(db_connections)
+        if ensure_graph_schema:
+            Neo4jSchemaBootstrap(self.graph_schema).bootstrap()
 
     async def analyze(self, recompute: bool) -> None:
         # TODO: merge run_one and recompute codes
@@ -73,32 +190,23 @@ class TCAnalyzer(AnalyzerDBManager):
 
     async def run_once(self):
         """Run analysis and append to previous anlaytics"""
+        with self._instrument(run_type="run_once"):
+            async with self._async_neo4j_scope():
+                await self._run_once()
+
+    async def _run_once(self):
         # check if the platform was available
         # if not, will raise an error
-        self.check_platform()
+        await self._run_blocking(self.check_platform)
 
         logging.info(f"Creating heatmaps for platform id: {self.platform_id}")
 
-        heatmaps_analysis = Heatmaps(
+        heatmaps_analysis = self._heatmaps_class()(
             platform_id=self.platform_id,
             period=self.period,
             resources=self.resources,
             analyzer_config=self.analyzer_config,
         )
-        async for heatmaps_data in heatmaps_analysis.start(from_start=False):
-            # storing heatmaps since memberactivities use them
-            analytics_data = {}
-            analytics_data["heatmaps"] = heatmaps_data
-            analytics_data["memberactivities"] = (None, None)
-
-            self.DB_connections.store_analytics_data(
-                analytics_data=analytics_data,
-                platform_id=self.platform_id,
-                graph_schema=self.graph_schema,
-                remove_memberactivities=False,
-                remove_heatmaps=False,
-            )
-
         memberactivity_analysis = MemberActivities(
             platform_id=self.platform_id,
             resources=self.resources,
@@ -107,10 +215,64 @@ class TCAnalyzer(AnalyzerDBManager):
             analyzer_config=self.analyzer_config,
             analyzer_period=self.period,
         )
+
+        raw_snapshot: RawDataSnapshot | None = None
+        dirty_days_recomputed = False
+        if self.track_dirty_days:
+            (
+                raw_snapshot,
+                dirty_days_recomputed,
+            ) = await self._recompute_dirty_days(
+                heatmaps_analysis, memberactivity_analysis
+            )
+
+        today = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        fingerprint: RunFingerprint | None = None
+        skip_heatmaps = False
+        if self.skip_unchanged:
+            fingerprint_store = self._get_fingerprint_store()
+            fingerprint = await fingerprint_store.get_current(
+                config_hash=RunFingerprint.compute_config_hash(
+                    self.analyzer_config,
+                    self.action,
+                    self.window,
+                    self.resources,
+                    self.period,
+                ),
+                resources=self.resources,
+            )
+            previous = await fingerprint_store.load()
+            if (
+                previous is not None
+                and fingerprint.is_unchanged(previous)
+                and not dirty_days_recomputed
+            ):
+                if previous.analyzed_until == today:
+                    logging.info(
+                        f"PLATFORMID: {self.platform_id}: Nothing changed since "
+                        "the last run of today! Skipping the analysis."
+                    )
+                    await self._run_blocking(self.platform_utils.update_isin_progress)
+                    return
+
+                # all the raw data was within the days analyzed on previous run
+                skip_heatmaps = (
+                    previous.last_activity_date is None
+                    or previous.analyzed_until is None
+                    or previous.last_activity_date < previous.analyzed_until
+                )
+
         (
             member_activities_data,
             member_acitivities_networkx_data,
-        ) = memberactivity_analysis.analysis_member_activity(from_start=False)
+        ) = await self._analyze_heatmaps_memberactivities(
+            heatmaps_analysis=heatmaps_analysis,
+            memberactivity_analysis=memberactivity_analysis,
+            from_start=False,
+            skip_heatmaps=skip_heatmaps,
+        )
 
         member_acitivities_networkx_data = self.get_latest_networkx_graph(
             member_acitivities_networkx_data
@@ -124,29 +286,94 @@ class TCAnalyzer(AnalyzerDBManager):
             member_acitivities_networkx_data,
         )
 
-        self.DB_connections.store_analytics_data(
+        await self._store_memberactivities(
             analytics_data=analytics_data,
-            platform_id=self.platform_id,
-            graph_schema=self.graph_schema,
-            remove_heatmaps=False,
             remove_memberactivities=False,
         )
 
-        self.neo4j_analytics.compute_metrics(from_start=False)
+        await self._compute_neo4j_metrics(from_start=False)
+
+        if raw_snapshot is not None:
+            await self._get_dirty_day_ledger().commit(raw_snapshot)
+        if fingerprint is not None:
+            fingerprint.analyzed_until = today
+            await self._get_fingerprint_store().save(fingerprint)
 
-        self.platform_utils.update_isin_progress()
+        await self._run_blocking(self.platform_utils.update_isin_progress)
 
     async def recompute(self):
         """
         recompute the analytics (heatmaps + memberactivities + graph analytics)
         for a new selection of channels
         """
+        with self._instrument(run_type="recompute"):
+            async with self._async_neo4j_scope():
+                if self.checkpoint_days is not None:
+                    await self._recompute_checkpointed(resume=False)
+                else:
+                    await self._recompute()
+
+    async def recompute_memberactivities(self):
+        """
+        recompute the memberactivities and graph analytics on the stored heatmaps
+        to be used when the heatmaps were recomputed separately
+        i.e. by the distributed workers, see `DistributedRecompute`
+        """
+        with self._instrument(run_type="recompute"):
+            async with self._async_neo4j_scope():
+                await self._run_blocking(self.check_platform)
+
+                memberactivity_analysis = MemberActivities(
+                    platform_id=self.platform_id,
+                    resources=self.resources,
+                    action_config=self.action,
+                    window_config=self.window,
+                    analyzer_config=self.analyzer_config,
+                    analyzer_period=self.period,
+                )
+                (
+                    member_activities_data,
+                    member_acitivities_networkx_data,
+                ) = await self._run_blocking(
+                    self._analyze_memberactivities, memberactivity_analysis, True
+                )
+
+                analytics_data = {}
+                analytics_data["heatmaps"] = None
+                analytics_data["memberactivities"] = (
+                    member_activities_data,
+                    self.get_latest_networkx_graph(member_acitivities_networkx_data),
+                )
+                await self._store_memberactivities(
+                    analytics_data=analytics_data,
+                    remove_memberactivities=True,
+                )
+
+                await self._compute_neo4j_metrics(from_start=True)
+                await self._run_blocking(self.platform_utils.update_isin_progress)
+
+    async def resume_recompute(self):
+        """
+        continue an interrupted recompute from its last checkpoint
+        if there wasn't any recompute in progress, a new one would be started
+        the memberactivities are checkpointed every `checkpoint_days`
+        or every 30 days if it wasn't given
+        """
+        with self._instrument(run_type="recompute"):
+            async with self._async_neo4j_scope():
+                await self._recompute_checkpointed(resume=True)
+
+    async def _recompute(self):
         # check if the platform was available
         # if not, will raise an error
-        self.check_platform()
+        await self._run_blocking(self.check_platform)
+
+        raw_snapshot: RawDataSnapshot | None = None
+        if self.track_dirty_days:
+            raw_snapshot = await self._take_raw_snapshot()
 
         logging.info(f"Analyzing the Heatmaps data for platform: {self.platform_id}!")
-        heatmaps_analysis = Heatmaps(
+        heatmaps_analysis = self._heatmaps_class()(
             platform_id=self.platform_id,
             period=self.period,
             resources=self.resources,
@@ -158,7 +385,8 @@ class TCAnalyzer(AnalyzerDBManager):
         analytics_data = {}
         analytics_data["heatmaps"] = []
         analytics_data["memberactivities"] = (None, None)
-        self.DB_connections.store_analytics_data(
+        await self._run_blocking(
+            self.DB_connections.store_analytics_data,
             analytics_data=analytics_data,
             platform_id=self.platform_id,
             graph_schema=self.graph_schema,
@@ -166,20 +394,6 @@ class TCAnalyzer(AnalyzerDBManager):
             remove_heatmaps=True,
         )
 
-        async for heatmaps_data in heatmaps_analysis.start(from_start=True):
-            # storing heatmaps since memberactivities use them
-            analytics_data = {}
-            analytics_data["heatmaps"] = heatmaps_data
-            analytics_data["memberactivities"] = (None, None)
-
-            self.DB_connections.store_analytics_data(
-                analytics_data=analytics_data,
-                platform_id=self.platform_id,
-                graph_schema=self.graph_schema,
-                remove_memberactivities=False,
-                remove_heatmaps=False,
-            )
-
         # run the member_activity analyze
         logging.info(
             f"Analyzing the MemberActivities data for platform: {self.platform_id}!"
@@ -195,7 +409,11 @@ class TCAnalyzer(AnalyzerDBManager):
         (
             member_activities_data,
             member_acitivities_networkx_data,
-        ) = memberactivity_analysis.analysis_member_activity(from_start=True)
+        ) = await self._analyze_heatmaps_memberactivities(
+            heatmaps_analysis=heatmaps_analysis,
+            memberactivity_analysis=memberactivity_analysis,
+            from_start=True,
+        )
 
         member_acitivities_networkx_data = self.get_latest_networkx_graph(
             member_acitivities_networkx_data
@@ -211,16 +429,486 @@ class TCAnalyzer(AnalyzerDBManager):
         )
 
         logging.info(f"Storing analytics data for platform: {self.platform_id}!")
-        self.DB_connections.store_analytics_data(
+        await self._store_memberactivities(
+            analytics_data=analytics_data,
+            remove_memberactivities=True,
+        )
+
+        await self._compute_neo4j_metrics(from_start=True)
+
+        if raw_snapshot is not None:
+            await self._get_dirty_day_ledger().commit(raw_snapshot)
+
+        await self._run_blocking(self.platform_utils.update_isin_progress)
+
+    async def _recompute_checkpointed(self, resume: bool):
+        """
+        recompute the analytics, persisting the progress on each checkpoint
+
+        Parameters
+        ------------
+        resume : bool
+            if True, continue from the checkpoint of the interrupted recompute
+            else, a new recompute would be started
+        """
+        log_prefix = f"PLATFORMID: {self.platform_id}:"
+        await self._run_blocking(self.check_platform)
+
+        checkpoint = RecomputeCheckpoint(self.platform_id)
+        state = await checkpoint.load() if resume else None
+        if state is None:
+            if resume:
+                logging.info(
+                    f"{log_prefix} No recompute to resume! Starting a new one."
+                )
+            if self.track_dirty_days:
+                # the recompute would be done on the raw data from now on
+                await self._get_dirty_day_ledger().commit(
+                    await self._take_raw_snapshot()
+                )
+            state = await checkpoint.start()
+        else:
+            logging.info(
+                f"{log_prefix} Resuming the recompute from phase: {state['phase']}!"
+            )
+
+        heatmaps_analysis = self._heatmaps_class()(
+            platform_id=self.platform_id,
+            period=self.period,
+            resources=self.resources,
+            analyzer_config=self.analyzer_config,
+        )
+        memberactivity_analysis = MemberActivities(
+            platform_id=self.platform_id,
+            resources=self.resources,
+            action_config=self.action,
+            window_config=self.window,
+            analyzer_config=self.analyzer_config,
+            analyzer_period=self.period,
+        )
+
+        if state["phase"] == "heatmaps":
+            await self._recompute_heatmaps_checkpointed(
+                heatmaps_analysis, checkpoint, state["heatmaps_until"]
+            )
+            state["phase"] = "memberactivities"
+            await checkpoint.update(phase=state["phase"])
+
+        if state["phase"] == "memberactivities":
+            await self._recompute_memberactivities_checkpointed(
+                memberactivity_analysis, checkpoint, state["memberactivities_until"]
+            )
+            state["phase"] = "graph"
+            await checkpoint.update(phase=state["phase"])
+
+        await self._compute_neo4j_metrics(from_start=True)
+
+        await checkpoint.clear()
+        await self._run_blocking(self.platform_utils.update_isin_progress)
+
+    async def _recompute_heatmaps_checkpointed(
+        self,
+        heatmaps_analysis: Heatmaps,
+        checkpoint: RecomputeCheckpoint,
+        heatmaps_until: datetime | None,
+    ) -> None:
+        """
+        compute the heatmaps from the checkpoint, persisting the progress per batch
+
+        Parameters
+        ------------
+        heatmaps_analysis : Heatmaps
+            the heatmaps analytics instance
+        checkpoint : RecomputeCheckpoint
+            the checkpoint of the recompute
+        heatmaps_until : datetime | None
+            the last day that its heatmaps were completely stored
+            if `None` all the heatmaps would be removed to be computed from start
+        """
+        if heatmaps_until is None:
+            analytics_data = {}
+            analytics_data["heatmaps"] = []
+            analytics_data["memberactivities"] = (None, None)
+            await self._run_blocking(
+                self.DB_connections.store_analytics_data,
+                analytics_data=analytics_data,
+                platform_id=self.platform_id,
+                graph_schema=self.graph_schema,
+                remove_memberactivities=False,
+                remove_heatmaps=True,
+            )
+        else:
+            # the days after the checkpoint could be stored partially
+            await heatmaps_analysis.utils.remove_heatmaps_from(
+                heatmaps_until + timedelta(days=1)
+            )
+
+        with stage("heatmaps"):
+            if isinstance(heatmaps_analysis, HeatmapsServerSide):
+                await heatmaps_analysis.materialize(from_start=False)
+                return
+
+            async for heatmaps_data in heatmaps_analysis.start(from_start=False):
+                await self._insert_heatmaps(heatmaps_data)
+                if len(heatmaps_data) != 0:
+                    last_day = max(document["date"] for document in heatmaps_data)
+                    await checkpoint.update(
+                        heatmaps_until=last_day.replace(tzinfo=timezone.utc)
+                    )
+
+    async def _recompute_memberactivities_checkpointed(
+        self,
+        memberactivity_analysis: MemberActivities,
+        checkpoint: RecomputeCheckpoint,
+        memberactivities_until: datetime | None,
+    ) -> None:
+        """
+        compute the memberactivities from the checkpoint in chunks of days
+        each chunk is continued from the memberactivities stored by the previous one
+        the same as the daily `run_once` continues the analysis
+        and just the graph of the last chunk is written
+
+        Parameters
+        ------------
+        memberactivity_analysis : MemberActivities
+            the memberactivities analytics instance
+        checkpoint : RecomputeCheckpoint
+            the checkpoint of the recompute
+        memberactivities_until : datetime | None
+            the last day that its memberactivities were stored
+            if `None` the memberactivities would be computed from start
+        """
+        yesterday = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=1)
+
+        # the stored memberactivities should be within the past data loaded
+        # for the next chunk, and the first chunk should have a complete window
+        chunk_days = max(
+            min(
+                self.checkpoint_days or 30,
+                memberactivity_analysis.get_max_continue_days(),
+            ),
+            self.window["period_size"] + 1,
+        )
+
+        until = memberactivities_until
+        while until is None or until < yesterday:
+            first_chunk = until is None
+            chunk_start = self.period if first_chunk else until
+            chunk_end = min(chunk_start + timedelta(days=chunk_days), yesterday)
+            last_chunk = chunk_end >= yesterday
+
+            (
+                member_activities_data,
+                member_acitivities_networkx_data,
+            ) = await self._run_blocking(
+                self._analyze_memberactivities,
+                memberactivity_analysis,
+                first_chunk,
+                until=chunk_end,
+            )
+
+            analytics_data = {}
+            analytics_data["heatmaps"] = None
+            analytics_data["memberactivities"] = (
+                member_activities_data,
+                (
+                    self.get_latest_networkx_graph(member_acitivities_networkx_data)
+                    if last_chunk
+                    else None
+                ),
+            )
+            await self._store_memberactivities(
+                analytics_data=analytics_data,
+                remove_memberactivities=first_chunk,
+                remove_graph=last_chunk,
+            )
+
+            until = chunk_end.replace(hour=0, minute=0, second=0, microsecond=0)
+            await checkpoint.update(memberactivities_until=until)
+
+    async def _recompute_dirty_days(
+        self,
+        heatmaps_analysis: Heatmaps,
+        memberactivity_analysis: MemberActivities,
+    ) -> tuple[RawDataSnapshot, bool]:
+        """
+        recompute the heatmaps of the already analyzed (day, resource) buckets
+        that their raw data was changed since the last analysis
+        and remove the memberactivities from the first changed day
+        so they would be recomputed within the run
+
+        Parameters
+        ------------
+        heatmaps_analysis : Heatmaps
+            the heatmaps analytics instance
+        memberactivity_analysis : MemberActivities
+            the memberactivities analytics instance
+
+        Returns
+        ---------
+        raw_snapshot : RawDataSnapshot
+            the snapshot of raw data taken before the analysis
+            to be stored after the run was finished successfully
+        recomputed : bool
+            whether any dirty day was recomputed or not
+        """
+        raw_snapshot = await self._take_raw_snapshot()
+
+        last_date = await heatmaps_analysis.utils.get_last_date()
+        if last_date is None:
+            return raw_snapshot, False
+
+        dirty_buckets = await self._get_dirty_day_ledger().get_dirty_buckets(
+            raw_snapshot, until=last_date.replace(tzinfo=timezone.utc)
+        )
+        if len(dirty_buckets) == 0:
+            logging.info(f"PLATFORMID: {self.platform_id}: No dirty days to recompute!")
+            return raw_snapshot, False
+
+        logging.info(
+            f"PLATFORMID: {self.platform_id}: Recomputing {len(dirty_buckets)} dirty days!"
+        )
+        with stage("dirty_days"):
+            async for heatmaps_data in heatmaps_analysis.recompute_buckets(
+                dirty_buckets
+            ):
+                await self._insert_heatmaps(heatmaps_data)
+
+            await self._run_blocking(
+                memberactivity_analysis.remove_from_date, min(dirty_buckets)
+            )
+
+        return raw_snapshot, True
+
+    async def _take_raw_snapshot(self) -> RawDataSnapshot:
+        """
+        take the snapshot of raw data for the days of the analysis
+        """
+        today = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return await self._get_dirty_day_ledger().take_snapshot(
+            start_day=self.period, end_day=today, resources=self.resources
+        )
+
+    def _get_fingerprint_store(self) -> RunFingerprintStore:
+        return RunFingerprintStore(
+            self.platform_id, self.analyzer_config.resource_identifier
+        )
+
+    def _get_dirty_day_ledger(self) -> DirtyDayLedger:
+        return DirtyDayLedger(
+            self.platform_id, self.analyzer_config.resource_identifier
+        )
+
+    def _heatmaps_class(self) -> type[Heatmaps]:
+        """
+        the heatmaps engine to use based on `self.server_side_heatmaps`
+        """
+        return HeatmapsServerSide if self.server_side_heatmaps else Heatmaps
+
+    async def _analyze_heatmaps_memberactivities(
+        self,
+        heatmaps_analysis: Heatmaps,
+        memberactivity_analysis: MemberActivities,
+        from_start: bool,
+        skip_heatmaps: bool = False,
+    ) -> tuple[list[dict], dict]:
+        """
+        compute and store the heatmaps and then compute the memberactivities
+        in case of `self.pipelined` the memberactivities would be computed
+        in a separate thread while the heatmaps are being computed and stored
+
+        Parameters
+        ------------
+        heatmaps_analysis : Heatmaps
+            the heatmaps analytics instance
+        memberactivity_analysis : MemberActivities
+            the memberactivities analytics instance
+        from_start : bool
+            whether to compute the analytics from the start or not
+        skip_heatmaps : bool
+            if True, the heatmaps wouldn't be computed since they were up to date
+            and the memberactivities would be computed on the stored heatmaps
+            default is False
+
+        Returns
+        ---------
+        member_activities_data : list[dict]
+            the memberactivities documents
+        member_acitivities_networkx_data : dict
+            the networkx graphs of the memberactivities
+        """
+        if skip_heatmaps:
+            logging.info(
+                f"PLATFORMID: {self.platform_id}: No new raw data! Skipping heatmaps."
+            )
+        elif not self.pipelined:
+            await self._store_heatmaps(heatmaps_analysis, from_start)
+
+        if skip_heatmaps or not self.pipelined:
+            return await self._run_blocking(
+                self._analyze_memberactivities, memberactivity_analysis, from_start
+            )
+
+        heatmaps_buffer = HeatmapsBuffer()
+        memberactivities_task = asyncio.create_task(
+            asyncio.to_thread(
+                self._analyze_memberactivities,
+                memberactivity_analysis,
+                from_start,
+                heatmaps_buffer,
+            )
+        )
+        try:
+            await self._store_heatmaps(heatmaps_analysis, from_start, heatmaps_buffer)
+        except Exception:
+            # stopping the memberactivities waiting for the next days
+            heatmaps_buffer.close(failed=True)
+            await asyncio.gather(memberactivities_task, return_exceptions=True)
+            raise
+
+        heatmaps_buffer.close()
+        return await memberactivities_task
+
+    async def _store_heatmaps(
+        self,
+        heatmaps_analysis: Heatmaps,
+        from_start: bool,
+        heatmaps_buffer: HeatmapsBuffer | None = None,
+    ) -> None:
+        """
+        compute the heatmaps and store them batch by batch
+        """
+        with stage("heatmaps"):
+            if isinstance(heatmaps_analysis, HeatmapsServerSide):
+                await heatmaps_analysis.materialize(from_start=from_start)
+                return
+
+            async for heatmaps_data in heatmaps_analysis.start(
+                from_start=from_start, heatmaps_buffer=heatmaps_buffer
+            ):
+                # storing heatmaps since memberactivities use them
+                await self._insert_heatmaps(heatmaps_data)
+
+    async def _insert_heatmaps(self, heatmaps_data: list[dict]) -> None:
+        """
+        store a batch of heatmaps documents
+        """
+        analytics_data = {}
+        analytics_data["heatmaps"] = heatmaps_data
+        analytics_data["memberactivities"] = (None, None)
+
+        await self._run_blocking(
+            self.DB_connections.store_analytics_data,
             analytics_data=analytics_data,
             platform_id=self.platform_id,
             graph_schema=self.graph_schema,
-            remove_memberactivities=True,
+            remove_memberactivities=False,
             remove_heatmaps=False,
         )
 
-        self.neo4j_analytics.compute_metrics(from_start=True)
-        self.platform_utils.update_isin_progress()
+    def _analyze_memberactivities(
+        self,
+        memberactivity_analysis: MemberActivities,
+        from_start: bool,
+        heatmaps_buffer: HeatmapsBuffer | None = None,
+        until: datetime | None = None,
+    ) -> tuple[list[dict], dict]:
+        """
+        compute the memberactivities
+        just the latest graph is kept, as the others are not stored
+        """
+        with stage("memberactivities"):
+            return memberactivity_analysis.analysis_member_activity(
+                from_start=from_start,
+                heatmaps_buffer=heatmaps_buffer,
+                latest_graph_only=True,
+                until=until,
+            )
+
+    async def _store_memberactivities(
+        self,
+        analytics_data: dict,
+        remove_memberactivities: bool,
+        remove_graph: bool | None = None,
+    ) -> None:
+        """
+        store the memberactivities and their graph
+        in case of `self.async_neo4j` the graph would be written using the async driver
+        and in case of `self.delta_graph` just the changes of graph would be written
+        """
+        if self.async_neo4j:
+            await self.DB_connections.store_analytics_data_async(
+                analytics_data=analytics_data,
+                platform_id=self.platform_id,
+                graph_schema=self.graph_schema,
+                remove_memberactivities=remove_memberactivities,
+                remove_heatmaps=False,
+                remove_graph=remove_graph,
+                delta_graph=self.delta_graph,
+            )
+        else:
+            await self._run_blocking(
+                self.DB_connections.store_analytics_data,
+                analytics_data=analytics_data,
+                platform_id=self.platform_id,
+                graph_schema=self.graph_schema,
+                remove_memberactivities=remove_memberactivities,
+                remove_heatmaps=False,
+                remove_graph=remove_graph,
+                delta_graph=self.delta_graph,
+            )
+
+    async def _compute_neo4j_metrics(self, from_start: bool) -> None:
+        """
+        compute the graph metrics
+        in case of `self.async_neo4j` they would be computed using the async driver
+        """
+        if self.async_neo4j:
+            await self.neo4j_analytics.compute_metrics_async(from_start=from_start)
+        else:
+            await self._run_blocking(
+                self.neo4j_analytics.compute_metrics, from_start=from_start
+            )
+
+    async def _run_blocking(self, func, *args, **kwargs):
+        """
+        run a blocking function
+        in case of `self.offload_blocking` it would be run in a worker thread
+        """
+        if self.offload_blocking:
+            return await asyncio.to_thread(func, *args, **kwargs)
+        else:
+            return func(*args, **kwargs)
+
+    def _instrument(self, run_type: str):
+        """
+        activate a new instrumentation for an analyzer run
+        the report of the run would be emitted to the `metrics_sink` at the end
+
+        Parameters
+        ------------
+        run_type : str
+            the type of the run, either `run_once` or `recompute`
+        """
+        self.instrumentation = RunInstrumentation(
+            platform_id=self.platform_id,
+            run_type=run_type,
+            sink=self.metrics_sink,
+        )
+        return self.instrumentation.activate()
+
+    def _async_neo4j_scope(self):
+        """
+        use the async neo4j driver within the run if `self.async_neo4j` was set
+        so the driver would be closed after the run
+        """
+        if self.async_neo4j:
+            return AsyncNeo4jOps.get_instance().use()
+        return nullcontext()
 
     def check_platform(self):
         """
@@ -0,0 +1,281 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Iterator
+
+from pymongo import monitoring
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - `resource` is not available on windows
+    resource = None  # type: ignore
+
+
+_current_instrumentation: ContextVar["RunInstrumentation | None"] = ContextVar(
+    "tc_analyzer_instrumentation", default=None
+)
+
+
+class MetricsSink:
+    """
+    the base class for the destinations of analyzer run reports
+    inherit this class to ship the reports into a monitoring system
+    """
+
+    def emit(self, report: dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class LoggingMetricsSink(MetricsSink):
+    """
+    write the run reports into the logs as a single json line
+    """
+
+    def emit(self, report: dict[str, Any]) -> None:
+        logging.info(f"ANALYZER RUN REPORT: {json.dumps(report, default=str)}")
+
+
+class RunInstrumentation:
+    def __init__(
+        self,
+        platform_id: str,
+        run_type: str,
+        sink: MetricsSink | None = None,
+    ) -> None:
+        """
+        instrumentation of one analyzer run
+        collecting per stage timings, database round-trip counters and peak memory
+
+        Parameters
+        ------------
+        platform_id : str
+            the platform the run is for
+        run_type : str
+            the type of the run, i.e. `run_once` or `recompute`
+        sink : MetricsSink | None
+            where to emit the report after the run is finished
+            default is `None` meaning the report would just be available
+            through the `report` method
+        """
+        self.platform_id = platform_id
+        self.run_type = run_type
+        self.sink = sink
+
+        self.counters: dict[str, int] = {}
+        self.stages: dict[str, dict[str, Any]] = {}
+        self.status = "pending"
+        self.error: str | None = None
+
+        self._started_at: datetime | None = None
+        self._start_time: float | None = None
+        self._duration: float | None = None
+        # counters are updated from the motor executor threads too
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator["RunInstrumentation"]:
+        """
+        make the instrumentation the current one for the code running within it
+        the report would be emitted to the sink after the run is finished
+        """
+        token = _current_instrumentation.set(self)
+        self._started_at = datetime.now(tz=timezone.utc)
+        self._start_time = time.perf_counter()
+        self.status = "running"
+        try:
+            yield self
+            self.status = "succeeded"
+        except BaseException as exp:
+            self.status = "failed"
+            self.error = repr(exp)
+            raise
+        finally:
+            self._duration = time.perf_counter() - self._start_time
+            _current_instrumentation.reset(token)
+            self.emit()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        measure a stage of the run
+        calling a stage with the same name multiple times would aggregate the results
+
+        Parameters
+        ------------
+        name : str
+            the name of the stage, i.e. `heatmaps` or `neo4j_write`
+        """
+        with self._lock:
+            counters_before = dict(self.counters)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            peak_memory = get_peak_memory_kb()
+
+            with self._lock:
+                stage = self.stages.setdefault(
+                    name,
+                    {
+                        "calls": 0,
+                        "total_seconds": 0.0,
+                        "max_seconds": 0.0,
+                        "peak_memory_kb": 0,
+                        "counters": {},
+                    },
+                )
+                stage["calls"] += 1
+                stage["total_seconds"] += duration
+                stage["max_seconds"] = max(stage["max_seconds"], duration)
+                stage["peak_memory_kb"] = max(stage["peak_memory_kb"], peak_memory)
+
+                for counter, value in self.counters.items():
+                    diff = value - counters_before.get(counter, 0)
+                    if diff:
+                        stage["counters"][counter] = (
+                            stage["counters"].get(counter, 0) + diff
+                        )
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        """
+        increment a counter of the run
+
+        Parameters
+        ------------
+        counter : str
+            the counter name, i.e. `mongo.aggregate` or `neo4j.queries`
+        value : int
+            the value to increment the counter with
+            default is 1
+        """
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def report(self) -> dict[str, Any]:
+        """
+        prepare the report of the run
+
+        Returns
+        ---------
+        report : dict[str, Any]
+            the run report with the stages, counters and peak memory
+        """
+        with self._lock:
+            stages = {
+                name: {**values, "counters": dict(values["counters"])}
+                for name, values in self.stages.items()
+            }
+            counters = dict(self.counters)
+
+        duration = self._duration
+        if duration is None and self._start_time is not None:
+            duration = time.perf_counter() - self._start_time
+
+        report = {
+            "platform_id": self.platform_id,
+            "run_type": self.run_type,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self._started_at.isoformat() if self._started_at else None,
+            "duration_seconds": duration,
+            "peak_memory_kb": get_peak_memory_kb(),
+            "stages": stages,
+            "counters": counters,
+        }
+        return report
+
+    def to_json(self) -> str:
+        """
+        the run report in json format
+        """
+        return json.dumps(self.report(), default=str)
+
+    def emit(self) -> None:
+        """
+        emit the run report to the sink (if any was given)
+        """
+        if self.sink is None:
+            return
+
+        try:
+            self.sink.emit(self.report())
+        except Exception as exp:
+            logging.error(
+                f"PLATFORMID: {self.platform_id}: Failed to emit run report, {exp}"
+            )
+
+
+class MongoCommandCounter(monitoring.CommandListener):
+    """
+    count the MongoDB round-trips of the currently active run
+    the commands are counted with the name of `mongo.<command_name>`
+    """
+
+    # the commands that are not issued by the analyzer code itself
+    ignored_commands = {
+        "hello",
+        "isMaster",
+        "ismaster",
+        "ping",
+        "endSessions",
+        "saslStart",
+        "saslContinue",
+        "buildinfo",
+        "buildInfo",
+    }
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name not in self.ignored_commands:
+            increment(f"mongo.{event.command_name}")
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        pass
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        increment("mongo.failed_commands")
+
+
+def get_current_instrumentation() -> RunInstrumentation | None:
+    """
+    get the instrumentation of the currently running analyzer (if any)
+    """
+    return _current_instrumentation.get()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    measure a stage within the currently active run
+    if no run was active, nothing would be measured
+    """
+    instrumentation = get_current_instrumentation()
+    if instrumentation is None:
+        yield
+    else:
+        with instrumentation.stage(name):
+            yield
+
+
+def increment(counter: str, value: int = 1) -> None:
+    """
+    increment a counter of the currently active run
+    if no run was active, nothing would be counted
+    """
+    instrumentation = get_current_instrumentation()
+    if instrumentation is not None:
+        instrumentation.increment(counter, value)
+
+
+def get_peak_memory_kb() -> int:
+    """
+    get the peak resident memory of the process in kilobytes
+    would be zero where the `resource` module is not available
+    """
+    if resource is None:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
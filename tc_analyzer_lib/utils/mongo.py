@@ -4,6 +4,7 @@ from typing import Any
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 from tc_analyzer_lib.utils.credentials import get_mongo_credentials
+from tc_analyzer_lib.utils.instrumentation import MongoCommandCounter
 
 
 class MongoSingleton:
@@ -15,8 +16,12 @@ class MongoSingleton:
         else:
             creds = get_mongo_credentials()
             connection_uri = config_mogno_creds(creds)
-            self.client = MongoClient(connection_uri)
-            self.async_client = AsyncIOMotorClient(connection_uri)
+            # counting the round-trips for the analyzer run reports
+            command_counter = MongoCommandCounter()
+            self.client = MongoClient(connection_uri, event_listeners=[command_counter])
+            self.async_client = AsyncIOMotorClient(
+                connection_uri, event_listeners=[command_counter]
+            )
             logging.info(f"MongoDB connected! server info: {self.client.server_info()}")
             MongoSingleton.__instance = self
 
@@ -0,0 +1,148 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import pandas as pd
+from neo4j import AsyncDriver, AsyncGraphDatabase
+from tc_analyzer_lib.utils.instrumentation import increment
+from tc_neo4j_lib.credentials import load_neo4j_credentials
+from tc_neo4j_lib.neo4j_ops import Query
+
+
+class AsyncNeo4jOps:
+    __instance = None
+
+    def __init__(self) -> None:
+        """
+        the async neo4j utilities, built on the async driver of neo4j
+        so the queries wouldn't block the event loop
+
+        Note: the driver is bound to the event loop it was created in,
+        so a new driver would be created if the event loop changed
+        """
+        if AsyncNeo4jOps.__instance is not None:
+            raise Exception("Singletone class! use `get_instance` method always.")
+        else:
+            creds = load_neo4j_credentials()
+            self.url = creds["url"]
+            self.auth = creds["auth"]
+            self.db_name = creds["db_name"]
+
+            self._driver: AsyncDriver | None = None
+            self._loop: asyncio.AbstractEventLoop | None = None
+            # the count of runs using the driver, see `use`
+            self._users = 0
+            AsyncNeo4jOps.__instance = self
+
+    @staticmethod
+    def get_instance():
+        if AsyncNeo4jOps.__instance is None:
+            AsyncNeo4jOps()
+        return AsyncNeo4jOps.__instance
+
+    @property
+    def neo4j_driver(self) -> AsyncDriver:
+        """
+        the async neo4j driver for the current event loop
+        """
+        loop = asyncio.get_running_loop()
+        if self._driver is not None and self._loop is not loop:
+            logging.warning(
+                "The async neo4j driver of a previous event loop wasn't closed! "
+                "the runs should use the driver within `use`."
+            )
+        if self._driver is None or self._loop is not loop:
+            self._driver = AsyncGraphDatabase.driver(
+                self.url, auth=self.auth, database=self.db_name
+            )
+            self._loop = loop
+        return self._driver
+
+    async def run_cypher(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
+        """
+        run a cypher query and return the results as a dataframe
+        the async equivalent of `gds.run_cypher`
+        the query is run in a managed transaction,
+        so the transient errors (i.e. deadlocks) would be retried by the driver
+
+        Parameters
+        ------------
+        query : str
+            the cypher query to run
+        params : dict[str, Any] | None
+            the parameters of the query
+
+        Returns
+        ---------
+        results : pd.DataFrame
+            the query results, with the returned keys as columns
+        """
+        increment("neo4j.queries")
+        records, _, keys = await self.neo4j_driver.execute_query(
+            query,
+            params or {},
+            database_=self.db_name,
+        )
+
+        results = pd.DataFrame([record.values() for record in records], columns=keys)
+        return results
+
+    async def run_queries_in_transaction(
+        self,
+        queries: list[Query],
+        message: str = "",
+    ) -> None:
+        """
+        run the queries in one transaction
+        the transaction is a managed one, so it would be retried by the driver
+        in case of transient errors (i.e. deadlocks between concurrent writes)
+
+        Parameters
+        ------------
+        queries : list[Query]
+            the queries to run
+        message : str
+            the message to be logged
+        """
+
+        async def transaction_function(tx):
+            for query_item in queries:
+                await tx.run(query_item.query, query_item.parameters)
+
+        increment("neo4j.queries", len(queries))
+        logging.info(f"{message} Running {len(queries)} queries in a transaction")
+        async with self.neo4j_driver.session(database=self.db_name) as session:
+            await session.execute_write(transaction_function)
+
+    @asynccontextmanager
+    async def use(self) -> AsyncIterator["AsyncNeo4jOps"]:
+        """
+        use the driver within a run, closing it when the last run using it is done
+        a driver left open would leak its connection pool once the event loop
+        is changed (i.e. each `asyncio.run` of a job), as it couldn't be closed
+        out of its own event loop
+        """
+        self._users += 1
+        try:
+            yield self
+        finally:
+            self._users -= 1
+            if self._users == 0:
+                await self.close()
+
+    async def close(self) -> None:
+        """
+        close the driver (if it was created)
+        """
+        if self._driver is not None:
+            try:
+                await self._driver.close()
+            except Exception as exp:
+                logging.error(f"Failed to close async neo4j driver: {exp}")
+            self._driver = None
+            self._loop = None
@@ -0,0 +1,120 @@
+import logging
+from typing import Any
+
+import pandas as pd
+from tc_analyzer_lib.utils.instrumentation import increment
+from tc_neo4j_lib.neo4j_ops import Neo4jOps, Query
+
+
+class CountedNeo4jOps:
+    def __init__(self, neo4j_ops: Neo4jOps) -> None:
+        """
+        the sync neo4j operations, counting the database round-trips
+        of the currently running analyzer under `neo4j.queries`
+
+        each call on the gds (i.e. `gds.run_cypher`, `gds.degree.stream`)
+        or the driver (i.e. `execute_query`, `session`) is counted as one
+        and each batch of queries as the count of its queries
+
+        Parameters
+        ------------
+        neo4j_ops : Neo4jOps
+            the neo4j operations to count their calls
+        """
+        self._neo4j_ops = neo4j_ops
+        self.gds = _CountedCalls(neo4j_ops.gds)
+        self.neo4j_driver = _CountedCalls(neo4j_ops.neo4j_driver)
+
+    @staticmethod
+    def get_instance() -> "CountedNeo4jOps":
+        """
+        get the counted operations of the neo4j singleton
+        """
+        return CountedNeo4jOps(Neo4jOps.get_instance())
+
+    def run_queries_in_batch(
+        self, queries: list[Query], message: str = "", **kwargs
+    ) -> None:
+        increment("neo4j.queries", len(queries))
+        self._neo4j_ops.run_queries_in_batch(queries, message=message, **kwargs)
+
+    def run_cypher(
+        self,
+        query: str,
+        params: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
+        """
+        run a cypher query and return the results as a dataframe
+        unlike `gds.run_cypher` the query is run in a managed transaction,
+        so the transient errors (i.e. deadlocks between the concurrent metrics
+        writing the same relationship) would be retried by the driver
+
+        Parameters
+        ------------
+        query : str
+            the cypher query to run
+        params : dict[str, Any] | None
+            the parameters of the query
+
+        Returns
+        ---------
+        results : pd.DataFrame
+            the query results, with the returned keys as columns
+        """
+        increment("neo4j.queries")
+        records, _, keys = self._neo4j_ops.neo4j_driver.execute_query(
+            query,
+            params or {},
+            database_=self._neo4j_ops.db_name,
+        )
+
+        results = pd.DataFrame([record.values() for record in records], columns=keys)
+        return results
+
+    def run_queries_in_transaction(
+        self,
+        queries: list[Query],
+        message: str = "",
+    ) -> None:
+        """
+        run the queries in one managed transaction
+        so it would be retried by the driver in case of transient errors
+        (`run_queries_in_batch` would just log them)
+
+        Parameters
+        ------------
+        queries : list[Query]
+            the queries to run
+        message : str
+            the message to be logged
+        """
+
+        def transaction_function(tx):
+            for query_item in queries:
+                tx.run(query_item.query, query_item.parameters)
+
+        increment("neo4j.queries", len(queries))
+        logging.info(f"{message} Running {len(queries)} queries in a transaction")
+        with self._neo4j_ops.neo4j_driver.session(
+            database=self._neo4j_ops.db_name
+        ) as session:
+            session.execute_write(transaction_function)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._neo4j_ops, name)
+
+
+class _CountedCalls:
+    def __init__(self, target: Any) -> None:
+        """
+        wrap an object so each call on it, or on its nested attributes, is counted
+        the results of the calls are returned as they are
+        """
+        self._target = target
+
+    def __getattr__(self, name: str) -> "_CountedCalls":
+        return _CountedCalls(getattr(self._target, name))
+
+    def __call__(self, *args, **kwargs) -> Any:
+        increment("neo4j.queries")
+        return self._target(*args, **kwargs)
@@ -1,5 +1,10 @@
 import logging
+import threading
+from collections import deque
+from typing import Any
 
+import pika
+from pika.exceptions import AMQPChannelError, AMQPConnectionError
 from tc_analyzer_lib.utils.credentials import get_rabbit_mq_credentials
 from tc_messageBroker import RabbitMQ
 from tc_messageBroker.rabbit_mq.queue import Queue
@@ -7,29 +12,120 @@ from tc_messageBroker.rabbit_mq.queue import Queue
 
 class RabbitMQAccess:
     __instance = None
+    __lock = threading.Lock()
 
     def __init__(self):
-        # if RabbitMQAccess.__instance is not None:
-        #     raise Exception("This class is a singleton!")
-        # else:
-        creds = get_rabbit_mq_credentials()
-        self.client = self.create_rabbitmq_client(creds)
-        RabbitMQAccess.__instance = self
+        if RabbitMQAccess.__instance is not None:
+            raise Exception("This class is a singleton!")
+        else:
+            # the client's connection isn't thread-safe
+            # so all the accesses to it would be locked
+            self.lock = threading.RLock()
+
+            self.creds = get_rabbit_mq_credentials()
+            self.client = self.create_rabbitmq_client(self.creds)
+            self.connect()
+            self.publisher = RabbitMQPublisher(self)
+            RabbitMQAccess.__instance = self
 
     @staticmethod
-    def get_instance():
-        # if RabbitMQAccess.__instance is None:
-        try:
-            RabbitMQAccess()
-            logging.info("RabbitMQ broker Connected Successfully!")
-        except Exception as exp:
-            logging.error(f"RabbitMQ broker not connected! exp: {exp}")
+    def get_instance(skip_singleton=False):
+        """
+        get the rabbitmq access instance
+        the connection is created once and reused between the calls
+        and it is re-created if it was closed (i.e. missed heartbeats)
+
+        the `skip_singleton` is for the case of test cases
+        raises the connection error if couldn't connect to the broker
+        """
+        with RabbitMQAccess.__lock:
+            if skip_singleton:
+                RabbitMQAccess.__instance = None
+
+            try:
+                if RabbitMQAccess.__instance is None:
+                    RabbitMQAccess()
+                    logging.info("RabbitMQ broker Connected Successfully!")
+                else:
+                    RabbitMQAccess.__instance.ensure_connection()
+            except Exception as exp:
+                logging.error(f"RabbitMQ broker not connected! exp: {exp}")
+                raise
 
-        return RabbitMQAccess.__instance
+            return RabbitMQAccess.__instance
 
     def get_client(self):
         return self.client
 
+    def get_publisher(self) -> "RabbitMQPublisher":
+        return self.publisher
+
+    def is_connected(self) -> bool:
+        """
+        check if the connection and the channel of the client are still open
+        """
+        connection = self.client.connection
+        channel = self.client.channel
+        return (
+            connection is not None
+            and connection.is_open
+            and channel is not None
+            and channel.is_open
+        )
+
+    def ensure_connection(self) -> None:
+        """
+        reconnect the client if its connection was closed
+        """
+        with self.lock:
+            if self.is_connected():
+                return
+
+            logging.warning("RabbitMQ connection was closed! Reconnecting.")
+            self.close_connection()
+            try:
+                self.connect()
+            except Exception as exp:
+                raise ConnectionError(
+                    f"Couldn't reconnect to RabbitMQ broker! exp: {exp}"
+                ) from exp
+
+    def connect(self) -> None:
+        """
+        open a publish-only connection and channel for the client
+        the `connect` of the client isn't used as it starts consuming the queue
+        which would make the analyzer a competing consumer of its own jobs
+        """
+        with self.lock:
+            connection = pika.BlockingConnection(
+                pika.ConnectionParameters(
+                    host=self.client.broker_url,
+                    port=self.client.port,
+                    credentials=pika.PlainCredentials(
+                        self.creds["username"], self.creds["password"]
+                    ),
+                    heartbeat=60,
+                ),
+            )
+            channel = connection.channel()
+            channel.queue_declare(
+                queue=Queue.DISCORD_ANALYZER, durable=True, auto_delete=False
+            )
+            self.client.connection = connection
+            self.client.channel = channel
+
+    def close_connection(self) -> None:
+        """
+        close the connection of the client, if it is still open
+        """
+        with self.lock:
+            connection = self.client.connection
+            try:
+                if connection is not None and connection.is_open:
+                    connection.close()
+            except Exception as exp:
+                logging.error(f"Failed to close RabbitMQ connection: {exp}")
+
     def create_rabbitmq_client(self, rabbit_creds: dict[str, str]):
         rabbitmq = RabbitMQ(
             broker_url=rabbit_creds["broker_url"],
@@ -37,6 +133,103 @@ class RabbitMQAccess:
             username=rabbit_creds["username"],
             password=rabbit_creds["password"],
         )
-        rabbitmq.connect(queue_name=Queue.DISCORD_ANALYZER)
 
         return rabbitmq
+
+
+class RabbitMQPublisher:
+    def __init__(self, access: RabbitMQAccess, batch_size: int = 500) -> None:
+        """
+        a thread-safe publisher buffering the messages and publishing them in batches
+        the underlying connection is not thread-safe, so it is used under
+        the lock of the rabbitmq access
+
+        Parameters
+        ------------
+        access : RabbitMQAccess
+            the rabbitmq access, holding the client and its connection
+        batch_size : int
+            the number of buffered messages to flush at once
+            the buffer is flushed automatically when it reaches this size
+            default is 500
+        """
+        self.access = access
+        self.batch_size = batch_size
+
+        self._buffer: deque[tuple[str, str, dict, dict[str, Any] | None]] = deque()
+        self._lock = access.lock
+
+    def publish(
+        self,
+        queue_name: str,
+        event: str,
+        content: dict,
+        options: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        add a message to the buffer to be published on the next flush
+
+        Parameters
+        ------------
+        queue_name : str
+            the queue to publish the message to
+        event : str
+            the event name to use
+        content : dict
+            dictionary of contents to publish
+        options : dict[str, Any] | None
+            additional properties of the message
+        """
+        with self._lock:
+            self._buffer.append((queue_name, event, content, options))
+            if len(self._buffer) >= self.batch_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """
+        publish all the buffered messages
+        the connection is checked once per batch and re-created if closed
+        and after each batch the pending network events (i.e. heartbeats) are served
+        """
+        with self._lock:
+            retried = False
+            while self._buffer:
+                try:
+                    self._publish_batch()
+                    retried = False
+                except (AMQPConnectionError, AMQPChannelError, ConnectionError) as exp:
+                    if retried:
+                        raise
+                    logging.warning(
+                        f"RabbitMQ connection lost while publishing: {exp}. "
+                        "Retrying the remaining messages after reconnecting."
+                    )
+                    retried = True
+
+    def close(self) -> None:
+        """
+        flush the remaining messages and close the connection
+        """
+        with self._lock:
+            self.flush()
+            self.access.close_connection()
+
+    def _publish_batch(self) -> None:
+        """
+        publish the next batch of buffered messages on a live connection
+        each message is removed from the buffer as soon as it is published
+        """
+        self.access.ensure_connection()
+        client = self.access.get_client()
+
+        for _ in range(min(self.batch_size, len(self._buffer))):
+            queue_name, event, content, options = self._buffer[0]
+            client.publish(
+                queue_name=queue_name,
+                event=event,
+                content=content,
+                options=options,
+            )
+            self._buffer.popleft()
+
+        client.connection.process_data_events(time_limit=0)
@@ -0,0 +1,64 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+from tc_analyzer_lib.algorithms.utils.account_dictionary import AccountDictionary
+from tc_analyzer_lib.algorithms.utils.member_activity_history_utils import (
+    MemberActivityHistory,
+)
+from tc_analyzer_lib.algorithms.utils.member_activity_utils import store_based_date
+
+
+class TestAccountDictionary(unittest.TestCase):
+    def test_encode_decode(self):
+        account_dictionary = AccountDictionary()
+
+        codes = account_dictionary.encode(["user1", "user2", "user1"])
+        self.assertEqual(codes.dtype, np.int32)
+        self.assertEqual(codes.tolist(), [0, 1, 0])
+        self.assertEqual(account_dictionary.encode_set(["user3", "user2"]), {2, 1})
+        self.assertEqual(len(account_dictionary), 3)
+        self.assertIn("user3", account_dictionary)
+
+        self.assertEqual(
+            account_dictionary.decode(np.array([2, 0], dtype=np.int32)),
+            ["user3", "user1"],
+        )
+
+    def test_shared_with_history(self):
+        account_dictionary = AccountDictionary()
+        account_dictionary.encode_one("user2")
+
+        history = MemberActivityHistory(["all_active"], account_dictionary)
+        history.append({"date": datetime(2024, 1, 1), "all_active": ["user1", "user2"]})
+
+        self.assertEqual(
+            history.to_activity_dict(decode=False), {"all_active": {"0": {0, 1}}}
+        )
+        self.assertEqual(
+            history.to_activity_dict(), {"all_active": {"0": {"user1", "user2"}}}
+        )
+
+    def test_decoding_documents(self):
+        account_dictionary = AccountDictionary()
+        start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        all_activities = {
+            "all_joined": {"0": set()},
+            "all_joined_day": {"0": set()},
+            "all_active": {"0": account_dictionary.encode_set(["user1", "user2"])},
+        }
+
+        documents = store_based_date(
+            start_date=start_date,
+            all_activities=all_activities,
+            analytics_day_range=6,
+            joined_acc_dict=[
+                {"id": "user3", "joined_at": start_date + timedelta(days=6)}
+            ],
+            load_past=False,
+            account_dictionary=account_dictionary,
+        )
+
+        self.assertEqual(len(documents), 1)
+        self.assertEqual(sorted(documents[0]["all_active"]), ["user1", "user2"])
+        self.assertEqual(documents[0]["all_joined_day"], ["user3"])
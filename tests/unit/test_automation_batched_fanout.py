@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import MagicMock
+
+from tc_analyzer_lib.automation.automation_workflow import AutomationWorkflow
+
+
+class TestAutomationBatchedFanout(unittest.TestCase):
+    def setUp(self) -> None:
+        # not to connect to databases
+        self.workflow = AutomationWorkflow.__new__(AutomationWorkflow)
+        self.workflow.mongo_client = MagicMock()
+        self.workflow.rabbitmq = MagicMock()
+
+    def test_create_manual_sagas(self):
+        data_list = [
+            self.workflow._prepare_saga_data("platform1", f"user{i}", "hello")
+            for i in range(3)
+        ]
+        saga_ids = self.workflow._create_manual_sagas(data_list)
+
+        collection = self.workflow.mongo_client["Saga"]["sagas"]
+        collection.insert_many.assert_called_once()
+        collection.insert_one.assert_not_called()
+
+        sagas = collection.insert_many.call_args.args[0]
+        self.assertEqual([saga["sagaId"] for saga in sagas], saga_ids)
+        self.assertEqual([saga["data"] for saga in sagas], data_list)
+        self.assertEqual(len(set(saga_ids)), 3)
+
+    def test_create_manual_sagas_empty(self):
+        saga_ids = self.workflow._create_manual_sagas([])
+
+        self.assertEqual(saga_ids, [])
+        self.workflow.mongo_client["Saga"]["sagas"].insert_many.assert_not_called()
+
+    def test_fire_events_batches(self):
+        saga_ids = [f"saga{i}" for i in range(5)]
+        data_list = [{"discordId": f"user{i}"} for i in range(5)]
+
+        self.workflow.fire_events(saga_ids, data_list, batch_size=2)
+
+        publish = self.workflow.rabbitmq.publish
+        self.assertEqual(publish.call_count, 5)
+        self.assertEqual(
+            [call.kwargs["content"]["uuid"] for call in publish.call_args_list],
+            saga_ids,
+        )
+        # flushed once per batch
+        self.assertEqual(self.workflow.rabbitmq.flush.call_count, 3)
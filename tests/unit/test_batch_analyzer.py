@@ -0,0 +1,83 @@
+import asyncio
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+
+from tc_analyzer_lib.batch_analyzer import AnalyzerJob, BatchAnalyzerRunner
+
+
+class FakeAnalyzer:
+    running = 0
+    max_running = 0
+
+    def __init__(self, platform_id: str, db_connections, **kwargs) -> None:
+        self.platform_id = platform_id
+        self.db_connections = db_connections
+        self.offload_blocking = kwargs["offload_blocking"]
+        self.instrumentation = None
+
+    async def run_once(self):
+        FakeAnalyzer.running += 1
+        FakeAnalyzer.max_running = max(FakeAnalyzer.max_running, FakeAnalyzer.running)
+        await asyncio.sleep(0.01)
+        FakeAnalyzer.running -= 1
+
+        if self.platform_id == "failing":
+            raise ValueError("some error")
+
+    async def recompute(self):
+        await self.run_once()
+
+
+class TestBatchAnalyzerRunner(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        FakeAnalyzer.running = 0
+        FakeAnalyzer.max_running = 0
+
+        self.runner = BatchAnalyzerRunner(max_concurrency=2)
+        # not to connect to databases
+        self.db_connections = object()
+        self.runner._db_connections = self.db_connections
+
+    def _job(self, platform_id: str, recompute: bool = False) -> AnalyzerJob:
+        return AnalyzerJob(
+            platform_id=platform_id,
+            resources=["1234"],
+            period=datetime(2024, 1, 1),
+            action={},
+            window={"period_size": 7, "step_size": 1},
+            recompute=recompute,
+        )
+
+    async def test_bounded_concurrency_and_isolation(self):
+        jobs = [self._job(f"platform{i}") for i in range(5)]
+        jobs.insert(2, self._job("failing", recompute=True))
+
+        with patch("tc_analyzer_lib.batch_analyzer.TCAnalyzer", FakeAnalyzer):
+            reports = await self.runner.run(jobs)
+
+        self.assertEqual(len(reports), 6)
+        self.assertEqual(
+            [report.platform_id for report in reports],
+            [job.platform_id for job in jobs],
+        )
+        self.assertLessEqual(FakeAnalyzer.max_running, 2)
+
+        for report in reports:
+            if report.platform_id == "failing":
+                self.assertEqual(report.status, "failed")
+                self.assertIn("some error", report.error)
+            else:
+                self.assertEqual(report.status, "succeeded")
+                self.assertIsNone(report.error)
+            self.assertGreater(report.to_dict()["duration_seconds"], 0)
+
+    async def test_duplicate_platforms(self):
+        jobs = [self._job("platform1"), self._job("platform1")]
+
+        with self.assertRaises(ValueError):
+            await self.runner.run(jobs)
+
+    def test_wrong_concurrency(self):
+        with self.assertRaises(ValueError):
+            BatchAnalyzerRunner(max_concurrency=0)
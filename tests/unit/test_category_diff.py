@@ -0,0 +1,90 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from tc_analyzer_lib.automation.utils.category_diff import CategoryDiff
+
+
+class TestCategoryDiff(unittest.TestCase):
+    def setUp(self) -> None:
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.yesterday = today - timedelta(days=1)
+        self.two_days_ago = today - timedelta(days=2)
+
+        self.documents = [
+            {
+                "date": self.two_days_ago,
+                "all_new_disengaged": ["user1"],
+                "all_active": ["user1", "user2"],
+            },
+            {
+                "date": self.yesterday,
+                "all_new_disengaged": ["user1", "user3"],
+                "all_active": ["user2", "user4"],
+            },
+        ]
+        self.mongo_client = MagicMock()
+        self.find = self.mongo_client["1234"]["memberactivities"].find
+        self.find.return_value.limit.return_value = self.documents
+
+    def test_single_query_for_categories(self):
+        category_diff = CategoryDiff(
+            self.mongo_client,
+            db_name="1234",
+            categories=["all_new_disengaged", "all_active", "all_new_disengaged"],
+        )
+
+        self.assertEqual(category_diff.get_new_users("all_new_disengaged"), {"user3"})
+        self.assertEqual(category_diff.get_new_users("all_active"), {"user4"})
+        self.assertEqual(
+            category_diff.get_users("all_active"),
+            (["user2", "user4"], ["user1", "user2"]),
+        )
+
+        self.find.assert_called_once()
+        projection = self.find.call_args.args[1]
+        self.assertEqual(
+            projection,
+            {"all_new_disengaged": 1, "all_active": 1, "date": 1, "_id": 0},
+        )
+
+    def test_not_given_category(self):
+        category_diff = CategoryDiff(
+            self.mongo_client, db_name="1234", categories=["all_active"]
+        )
+        category_diff.get_new_users("all_active")
+        users = category_diff.get_new_users("all_new_disengaged")
+
+        self.assertEqual(users, {"user3"})
+        self.assertEqual(self.find.call_count, 2)
+
+    def test_missing_days(self):
+        self.find.return_value.limit.return_value = []
+        category_diff = CategoryDiff(
+            self.mongo_client, db_name="1234", categories=["all_active"]
+        )
+
+        self.assertEqual(category_diff.get_users("all_active"), ([], []))
+        self.assertEqual(category_diff.get_new_users("all_active"), set())
+
+    def test_in_memory_documents(self):
+        category_diff = CategoryDiff(
+            self.mongo_client,
+            db_name="1234",
+            categories=["all_active"],
+            memberactivities=self.documents,
+        )
+
+        self.assertEqual(category_diff.get_new_users("all_active"), {"user4"})
+        self.find.assert_not_called()
+
+    def test_in_memory_documents_incomplete(self):
+        category_diff = CategoryDiff(
+            self.mongo_client,
+            db_name="1234",
+            categories=["all_active"],
+            memberactivities=self.documents[1:],
+        )
+
+        self.assertEqual(category_diff.get_new_users("all_active"), {"user4"})
+        self.find.assert_called_once()
@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tc_analyzer_lib.metrics.utils import DirtyDayLedger
+
+
+class TestDirtyDayLedger(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        with patch("tc_analyzer_lib.metrics.utils.dirty_day_ledger.MongoSingleton"):
+            self.ledger = DirtyDayLedger("1234", resource_identifier="channel_id")
+
+        self.day1 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.day2 = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        self.day3 = datetime(2024, 1, 3, tzinfo=timezone.utc)
+        self.stored = {
+            (self.day1, "111"): {"count": 5, "max_id": "a5", "engagements": 2},
+            (self.day1, "222"): {"count": 3, "max_id": "a8", "engagements": 0},
+            (self.day2, "111"): {"count": 4, "max_id": "b4", "engagements": 1},
+        }
+
+    async def test_no_stored_snapshot(self):
+        self.ledger.load = AsyncMock(return_value={})
+
+        dirty_buckets = await self.ledger.get_dirty_buckets(self.stored)
+        self.assertEqual(dirty_buckets, {})
+
+    async def test_unchanged_snapshot(self):
+        self.ledger.load = AsyncMock(return_value=self.stored)
+
+        dirty_buckets = await self.ledger.get_dirty_buckets(dict(self.stored))
+        self.assertEqual(dirty_buckets, {})
+
+    async def test_changed_buckets(self):
+        self.ledger.load = AsyncMock(return_value=self.stored)
+        snapshot = {
+            # late arriving data
+            (self.day1, "111"): {"count": 6, "max_id": "c1", "engagements": 2},
+            (self.day1, "222"): {"count": 3, "max_id": "a8", "engagements": 0},
+            # edited reactions
+            (self.day2, "111"): {"count": 4, "max_id": "b4", "engagements": 3},
+            # a new resource
+            (self.day2, "333"): {"count": 1, "max_id": "c2", "engagements": 0},
+            # not analyzed before
+            (self.day3, "111"): {"count": 1, "max_id": "c3", "engagements": 0},
+        }
+
+        dirty_buckets = await self.ledger.get_dirty_buckets(snapshot, until=self.day2)
+        self.assertEqual(
+            dirty_buckets,
+            {
+                self.day1: ["111"],
+                self.day2: ["111", "333"],
+            },
+        )
+
+    async def test_removed_bucket(self):
+        self.ledger.load = AsyncMock(return_value=self.stored)
+        snapshot = dict(self.stored)
+        snapshot.pop((self.day1, "222"))
+
+        dirty_buckets = await self.ledger.get_dirty_buckets(snapshot)
+        self.assertEqual(dirty_buckets, {self.day1: ["222"]})
+
+    async def test_commit(self):
+        collection = MagicMock()
+        collection.delete_many = AsyncMock()
+        collection.insert_many = AsyncMock()
+        self.ledger.database = {"rawactivitysnapshots": collection}
+
+        await self.ledger.commit(self.stored)
+
+        collection.delete_many.assert_awaited_once_with({})
+        documents = collection.insert_many.await_args.args[0]
+        self.assertEqual(len(documents), 3)
+        self.assertIn(
+            {
+                "date": self.day2,
+                "resource": "111",
+                "count": 4,
+                "max_id": "b4",
+                "engagements": 1,
+            },
+            documents,
+        )
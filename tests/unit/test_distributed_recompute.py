@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tc_analyzer_lib.distributed_recompute import (
+    DistributedRecompute,
+    RecomputeProgress,
+    compute_heatmaps_shard,
+    finish_distributed_recompute,
+)
+
+
+class LocalRedis:
+    """
+    a local stand-in for the redis hash commands used in recompute progress
+    """
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[bytes, bytes]] = {}
+
+    def delete(self, key: str) -> None:
+        self.hashes.pop(key, None)
+
+    def hset(self, key: str, field=None, value=None, mapping=None) -> None:
+        mapping = mapping or {field: value}
+        for item_key, item_value in mapping.items():
+            self.hashes.setdefault(key, {})[item_key.encode()] = str(
+                item_value
+            ).encode()
+
+    def hincrby(self, key: str, field: str, amount: int = 1) -> int:
+        value = int(self.hashes.setdefault(key, {}).get(field.encode(), 0)) + amount
+        self.hashes[key][field.encode()] = str(value).encode()
+        return value
+
+    def hgetall(self, key: str) -> dict[bytes, bytes]:
+        return dict(self.hashes.get(key, {}))
+
+
+class TestDistributedRecompute(TestCase):
+    def setUp(self) -> None:
+        self.today = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        self.redis = LocalRedis()
+        self.queue = MagicMock()
+        self.recompute = DistributedRecompute(
+            platform_id="1234",
+            resources=["111", "222"],
+            period=self.today - timedelta(days=65, hours=-3),
+            action={"INT_THR": 1},
+            window={"period_size": 7, "step_size": 1},
+            shard_days=30,
+            queue=self.queue,
+            redis_client=self.redis,
+        )
+
+    def test_shard_date_range(self):
+        shards = self.recompute.shard_date_range()
+        first_day = self.today - timedelta(days=65)
+
+        self.assertEqual(
+            shards,
+            [
+                (first_day, first_day + timedelta(days=30)),
+                (first_day + timedelta(days=30), first_day + timedelta(days=60)),
+                (first_day + timedelta(days=60), self.today),
+            ],
+        )
+
+    def test_wrong_shard_days(self):
+        with self.assertRaises(ValueError):
+            DistributedRecompute(
+                platform_id="1234",
+                resources=[],
+                period=self.today,
+                action={},
+                window={},
+                shard_days=0,
+                queue=self.queue,
+                redis_client=self.redis,
+            )
+
+    @patch("tc_analyzer_lib.distributed_recompute.MongoSingleton")
+    def test_enqueue(self, mock_mongo):
+        shard_jobs = [MagicMock(), MagicMock(), MagicMock()]
+        final_job = MagicMock()
+        self.queue.enqueue.side_effect = shard_jobs + [final_job]
+
+        job = self.recompute.enqueue()
+
+        self.assertIs(job, final_job)
+        # previous heatmaps removed
+        mock_mongo.get_instance().get_client()["1234"][
+            "heatmaps"
+        ].delete_many.assert_called_once_with({})
+
+        calls = self.queue.enqueue.call_args_list
+        self.assertEqual(len(calls), 4)
+        for call in calls[:3]:
+            self.assertIs(call.args[0], compute_heatmaps_shard)
+        self.assertEqual(
+            calls[2].kwargs["kwargs"]["end_day"],
+            self.today,
+        )
+        self.assertIs(calls[3].args[0], finish_distributed_recompute)
+        self.assertEqual(calls[3].kwargs["depends_on"], shard_jobs)
+
+        self.assertEqual(
+            self.recompute.get_progress(),
+            {
+                "status": "heatmaps",
+                "total_shards": "3",
+                "completed_shards": "0",
+                "started_at": self.recompute.get_progress()["started_at"],
+            },
+        )
+
+
+class TestHeatmapsShard(TestCase):
+    def setUp(self) -> None:
+        self.redis = LocalRedis()
+        self.progress = RecomputeProgress(self.redis, "1234")
+        self.progress.start(total_shards=2)
+        self.shard_kwargs = {
+            "platform_id": "1234",
+            "resources": ["111"],
+            "period": datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+            "analyzer_config": {
+                "platform": "discord",
+                "resource_identifier": "channel_id",
+                "hourly_analytics": [],
+                "raw_analytics": [],
+            },
+            "start_day": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "end_day": datetime(2024, 1, 31, tzinfo=timezone.utc),
+            "redis_client": self.redis,
+        }
+
+    @patch("tc_analyzer_lib.distributed_recompute._compute_heatmaps_shard")
+    def test_shard_done(self, mock_compute):
+        mock_compute.return_value = 10
+
+        documents_count = compute_heatmaps_shard(**self.shard_kwargs)
+
+        self.assertEqual(documents_count, 10)
+        self.assertEqual(self.progress.get()["completed_shards"], "1")
+        # the first shard started from the period itself
+        self.assertEqual(
+            mock_compute.call_args.args[2],
+            datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+        )
+
+    @patch("tc_analyzer_lib.distributed_recompute.MongoNeo4jDB")
+    @patch("tc_analyzer_lib.distributed_recompute.Heatmaps")
+    def test_shard_stores_heatmaps(self, mock_heatmaps, mock_db):
+        async def start(from_start, end_date):
+            yield [{"user": "a"}, {"user": "b"}]
+            yield [{"user": "c"}]
+
+        heatmaps_analysis = mock_heatmaps.return_value
+        heatmaps_analysis.utils.remove_heatmaps_from = AsyncMock()
+        heatmaps_analysis.start = start
+
+        documents_count = compute_heatmaps_shard(**self.shard_kwargs)
+
+        self.assertEqual(documents_count, 3)
+        db_connections = mock_db.return_value
+        db_connections.set_mongo_db_ops.assert_called_once()
+        calls = db_connections.store_analytics_data.call_args_list
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(
+            calls[1].kwargs["analytics_data"],
+            {"heatmaps": [{"user": "c"}], "memberactivities": (None, None)},
+        )
+        self.assertFalse(calls[1].kwargs["remove_heatmaps"])
+        self.assertFalse(calls[1].kwargs["remove_memberactivities"])
+
+    @patch("tc_analyzer_lib.distributed_recompute._compute_heatmaps_shard")
+    def test_shard_failed(self, mock_compute):
+        mock_compute.side_effect = RuntimeError("mongo down")
+
+        with self.assertRaises(RuntimeError):
+            compute_heatmaps_shard(**self.shard_kwargs)
+
+        progress = self.progress.get()
+        self.assertEqual(progress["status"], "failed")
+        self.assertEqual(progress["completed_shards"], "0")
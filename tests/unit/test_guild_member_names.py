@@ -0,0 +1,73 @@
+import unittest
+from unittest.mock import MagicMock
+
+from tc_analyzer_lib.automation.utils.guild_member_names import GuildMemberNames
+
+
+class TestGuildMemberNames(unittest.TestCase):
+    def setUp(self) -> None:
+        self.mongo_client = MagicMock()
+        self.find = self.mongo_client["1234"]["guildmembers"].find
+        self.members = [
+            {
+                "discordId": "1111",
+                "username": "user1",
+                "globalName": "User1GlobalName",
+                "nickname": "User1NickName",
+            },
+            {
+                "discordId": "1112",
+                "username": "user2",
+                "globalName": "User2GlobalName",
+                "nickname": None,
+            },
+            {
+                "discordId": "1113",
+                "username": "user3",
+                "globalName": None,
+                "nickname": None,
+            },
+        ]
+        self.find.side_effect = lambda query, projection: [
+            member
+            for member in self.members
+            if member["discordId"] in query["discordId"]["$in"]
+        ]
+        self.member_names = GuildMemberNames(self.mongo_client, guild_id="1234")
+
+    def test_ngu_strategy(self):
+        id_names = self.member_names.get_names(
+            ["1111", "1112", "1113", "9999"], user_field="ngu"
+        )
+        self.assertEqual(
+            id_names,
+            [
+                ("1111", "User1NickName"),
+                ("1112", "User2GlobalName"),
+                ("1113", "user3"),
+            ],
+        )
+
+    def test_memoized_between_strategies(self):
+        self.member_names.load({"1111", "1112", "1113", "9999"})
+
+        usernames = self.member_names.get_names(["1111", "1113"], user_field="username")
+        nicknames = self.member_names.get_names(
+            ["1112", "9999", "1111"], user_field="nickname"
+        )
+
+        self.assertEqual(usernames, [("1111", "user1"), ("1113", "user3")])
+        self.assertEqual(nicknames, [("1112", None), ("1111", "User1NickName")])
+        # the unavailable user wasn't fetched again
+        self.find.assert_called_once()
+
+    def test_fetching_just_new_users(self):
+        self.member_names.get_names(["1111"])
+        self.member_names.get_names(["1111", "1112"])
+
+        self.assertEqual(self.find.call_count, 2)
+        self.assertEqual(self.find.call_args.args[0], {"discordId": {"$in": ["1112"]}})
+
+    def test_wrong_user_field(self):
+        with self.assertRaises(ValueError):
+            self.member_names.get_names(["1111"], user_field="displayName")
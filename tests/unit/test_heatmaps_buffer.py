@@ -0,0 +1,123 @@
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from tc_analyzer_lib.metrics.heatmaps import HeatmapsBuffer
+
+
+class TestHeatmapsBuffer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.buffer = HeatmapsBuffer()
+        self.start = datetime(2024, 1, 10, tzinfo=timezone.utc)
+
+    def _document(self, day: datetime, user: str, channel: str = "c1") -> dict:
+        return {
+            "date": datetime(day.year, day.month, day.day),
+            "user": user,
+            "channel_id": channel,
+            "thr_messages": [0] * 24,
+            "replied_per_acc": [],
+        }
+
+    def test_split_date(self):
+        self.buffer.set_start_date(self.start)
+
+        # window completely before the buffer
+        split = self.buffer.split_date(
+            self.start - timedelta(days=7), self.start - timedelta(days=1)
+        )
+        self.assertEqual(split, self.start - timedelta(days=1))
+
+        # window partially covered
+        split = self.buffer.split_date(
+            self.start - timedelta(days=3), self.start + timedelta(days=4)
+        )
+        self.assertEqual(split, self.start)
+
+        # window completely covered
+        split = self.buffer.split_date(
+            self.start + timedelta(days=1), self.start + timedelta(days=8)
+        )
+        self.assertEqual(split, self.start + timedelta(days=1))
+
+    def test_find_filters(self):
+        self.buffer.set_start_date(self.start)
+        self.buffer.add_day(
+            self.start,
+            [
+                self._document(self.start, "user1"),
+                self._document(self.start, "user2", channel="c2"),
+            ],
+        )
+        next_day = self.start + timedelta(days=1)
+        self.buffer.add_day(next_day, [self._document(next_day, "user3")])
+
+        documents = self.buffer.find(
+            self.start,
+            self.start + timedelta(days=2),
+            users=["user1", "user2", "user3"],
+            resources=["c1"],
+            resource_identifier="channel_id",
+            projection=["user", "thr_messages"],
+        )
+        self.assertEqual(
+            documents,
+            [
+                {"user": "user1", "thr_messages": [0] * 24},
+                {"user": "user3", "thr_messages": [0] * 24},
+            ],
+        )
+        self.assertEqual(
+            self.buffer.get_users(self.start, next_day), ["user1", "user2"]
+        )
+
+        self.buffer.discard_before(next_day)
+        self.assertEqual(self.buffer.get_users(self.start, next_day), [])
+        self.assertEqual(
+            self.buffer.get_users(self.start, next_day + timedelta(days=1)), ["user3"]
+        )
+
+    def test_documents_are_copied(self):
+        self.buffer.set_start_date(self.start)
+        document = self._document(self.start, "user1")
+        self.buffer.add_day(self.start, [document])
+
+        # as if inserting in database
+        document["_id"] = "some_id"
+
+        documents = self.buffer.find(self.start, self.start + timedelta(days=1))
+        self.assertNotIn("_id", documents[0])
+
+    def test_wait_until_produced(self):
+        window_end = self.start + timedelta(days=3)
+
+        def produce():
+            self.buffer.set_start_date(self.start)
+            for i in range(3):
+                time.sleep(0.01)
+                day = self.start + timedelta(days=i)
+                self.buffer.add_day(day, [self._document(day, f"user{i}")])
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+
+        self.buffer.wait_until(window_end)
+        self.assertEqual(
+            self.buffer.get_users(self.start, window_end),
+            ["user0", "user1", "user2"],
+        )
+        producer.join()
+
+    def test_wait_until_closed(self):
+        self.buffer.set_start_date(self.start)
+        self.buffer.close()
+
+        # shouldn't block
+        self.buffer.wait_until(self.start + timedelta(days=10))
+
+    def test_wait_until_failed(self):
+        self.buffer.close(failed=True)
+
+        with self.assertRaises(RuntimeError):
+            self.buffer.wait_until(self.start + timedelta(days=1))
@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tc_analyzer_lib.metrics.heatmaps import HeatmapsServerSide
+from tc_analyzer_lib.schemas.platform_configs import DiscordAnalyzerConfig
+
+
+class TestHeatmapsServerSide(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        with patch("tc_analyzer_lib.metrics.heatmaps.heatmaps.HeatmapsUtils"):
+            self.heatmaps = HeatmapsServerSide(
+                platform_id="1234",
+                period=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                resources=["111", "222"],
+                analyzer_config=DiscordAnalyzerConfig(),
+            )
+        self.start_day = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.end_day = datetime(2024, 1, 5, tzinfo=timezone.utc)
+
+    def test_pipeline_stages(self):
+        config = DiscordAnalyzerConfig()
+        pipeline = self.heatmaps.build_pipeline(
+            self.start_day, self.end_day, bot_ids=["bot1"]
+        )
+
+        self.assertEqual(
+            pipeline[0],
+            {
+                "$match": {
+                    "date": {"$gte": self.start_day, "$lt": self.end_day},
+                    "metadata.channel_id": {"$in": ["111", "222"]},
+                    "metadata.bot_activity": False,
+                }
+            },
+        )
+        unions = [stage for stage in pipeline if "$unionWith" in stage]
+        self.assertEqual(
+            len(unions), len(config.hourly_analytics) + len(config.raw_analytics)
+        )
+        self.assertIn({"$match": {"user": {"$nin": ["bot1"]}}}, pipeline)
+        self.assertEqual(
+            pipeline[-1],
+            {
+                "$merge": {
+                    "into": "heatmaps",
+                    "on": ["date", "channel_id", "user"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert",
+                }
+            },
+        )
+
+        projection = pipeline[-2]["$project"]
+        self.assertEqual(projection["channel_id"], "$_id.resource")
+        self.assertEqual(projection["date"], "$_id.date")
+        self.assertEqual(projection["user"], "$_id.user")
+        for analytics in config.hourly_analytics + config.raw_analytics:
+            self.assertIn(analytics.name, projection)
+
+    def test_custom_analytics_conditions(self):
+        pipeline = self.heatmaps.build_pipeline(
+            self.start_day, self.end_day, bot_ids=[]
+        )
+        union_pipelines = {
+            stage["$unionWith"]["pipeline"][-1]["$project"]["analytics"][
+                "$literal"
+            ]: stage["$unionWith"]["pipeline"]
+            for stage in pipeline
+            if "$unionWith" in stage
+        }
+
+        # custom analytics having their conditions applied
+        lone_messages = union_pipelines["lone_messages"]
+        self.assertEqual(lone_messages[0]["$match"]["metadata.thread_id"], None)
+        self.assertEqual(
+            lone_messages[2],
+            {"$match": {"actions.name": "message", "actions.type": "emitter"}},
+        )
+        # no engaged users on actions
+        self.assertNotIn({"$unwind": "$interactions.users_engaged_id"}, lone_messages)
+
+        replier = union_pipelines["replier"]
+        self.assertNotIn("metadata.thread_id", replier[0]["$match"])
+        self.assertEqual(
+            replier[2],
+            {"$match": {"interactions.name": "reply", "interactions.type": "receiver"}},
+        )
+        self.assertIn({"$unwind": "$interactions.users_engaged_id"}, replier)
+
+        reacted_per_acc = union_pipelines["reacted_per_acc"]
+        self.assertEqual(
+            reacted_per_acc[-2]["$group"]["_id"]["account"],
+            "$interactions.users_engaged_id",
+        )
+
+    async def test_materialize_up_to_date(self):
+        today = datetime.now(tz=timezone.utc)
+        self.heatmaps.utils.get_last_date = AsyncMock(return_value=today)
+        self.heatmaps.utils.database = MagicMock()
+
+        await self.heatmaps.materialize()
+
+        self.heatmaps.utils.database[
+            "rawmemberactivities"
+        ].aggregate.assert_not_called()
+
+    async def test_materialize_per_day(self):
+        today = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        # the last stored day, could be written partially
+        last_date = today - timedelta(days=3)
+        self.heatmaps.utils.get_last_date = AsyncMock(return_value=last_date)
+        self.heatmaps.utils.remove_heatmaps_from = AsyncMock()
+        self.heatmaps._get_bot_ids = AsyncMock(return_value=[])
+
+        database = MagicMock()
+        database["heatmaps"].create_index = AsyncMock()
+        aggregate = database["rawmemberactivities"].aggregate
+        aggregate.return_value.to_list = AsyncMock(return_value=[])
+        self.heatmaps.utils.database = database
+
+        await self.heatmaps.materialize()
+
+        database["heatmaps"].create_index.assert_awaited_once_with(
+            [("date", 1), ("channel_id", 1), ("user", 1)], unique=True
+        )
+        self.heatmaps.utils.remove_heatmaps_from.assert_awaited_once_with(last_date)
+        # the days are computed in order, the last stored day included
+        self.assertEqual(aggregate.call_count, 3)
+        self.assertEqual(
+            [call.args[0][0]["$match"]["date"] for call in aggregate.call_args_list],
+            [
+                {
+                    "$gte": last_date + timedelta(days=idx),
+                    "$lt": last_date + timedelta(days=idx + 1),
+                }
+                for idx in range(3)
+            ],
+        )
@@ -0,0 +1,98 @@
+import json
+import threading
+import unittest
+
+from tc_analyzer_lib.utils.instrumentation import (
+    MetricsSink,
+    RunInstrumentation,
+    get_current_instrumentation,
+    increment,
+    stage,
+)
+
+
+class ListMetricsSink(MetricsSink):
+    def __init__(self) -> None:
+        self.reports = []
+
+    def emit(self, report: dict) -> None:
+        self.reports.append(report)
+
+
+class TestRunInstrumentation(unittest.TestCase):
+    def test_no_active_run(self):
+        """
+        stages and counters shouldn't fail when no run is active
+        """
+        self.assertIsNone(get_current_instrumentation())
+        with stage("heatmaps"):
+            increment("mongo.find")
+
+    def test_stages_and_counters(self):
+        sink = ListMetricsSink()
+        instrumentation = RunInstrumentation(
+            platform_id="1234", run_type="run_once", sink=sink
+        )
+
+        with instrumentation.activate():
+            self.assertIs(get_current_instrumentation(), instrumentation)
+            increment("neo4j.queries", 3)
+            with stage("heatmaps"):
+                increment("mongo.aggregate")
+                increment("mongo.aggregate")
+            with stage("heatmaps"):
+                increment("mongo.insert")
+
+        self.assertIsNone(get_current_instrumentation())
+        self.assertEqual(len(sink.reports), 1)
+
+        report = sink.reports[0]
+        self.assertEqual(report["platform_id"], "1234")
+        self.assertEqual(report["run_type"], "run_once")
+        self.assertEqual(report["status"], "succeeded")
+        self.assertEqual(
+            report["counters"],
+            {"neo4j.queries": 3, "mongo.aggregate": 2, "mongo.insert": 1},
+        )
+        self.assertEqual(report["stages"]["heatmaps"]["calls"], 2)
+        self.assertEqual(
+            report["stages"]["heatmaps"]["counters"],
+            {"mongo.aggregate": 2, "mongo.insert": 1},
+        )
+        self.assertGreaterEqual(report["duration_seconds"], 0)
+        self.assertGreaterEqual(report["peak_memory_kb"], 0)
+
+        # should be serializable
+        self.assertEqual(json.loads(instrumentation.to_json())["status"], "succeeded")
+
+    def test_failed_run(self):
+        sink = ListMetricsSink()
+        instrumentation = RunInstrumentation(
+            platform_id="1234", run_type="recompute", sink=sink
+        )
+
+        with self.assertRaises(ValueError):
+            with instrumentation.activate():
+                raise ValueError("some error")
+
+        self.assertEqual(sink.reports[0]["status"], "failed")
+        self.assertIn("some error", sink.reports[0]["error"])
+
+    def test_counters_from_threads(self):
+        instrumentation = RunInstrumentation(platform_id="1234", run_type="run_once")
+
+        def count(run: RunInstrumentation):
+            for _ in range(100):
+                run.increment("mongo.find")
+
+        with instrumentation.activate():
+            threads = [
+                threading.Thread(target=count, args=(instrumentation,))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(instrumentation.report()["counters"]["mongo.find"], 500)
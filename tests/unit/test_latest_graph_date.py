@@ -0,0 +1,47 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from tc_analyzer_lib.algorithms.neo4j_analysis.utils import ProjectionUtils
+from tc_analyzer_lib.schemas import GraphSchema
+
+
+class TestLatestGraphDate(TestCase):
+    def setUp(self) -> None:
+        with patch(
+            "tc_analyzer_lib.algorithms.neo4j_analysis.utils.projection_utils.CountedNeo4jOps"
+        ):
+            self.projection_utils = ProjectionUtils(
+                "1234", GraphSchema(platform="discord")
+            )
+        self.projection_utils.gds = MagicMock()
+
+    def test_latest_date_from_platform_node(self):
+        self.projection_utils.gds.run_cypher.return_value = pd.DataFrame(
+            {"dates": [1704067200000]}
+        )
+
+        dates = self.projection_utils.get_dates()
+
+        self.assertEqual(dates, {1704067200000})
+        # no relations scanned
+        self.projection_utils.gds.run_cypher.assert_called_once()
+        self.assertIn(
+            "g.latestGraphDate",
+            self.projection_utils.gds.run_cypher.call_args.args[0],
+        )
+
+    def test_fallback_to_relations_scan(self):
+        self.projection_utils.gds.run_cypher.side_effect = [
+            pd.DataFrame({"dates": []}),
+            pd.DataFrame({"dates": [1704067200000]}),
+        ]
+
+        dates = self.projection_utils.get_dates()
+
+        self.assertEqual(dates, {1704067200000})
+        self.assertEqual(self.projection_utils.gds.run_cypher.call_count, 2)
+        self.assertIn(
+            "ORDER BY dates DESC LIMIT 1",
+            self.projection_utils.gds.run_cypher.call_args.args[0],
+        )
@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+from tc_analyzer_lib.algorithms.member_activity_history import check_past_history
+from tc_analyzer_lib.algorithms.utils.member_activity_history_utils import (
+    MemberActivityHistory,
+)
+
+
+class TestMemberActivityHistory(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_dt = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.documents = [
+            {
+                "date": self.start_dt,
+                "all_active": ["user1", "user2"],
+                "all_lurker": [],
+            },
+            {
+                "date": self.start_dt + timedelta(days=1),
+                "all_active": ["user2", "user3"],
+            },
+        ]
+
+    def test_interned_columns(self):
+        history = MemberActivityHistory(["all_active", "all_lurker"])
+        for document in self.documents:
+            history.append(document)
+
+        self.assertEqual(len(history), 2)
+        self.assertEqual(history.users, ["user1", "user2", "user3"])
+        self.assertEqual(history.columns["all_active"][1].tolist(), [1, 2])
+        self.assertIsNone(history.columns["all_lurker"][1])
+
+        activity_dict = history.to_activity_dict()
+        self.assertEqual(
+            activity_dict,
+            {
+                "all_active": {"0": {"user1", "user2"}, "1": {"user2", "user3"}},
+                # the missing category of a day isn't included
+                "all_lurker": {"0": set()},
+            },
+        )
+
+    def test_check_past_history_projection(self):
+        db_access = MagicMock()
+        db_access.query_db_find.return_value = iter(self.documents)
+
+        past_data, new_date_range, maximum_key = check_past_history(
+            db_access=db_access,
+            date_range=[self.start_dt, self.start_dt + timedelta(days=5)],
+            window_param={"period_size": 7, "step_size": 1},
+            categories=["all_active"],
+        )
+
+        projection = db_access.query_db_find.call_args.args[2]
+        self.assertEqual(projection, {"all_active": 1, "date": 1, "_id": 0})
+        self.assertEqual(maximum_key, 2)
+        self.assertEqual(
+            new_date_range,
+            [self.start_dt + timedelta(days=2), self.start_dt + timedelta(days=5)],
+        )
+        self.assertEqual(past_data["all_active"]["1"], {"user2", "user3"})
+        self.assertNotIn("all_lurker", past_data)
+        self.assertEqual(
+            past_data["first_end_date"],
+            (self.start_dt - timedelta(days=7)).isoformat(),
+        )
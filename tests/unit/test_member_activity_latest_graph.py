@@ -0,0 +1,72 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import networkx as nx
+from tc_analyzer_lib.algorithms.compute_member_activity import compute_member_activity
+
+MODULE = "tc_analyzer_lib.algorithms.compute_member_activity"
+
+
+class TestMemberActivityLatestGraph(unittest.TestCase):
+    def setUp(self) -> None:
+        self.graphs: list[nx.DiGraph] = []
+
+        def assess_engagement(**kwargs):
+            graph = None
+            if kwargs.get("build_graph", True):
+                graph = nx.DiGraph()
+                graph.add_nodes_from([0, 1])
+            self.graphs.append(graph)
+            return graph, kwargs["activity_dict"]
+
+        past_utils = MagicMock()
+        past_utils.return_value.update_joined_accounts.return_value = ({}, {})
+
+        patches = [
+            patch(f"{MODULE}.DB_access"),
+            patch(f"{MODULE}.MemberActivityPastUtils", past_utils),
+            patch(f"{MODULE}.get_users_past_window", return_value=["user1", "user2"]),
+            patch(f"{MODULE}.get_joined_accounts", return_value=[]),
+            patch(f"{MODULE}.assess_engagement", side_effect=assess_engagement),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def _compute(self, latest_graph_only: bool):
+        self.graphs.clear()
+        return compute_member_activity(
+            platform_id="1234",
+            resources=["111"],
+            resource_identifier="channel_id",
+            acc_names=["user1", "user2"],
+            date_range=[self.start_date, self.start_date + timedelta(days=9)],
+            analyzer_config=MagicMock(),
+            window_param={"period_size": 7, "step_size": 1},
+            act_param={},
+            load_past_data=False,
+            latest_graph_only=latest_graph_only,
+        )
+
+    def test_all_graphs(self):
+        network_dict, _ = self._compute(latest_graph_only=False)
+
+        self.assertEqual(len(self.graphs), 4)
+        self.assertEqual(len(network_dict), 4)
+
+    def test_latest_graph_only(self):
+        network_dict, _ = self._compute(latest_graph_only=True)
+
+        # all the windows were computed, but just the latest graph was built
+        self.assertEqual(len(self.graphs), 4)
+        self.assertEqual(self.graphs[:-1], [None, None, None])
+        self.assertEqual(
+            network_dict, {self.start_date + timedelta(days=9): self.graphs[-1]}
+        )
+        self.assertEqual(
+            nx.get_node_attributes(self.graphs[-1], "acc_name"),
+            {0: "user1", 1: "user2"},
+        )
@@ -1,6 +1,7 @@
 from datetime import datetime, timedelta
 
 from tc_analyzer_lib.algorithms.utils.member_activity_history_utils import (
+    JoinedAccountsIndex,
     MemberActivityPastUtils,
 )
 
@@ -125,3 +126,53 @@ def test_multiple_joined():
 
     # len would show 1 more
     assert len(all_joined_day.keys()) - 1 == (end_dt - start_dt).days + starting_key
+
+
+def _users_past_days_nested_loop(all_joined_day, window_d):
+    """the reference of the previous nested loop implementation"""
+    all_joined = {}
+    loop_max = max(int(key) for key in all_joined_day.keys()) + 1
+    for day_idx in range(loop_max):
+        look_past = max(day_idx - window_d, 0)
+        all_joined[str(look_past + 1)] = set()
+        for idx in range(look_past, day_idx + 1):
+            all_joined[str(look_past + 1)] |= all_joined_day[str(idx)]
+
+    return all_joined
+
+
+def test_users_past_days_rolling_window():
+    member_activitiy_utils = MemberActivityPastUtils(db_access=None)
+
+    all_joined_day = {
+        str(idx): set([f"user{idx % 5}", f"user{idx % 3}"]) if idx % 4 else set()
+        for idx in range(30)
+    }
+
+    for window_d in [0, 1, 7, 29, 40]:
+        all_joined = member_activitiy_utils.get_users_past_days(
+            all_joined_day, window_d
+        )
+        expected = _users_past_days_nested_loop(all_joined_day, window_d)
+        assert all_joined == expected
+        assert list(all_joined.keys()) == list(expected.keys())
+
+
+def test_joined_accounts_index():
+    start_dt = datetime(2022, 1, 1)
+    joined_acc = [
+        {"joined_at": (start_dt + timedelta(days=3, hours=5)), "id": "000000000"},
+        {"joined_at": (start_dt + timedelta(days=1)), "id": "000000001"},
+        {"joined_at": (start_dt + timedelta(days=3, hours=1)), "id": "000000002"},
+    ]
+    joined_index = JoinedAccountsIndex(joined_acc)
+
+    assert joined_index.get_accounts(start_dt.date()) == []
+    assert joined_index.get_accounts((start_dt + timedelta(days=1)).date()) == [
+        "000000001"
+    ]
+    assert joined_index.get_accounts((start_dt + timedelta(days=3)).date()) == [
+        "000000000",
+        "000000002",
+    ]
+    assert JoinedAccountsIndex([]).get_accounts(start_dt.date()) == []
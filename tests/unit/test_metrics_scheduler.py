@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import time
+from unittest import IsolatedAsyncioTestCase, TestCase
+
+from tc_analyzer_lib.metrics.utils import MetricsScheduler
+from tc_analyzer_lib.utils.instrumentation import RunInstrumentation
+
+
+class TestMetricsScheduler(TestCase):
+    def test_concurrent_run(self):
+        scheduler = MetricsScheduler(max_workers=3)
+        barrier = threading.Barrier(3, timeout=5)
+        computed = []
+
+        def compute(name: str):
+            def metric():
+                # would raise if the metrics were not run at the same time
+                barrier.wait()
+                computed.append(name)
+
+            return metric
+
+        scheduler.run({name: compute(name) for name in ["m1", "m2", "m3"]})
+        self.assertCountEqual(computed, ["m1", "m2", "m3"])
+
+    def test_isolated_failure_and_timeout(self):
+        scheduler = MetricsScheduler(max_workers=3, metric_timeout=0.1)
+        computed = []
+
+        def failing():
+            raise ValueError("some error")
+
+        def slow():
+            time.sleep(1)
+            computed.append("slow")
+
+        def fast():
+            computed.append("fast")
+
+        instrumentation = RunInstrumentation(platform_id="1234", run_type="test")
+        start = time.perf_counter()
+        with instrumentation.activate():
+            with self.assertLogs(level="ERROR") as logs:
+                scheduler.run({"failing": failing, "slow": slow, "fast": fast})
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(computed, ["fast"])
+        self.assertTrue(any("some error" in log for log in logs.output))
+        self.assertTrue(any("Timeout in computing slow" in log for log in logs.output))
+        self.assertIn("neo4j_metrics.fast", instrumentation.report()["stages"])
+
+    def test_on_finished_after_abandoned_metric(self):
+        scheduler = MetricsScheduler(max_workers=2, metric_timeout=0.1)
+        computed = []
+        finished = threading.Event()
+
+        def slow():
+            time.sleep(0.5)
+            computed.append("slow")
+
+        def on_finished():
+            computed.append("on_finished")
+            finished.set()
+
+        with self.assertLogs(level="ERROR"):
+            scheduler.run({"slow": slow}, on_finished=on_finished)
+
+        # the abandoned metric is still running
+        self.assertEqual(computed, [])
+        self.assertTrue(finished.wait(timeout=5))
+        self.assertEqual(computed, ["slow", "on_finished"])
+
+    def test_on_finished_without_timeout(self):
+        scheduler = MetricsScheduler(max_workers=2)
+        computed = []
+
+        scheduler.run(
+            {"m1": lambda: computed.append("m1")},
+            on_finished=lambda: computed.append("on_finished"),
+        )
+
+        self.assertEqual(computed, ["m1", "on_finished"])
+
+    def test_wrong_max_workers(self):
+        with self.assertRaises(ValueError):
+            MetricsScheduler(max_workers=0)
+
+
+class TestMetricsSchedulerAsync(IsolatedAsyncioTestCase):
+    async def test_bounded_concurrency_and_timeout(self):
+        scheduler = MetricsScheduler(max_workers=2, metric_timeout=0.2)
+        running = 0
+        max_running = 0
+        computed = []
+
+        def compute(name: str, duration: float):
+            async def metric():
+                nonlocal running, max_running
+                running += 1
+                max_running = max(max_running, running)
+                try:
+                    await asyncio.sleep(duration)
+                    computed.append(name)
+                finally:
+                    running -= 1
+
+            return metric
+
+        with self.assertLogs(level="ERROR") as logs:
+            await scheduler.run_async(
+                {
+                    "m1": compute("m1", 0.01),
+                    "m2": compute("m2", 0.01),
+                    "m3": compute("m3", 0.01),
+                    "slow": compute("slow", 5),
+                }
+            )
+
+        self.assertEqual(max_running, 2)
+        self.assertCountEqual(computed, ["m1", "m2", "m3"])
+        self.assertTrue(any("Timeout in computing slow" in log for log in logs.output))
@@ -0,0 +1,158 @@
+import asyncio
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+import networkx
+
+import pandas as pd
+from tc_analyzer_lib.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from tc_analyzer_lib.schemas import GraphSchema
+from tc_neo4j_lib.neo4j_ops import Query
+
+
+class FakeAsyncNeo4jOps:
+    def __init__(self) -> None:
+        self.transactions: list[list[str]] = []
+        self.cypher_queries: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        # the count of relationships remained to be deleted
+        self.relations_count = 0
+
+    async def run_cypher(self, query, params=None):
+        self.cypher_queries.append(query)
+        deleted_count = min(self.relations_count, params["batch_size"])
+        self.relations_count -= deleted_count
+        return pd.DataFrame({"deleted_count": [deleted_count]})
+
+    async def run_queries_in_transaction(self, queries, message=""):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        self.transactions.append([query.query for query in queries])
+
+
+class TestRunOperationsTransactionAsync(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.fake_ops = FakeAsyncNeo4jOps()
+        with patch("tc_analyzer_lib.DB_operations.mongo_neo4j_ops.Neo4jOps"):
+            self.db = MongoNeo4jDB(testing=True)
+
+    async def _run(
+        self,
+        remove_memberactivities: bool,
+        final_queries: list[Query] | None = None,
+    ):
+        node_queries = [Query(f"node{i}", {}) for i in range(5)]
+        rel_queries = [Query(f"rel{i}", {}) for i in range(7)]
+
+        with patch(
+            "tc_analyzer_lib.DB_operations.mongo_neo4j_ops.AsyncNeo4jOps.get_instance",
+            return_value=self.fake_ops,
+        ):
+            await self.db.run_operations_transaction_async(
+                platform_id="1234",
+                node_queries=node_queries,
+                rel_queries=rel_queries,
+                remove_memberactivities=remove_memberactivities,
+                graph_schema=GraphSchema(platform="discord"),
+                chunk_size=2,
+                max_concurrency=2,
+                final_queries=final_queries,
+            )
+
+    async def test_chunks_order(self):
+        await self._run(remove_memberactivities=True)
+
+        self.assertEqual(len(self.fake_ops.cypher_queries), 1)
+        self.assertIn("DETACH DELETE r", self.fake_ops.cypher_queries[0])
+
+        transactions = self.fake_ops.transactions
+        # the latest graph date of platform removed after the relations
+        self.assertIn("REMOVE g.latestGraphDate", transactions[0][0])
+        self.assertEqual(
+            transactions[1:4], [["node0", "node1"], ["node2", "node3"], ["node4"]]
+        )
+        self.assertCountEqual(
+            transactions[4:],
+            [["rel0", "rel1"], ["rel2", "rel3"], ["rel4", "rel5"], ["rel6"]],
+        )
+        self.assertEqual(self.fake_ops.max_running, 2)
+
+    async def test_no_deletion(self):
+        await self._run(remove_memberactivities=False)
+
+        self.assertEqual(self.fake_ops.cypher_queries, [])
+        transactions = self.fake_ops.transactions
+        self.assertEqual(len(transactions), 7)
+        self.assertEqual(transactions[0], ["node0", "node1"])
+
+    async def test_final_queries_after_relationships(self):
+        await self._run(
+            remove_memberactivities=False,
+            final_queries=[Query("latest_date", {})],
+        )
+
+        transactions = self.fake_ops.transactions
+        self.assertEqual(len(transactions), 8)
+        self.assertEqual(transactions[-1], ["latest_date"])
+
+
+class TestRemovePlatformRelationsAsync(IsolatedAsyncioTestCase):
+    async def test_chunked_deletion(self):
+        fake_ops = FakeAsyncNeo4jOps()
+        fake_ops.relations_count = 25
+        with patch("tc_analyzer_lib.DB_operations.mongo_neo4j_ops.Neo4jOps"):
+            db = MongoNeo4jDB(testing=True)
+
+        with patch(
+            "tc_analyzer_lib.DB_operations.mongo_neo4j_ops.AsyncNeo4jOps.get_instance",
+            return_value=fake_ops,
+        ):
+            deleted_count = await db.remove_platform_relations_async(
+                platform_id="1234",
+                graph_schema=GraphSchema(platform="discord"),
+                batch_size=10,
+            )
+
+        self.assertEqual(deleted_count, 25)
+        # two full chunks and the last partial one
+        self.assertEqual(len(fake_ops.cypher_queries), 3)
+        self.assertIn("LIMIT $batch_size", fake_ops.cypher_queries[0])
+
+
+class TestStoreAnalyticsDataRemoveGraph(TestCase):
+    def test_relations_removed_before_inserts(self):
+        with patch("tc_analyzer_lib.DB_operations.mongo_neo4j_ops.Neo4jOps"):
+            db = MongoNeo4jDB(testing=False)
+        db.mongoOps = MagicMock()
+
+        calls: list[str] = []
+        driver = db.neo4j_ops.neo4j_driver
+        driver.execute_query.side_effect = lambda query, **kwargs: (
+            calls.append("delete" if "DELETE" in query else "remove_dates")
+            or ([{"deleted_count": 0}], None, None)
+        )
+        db.neo4j_ops.run_queries_in_batch.side_effect = lambda *args, **kwargs: (
+            calls.append("insert")
+        )
+
+        graph = networkx.DiGraph()
+        graph.add_node(0, acc_name="a")
+        db.store_analytics_data(
+            analytics_data={
+                "heatmaps": [],
+                "memberactivities": ([], {datetime(2024, 1, 1): graph}),
+            },
+            platform_id="1234",
+            graph_schema=GraphSchema(platform="discord"),
+            remove_memberactivities=True,
+        )
+
+        self.assertEqual(calls, ["delete", "remove_dates", "insert"])
+        inserted_queries = db.neo4j_ops.run_queries_in_batch.call_args.args[0]
+        self.assertNotIn("DELETE", inserted_queries[0].query)
+        # the latest graph date is kept on platform node
+        self.assertIn("g.latestGraphDate", inserted_queries[-1].query)
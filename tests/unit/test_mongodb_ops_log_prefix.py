@@ -0,0 +1,27 @@
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from tc_analyzer_lib.DB_operations.mongodb_interaction import MongoDBOps
+
+
+class TestMongoDBOpsLogPrefix(TestCase):
+    def test_prefix_per_platform(self):
+        mongo_ops = MongoDBOps()
+        session = MagicMock()
+
+        with self.assertLogs(level="INFO") as logs:
+            for platform_id in ["1111", "2222"]:
+                mongo_ops._session_custom_transaction(
+                    session,
+                    platform_id,
+                    delete_heatmaps=True,
+                    delete_member_acitivities=False,
+                    memberactiivties_list=[],
+                    heatmaps_list=[{"user": "a"}],
+                )
+
+        heatmaps_logs = [log for log in logs.output if "heatmaps" in log.lower()]
+        self.assertTrue(any("PLATFORMID: 1111:" in log for log in heatmaps_logs))
+        self.assertTrue(any("PLATFORMID: 2222:" in log for log in heatmaps_logs))
+        # nothing kept on the shared instance
+        self.assertFalse(hasattr(mongo_ops, "guild_msg"))
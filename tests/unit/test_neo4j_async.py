@@ -0,0 +1,44 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, patch
+
+from tc_analyzer_lib.utils.neo4j_async import AsyncNeo4jOps
+
+
+class TestAsyncNeo4jOpsUse(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        AsyncNeo4jOps._AsyncNeo4jOps__instance = None
+        with patch(
+            "tc_analyzer_lib.utils.neo4j_async.load_neo4j_credentials",
+            return_value={"url": "bolt://localhost", "auth": None, "db_name": "neo4j"},
+        ):
+            self.neo4j_ops = AsyncNeo4jOps.get_instance()
+
+    def tearDown(self) -> None:
+        AsyncNeo4jOps._AsyncNeo4jOps__instance = None
+
+    async def test_closed_after_last_user(self):
+        driver = AsyncMock()
+        self.neo4j_ops._driver = driver
+        self.neo4j_ops._loop = asyncio.get_running_loop()
+
+        async with self.neo4j_ops.use():
+            async with self.neo4j_ops.use():
+                pass
+            # another run is still using the driver
+            driver.close.assert_not_awaited()
+
+        driver.close.assert_awaited_once()
+        self.assertIsNone(self.neo4j_ops._driver)
+
+    async def test_closed_on_failure(self):
+        driver = AsyncMock()
+        self.neo4j_ops._driver = driver
+        self.neo4j_ops._loop = asyncio.get_running_loop()
+
+        with self.assertRaises(ValueError):
+            async with self.neo4j_ops.use():
+                raise ValueError("some error")
+
+        driver.close.assert_awaited_once()
+        self.assertEqual(self.neo4j_ops._users, 0)
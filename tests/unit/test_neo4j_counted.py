@@ -0,0 +1,65 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+from tc_analyzer_lib.algorithms.neo4j_analysis.louvain import Louvain
+from tc_analyzer_lib.schemas import GraphSchema
+from tc_analyzer_lib.utils.instrumentation import RunInstrumentation
+from tc_analyzer_lib.utils.neo4j_counted import CountedNeo4jOps
+from tc_neo4j_lib.neo4j_ops import Query
+
+
+class TestCountedNeo4jOps(TestCase):
+    def setUp(self) -> None:
+        self.neo4j_ops = MagicMock()
+        self.instrumentation = RunInstrumentation("1234", run_type="run_once")
+
+    def test_nested_gds_calls(self):
+        counted_ops = CountedNeo4jOps(self.neo4j_ops)
+
+        with self.instrumentation.activate():
+            counted_ops.gds.run_cypher("RETURN 1")
+            counted_ops.gds.degree.stream("graph")
+            counted_ops.neo4j_driver.execute_query("RETURN 1")
+            counted_ops.run_queries_in_batch([MagicMock(), MagicMock()])
+
+        self.assertEqual(self.instrumentation.counters["neo4j.queries"], 5)
+        self.neo4j_ops.gds.degree.stream.assert_called_once_with("graph")
+
+    def test_louvain_run(self):
+        # the latest graph date kept on platform node
+        self.neo4j_ops.gds.run_cypher.return_value = pd.DataFrame(
+            {"dates": [1704067200000.0]}
+        )
+        self.neo4j_ops.neo4j_driver.execute_query.return_value = ([], None, [])
+        with patch(
+            "tc_analyzer_lib.utils.neo4j_counted.Neo4jOps.get_instance",
+            return_value=self.neo4j_ops,
+        ):
+            louvain = Louvain("1234", GraphSchema(platform="discord"))
+
+        with self.instrumentation.activate():
+            louvain.compute(from_start=False)
+
+        # getting the dates, projecting, and dropping the projection
+        self.assertEqual(self.neo4j_ops.gds.run_cypher.call_count, 3)
+        # computing in a managed transaction
+        self.neo4j_ops.neo4j_driver.execute_query.assert_called_once()
+        self.assertEqual(self.instrumentation.counters["neo4j.queries"], 4)
+
+    def test_run_queries_in_transaction(self):
+        counted_ops = CountedNeo4jOps(self.neo4j_ops)
+        session = (
+            self.neo4j_ops.neo4j_driver.session.return_value.__enter__.return_value
+        )
+        tx = MagicMock()
+        session.execute_write.side_effect = lambda function: function(tx)
+
+        with self.instrumentation.activate():
+            counted_ops.run_queries_in_transaction(
+                [Query("RETURN 1", {}), Query("RETURN 2", {})]
+            )
+
+        session.execute_write.assert_called_once()
+        self.assertEqual(tx.run.call_count, 2)
+        self.assertEqual(self.instrumentation.counters["neo4j.queries"], 2)
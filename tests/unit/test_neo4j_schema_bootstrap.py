@@ -0,0 +1,99 @@
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from neo4j.exceptions import ClientError
+from tc_analyzer_lib.DB_operations.neo4j_schema import Neo4jSchemaBootstrap
+from tc_analyzer_lib.schemas import GraphSchema
+
+
+class TestNeo4jSchemaBootstrap(TestCase):
+    def setUp(self) -> None:
+        Neo4jSchemaBootstrap._bootstrapped = set()
+        with patch("tc_analyzer_lib.DB_operations.neo4j_schema.Neo4jOps"):
+            self.bootstrap = Neo4jSchemaBootstrap(GraphSchema(platform="discord"))
+        self.driver = MagicMock()
+        self.bootstrap.neo4j_ops = MagicMock(neo4j_driver=self.driver)
+
+    def test_schema_queries(self):
+        queries = [
+            " ".join(query.query.split())
+            for query in self.bootstrap.make_schema_queries()
+        ]
+
+        self.assertEqual(
+            queries,
+            [
+                "CREATE CONSTRAINT discordmember_id_unique IF NOT EXISTS "
+                "FOR (n:DiscordMember) REQUIRE n.id IS UNIQUE",
+                "CREATE CONSTRAINT discordplatform_id_unique IF NOT EXISTS "
+                "FOR (n:DiscordPlatform) REQUIRE n.id IS UNIQUE",
+                "CREATE INDEX interacted_with_platformid_date IF NOT EXISTS "
+                "FOR ()-[r:INTERACTED_WITH]-() ON (r.platformId, r.date)",
+                "CREATE INDEX interacted_in_date IF NOT EXISTS "
+                "FOR ()-[r:INTERACTED_IN]-() ON (r.date)",
+                "CREATE INDEX have_metrics_date IF NOT EXISTS "
+                "FOR ()-[r:HAVE_METRICS]-() ON (r.date)",
+            ],
+        )
+
+    def test_bootstrap_once(self):
+        self.bootstrap.bootstrap()
+        self.bootstrap.bootstrap()
+
+        self.assertEqual(self.driver.execute_query.call_count, 5)
+
+    def test_bootstrap_failing_query(self):
+        self.driver.execute_query.side_effect = [ClientError("duplicate ids")] + [
+            MagicMock()
+        ] * 5
+
+        self.bootstrap.bootstrap()
+
+        # the rest of schema is still created
+        self.assertEqual(self.driver.execute_query.call_count, 5)
+
+        # just the failed query is retried
+        self.bootstrap.bootstrap()
+        self.assertEqual(self.driver.execute_query.call_count, 6)
+        self.assertIn(
+            "discordmember_id_unique", self.driver.execute_query.call_args.args[0]
+        )
+        self.bootstrap.bootstrap()
+        self.assertEqual(self.driver.execute_query.call_count, 6)
+
+    def test_report_label_scans(self):
+        def explain(query, parameters_=None):
+            summary = MagicMock()
+            if "INTERACTED_IN" in query:
+                summary.plan = {
+                    "operatorType": "ProduceResults@neo4j",
+                    "children": [
+                        {
+                            "operatorType": "Filter@neo4j",
+                            "children": [
+                                {
+                                    "operatorType": "DirectedRelationshipTypeScan@neo4j",
+                                    "children": [],
+                                }
+                            ],
+                        }
+                    ],
+                }
+            else:
+                summary.plan = {
+                    "operatorType": "ProduceResults@neo4j",
+                    "children": [
+                        {"operatorType": "NodeIndexSeek@neo4j", "children": []}
+                    ],
+                }
+            return [], summary, []
+
+        self.driver.execute_query.side_effect = explain
+
+        report = self.bootstrap.report_label_scans()
+
+        self.assertEqual(
+            report, {"interacted_in_by_date": ["DirectedRelationshipTypeScan"]}
+        )
+        for call in self.driver.execute_query.call_args_list:
+            self.assertTrue(call.args[0].startswith("EXPLAIN "))
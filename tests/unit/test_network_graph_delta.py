@@ -0,0 +1,125 @@
+from datetime import datetime
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import MagicMock, patch
+
+import networkx
+import pandas as pd
+from tc_analyzer_lib.DB_operations.mongo_neo4j_ops import MongoNeo4jDB
+from tc_analyzer_lib.DB_operations.network_graph import NetworkGraph
+from tc_analyzer_lib.schemas import GraphSchema
+
+
+def create_graph() -> networkx.DiGraph:
+    graph = networkx.DiGraph()
+    graph.add_node(0, acc_name="a")
+    graph.add_node(1, acc_name="b")
+    graph.add_node(2, acc_name="c")
+    graph.add_edge(0, 1, weight=2)
+    graph.add_edge(1, 2, weight=1)
+    return graph
+
+
+class TestNetworkGraphDelta(TestCase):
+    def setUp(self) -> None:
+        self.network_graph = NetworkGraph(GraphSchema(platform="discord"), "1234")
+        self.date = datetime(2024, 1, 1)
+        self.date_timestamp = int(self.network_graph.get_timestamp(self.date))
+
+    def test_nothing_persisted(self):
+        node_queries, rel_queries = self.network_graph.make_neo4j_delta_queries(
+            {self.date: create_graph()},
+            persisted_members=set(),
+            persisted_edges=set(),
+        )
+
+        self.assertEqual(len(node_queries), 1)
+        self.assertIn("UNWIND $accounts", node_queries[0].query)
+        self.assertEqual(node_queries[0].parameters["accounts"], ["a", "b", "c"])
+
+        self.assertEqual(len(rel_queries), 1)
+        self.assertEqual(rel_queries[0].parameters["date"], self.date_timestamp)
+        self.assertEqual(
+            rel_queries[0].parameters["edges"],
+            [
+                {"source": "a", "target": "b", "weight": 2},
+                {"source": "b", "target": "c", "weight": 1},
+            ],
+        )
+
+    def test_just_the_changes(self):
+        node_queries, rel_queries = self.network_graph.make_neo4j_delta_queries(
+            {self.date: create_graph()},
+            persisted_members={"a", "b"},
+            persisted_edges={("a", "b", self.date_timestamp, 2)},
+        )
+
+        self.assertEqual(node_queries[0].parameters["accounts"], ["c"])
+        self.assertEqual(
+            rel_queries[0].parameters["edges"],
+            [{"source": "b", "target": "c", "weight": 1}],
+        )
+
+    def test_no_changes(self):
+        node_queries, rel_queries = self.network_graph.make_neo4j_delta_queries(
+            {self.date: create_graph()},
+            persisted_members={"a", "b", "c"},
+            persisted_edges={
+                ("a", "b", self.date_timestamp, 2),
+                ("b", "c", self.date_timestamp, 1),
+            },
+        )
+
+        self.assertEqual(node_queries, [])
+        self.assertEqual(rel_queries, [])
+
+    def test_batches(self):
+        node_queries, rel_queries = self.network_graph.make_neo4j_delta_queries(
+            {self.date: create_graph()},
+            persisted_members=set(),
+            persisted_edges=set(),
+            batch_size=2,
+        )
+
+        self.assertEqual(
+            [query.parameters["accounts"] for query in node_queries],
+            [["a", "b"], ["c"]],
+        )
+        self.assertEqual(len(rel_queries), 1)
+
+    def test_latest_graph_date_query(self):
+        query = self.network_graph.make_graph_dates_query(
+            [datetime(2023, 12, 31), self.date]
+        )
+
+        self.assertIn("SET g.latestGraphDate = $latest_date", query.query)
+        self.assertNotIn("graphDates", query.query)
+        self.assertEqual(query.parameters["latest_date"], self.date_timestamp)
+
+
+class TestDeltaGraphQueriesAsync(IsolatedAsyncioTestCase):
+    async def test_remove_graph_skips_edges_lookup(self):
+        with patch("tc_analyzer_lib.DB_operations.mongo_neo4j_ops.Neo4jOps"):
+            db = MongoNeo4jDB(testing=True)
+        network_graph = NetworkGraph(GraphSchema(platform="discord"), "1234")
+
+        fake_ops = MagicMock()
+
+        async def run_cypher(query, params=None):
+            return pd.DataFrame({"id": ["a"]})
+
+        fake_ops.run_cypher = MagicMock(side_effect=run_cypher)
+
+        with patch(
+            "tc_analyzer_lib.DB_operations.mongo_neo4j_ops.AsyncNeo4jOps.get_instance",
+            return_value=fake_ops,
+        ):
+            node_queries, rel_queries = await db._make_delta_graph_queries_async(
+                network_graph,
+                {datetime(2024, 1, 1): create_graph()},
+                remove_graph=True,
+            )
+
+        # just the members were read
+        fake_ops.run_cypher.assert_called_once()
+        self.assertEqual(node_queries[0].parameters["accounts"], ["b", "c"])
+        self.assertEqual(len(rel_queries[0].parameters["edges"]), 2)
@@ -0,0 +1,113 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from pika.exceptions import StreamLostError
+from tc_analyzer_lib.utils.rabbitmq import RabbitMQAccess, RabbitMQPublisher
+
+
+class TestRabbitMQPublisher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.access = MagicMock()
+        self.access.lock = threading.RLock()
+        self.client = self.access.get_client.return_value
+        self.publisher = RabbitMQPublisher(self.access, batch_size=3)
+
+    def _published_uuids(self) -> list[str]:
+        return [
+            call.kwargs["content"]["uuid"]
+            for call in self.client.publish.call_args_list
+        ]
+
+    def test_buffered_until_flush(self):
+        self.publisher.publish("queue", "event", {"uuid": "saga0"})
+        self.publisher.publish("queue", "event", {"uuid": "saga1"})
+        self.client.publish.assert_not_called()
+
+        self.publisher.flush()
+        self.assertEqual(self._published_uuids(), ["saga0", "saga1"])
+        self.client.connection.process_data_events.assert_called_once_with(time_limit=0)
+
+        # nothing remained to publish
+        self.publisher.flush()
+        self.assertEqual(self.client.publish.call_count, 2)
+
+    def test_auto_flush_in_batches(self):
+        for idx in range(7):
+            self.publisher.publish("queue", "event", {"uuid": f"saga{idx}"})
+
+        # two full batches were flushed
+        self.assertEqual(len(self._published_uuids()), 6)
+        self.assertEqual(self.client.connection.process_data_events.call_count, 2)
+        self.assertEqual(self.access.ensure_connection.call_count, 2)
+
+        self.publisher.close()
+        self.assertEqual(self._published_uuids(), [f"saga{idx}" for idx in range(7)])
+        self.access.close_connection.assert_called_once()
+
+    def test_reconnect_on_lost_connection(self):
+        calls = {"count": 0}
+
+        def publish(**kwargs):
+            calls["count"] += 1
+            # losing the connection on the second message
+            if calls["count"] == 2:
+                raise StreamLostError("connection lost")
+
+        self.client.publish.side_effect = publish
+        for idx in range(3):
+            self.publisher.publish("queue", "event", {"uuid": f"saga{idx}"})
+
+        # the first message wasn't sent again
+        self.assertEqual(self._published_uuids(), ["saga0", "saga1", "saga1", "saga2"])
+        self.assertEqual(self.access.ensure_connection.call_count, 2)
+
+    def test_raise_on_repeated_failure(self):
+        self.client.publish.side_effect = StreamLostError("connection lost")
+        self.publisher.publish("queue", "event", {"uuid": "saga0"})
+
+        with self.assertRaises(StreamLostError):
+            self.publisher.flush()
+        # kept to be published later
+        self.assertEqual(len(self.publisher._buffer), 1)
+
+    def test_retry_on_builtin_connection_error(self):
+        # i.e. raised by `ensure_connection` when couldn't reconnect
+        self.access.ensure_connection.side_effect = [
+            ConnectionError("couldn't reconnect"),
+            None,
+        ]
+        self.publisher.publish("queue", "event", {"uuid": "saga0"})
+
+        self.publisher.flush()
+        self.assertEqual(self._published_uuids(), ["saga0"])
+
+
+class TestRabbitMQAccess(unittest.TestCase):
+    creds = {
+        "broker_url": "localhost",
+        "port": 5672,
+        "username": "user",
+        "password": "pass",
+    }
+
+    @patch("tc_analyzer_lib.utils.rabbitmq.pika.BlockingConnection")
+    @patch("tc_analyzer_lib.utils.rabbitmq.get_rabbit_mq_credentials")
+    def test_publish_only_connection(self, mock_creds, mock_connection):
+        mock_creds.return_value = self.creds
+        access = RabbitMQAccess.get_instance(skip_singleton=True)
+
+        channel = mock_connection.return_value.channel.return_value
+        self.assertIs(access.get_client().channel, channel)
+        channel.queue_declare.assert_called_once()
+        # no consumer registered on the analyzer queue
+        channel.basic_consume.assert_not_called()
+
+    @patch("tc_analyzer_lib.utils.rabbitmq.pika.BlockingConnection")
+    @patch("tc_analyzer_lib.utils.rabbitmq.get_rabbit_mq_credentials")
+    def test_failed_connection_raised(self, mock_creds, mock_connection):
+        mock_creds.return_value = self.creds
+        mock_connection.side_effect = StreamLostError("broker down")
+
+        with self.assertRaises(StreamLostError):
+            RabbitMQAccess.get_instance(skip_singleton=True)
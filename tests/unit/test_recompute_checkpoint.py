@@ -0,0 +1,125 @@
+from datetime import datetime, timedelta, timezone
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from tc_analyzer_lib.metrics.utils import RecomputeCheckpoint
+from tc_analyzer_lib.tc_analyzer import TCAnalyzer
+
+
+class TestRecomputeCheckpoint(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        with patch("tc_analyzer_lib.metrics.utils.recompute_checkpoint.MongoSingleton"):
+            self.checkpoint = RecomputeCheckpoint("1234")
+        self.checkpoint.collection = MagicMock()
+        self.checkpoint.collection.find_one = AsyncMock()
+        self.checkpoint.collection.update_one = AsyncMock()
+
+    async def test_load_no_checkpoint(self):
+        self.checkpoint.collection.find_one.return_value = None
+        self.assertIsNone(await self.checkpoint.load())
+
+    async def test_load_dates_utc(self):
+        self.checkpoint.collection.find_one.return_value = {
+            "phase": "memberactivities",
+            "heatmaps_until": datetime(2024, 1, 10),
+            "memberactivities_until": None,
+        }
+        checkpoint = await self.checkpoint.load()
+
+        self.assertEqual(checkpoint["phase"], "memberactivities")
+        self.assertEqual(
+            checkpoint["heatmaps_until"], datetime(2024, 1, 10, tzinfo=timezone.utc)
+        )
+        self.assertIsNone(checkpoint["memberactivities_until"])
+
+    async def test_update_wrong_phase(self):
+        with self.assertRaises(ValueError):
+            await self.checkpoint.update(phase="heatmap")
+        self.checkpoint.collection.update_one.assert_not_awaited()
+
+
+class TestCheckpointedMemberActivities(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.yesterday = datetime.now(tz=timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        ) - timedelta(days=1)
+
+        self.analyzer = TCAnalyzer.__new__(TCAnalyzer)
+        self.analyzer.period = self.yesterday - timedelta(days=25)
+        self.analyzer.window = {"period_size": 7, "step_size": 1}
+        self.analyzer.checkpoint_days = 10
+        self.analyzer.offload_blocking = False
+
+        self.networkx_data = {self.yesterday: MagicMock()}
+        self.analyzer._analyze_memberactivities = MagicMock(
+            return_value=([{"date": self.yesterday}], self.networkx_data)
+        )
+        self.analyzer._store_memberactivities = AsyncMock()
+
+        self.memberactivity_analysis = MagicMock()
+        self.memberactivity_analysis.get_max_continue_days.return_value = 34
+        self.checkpoint = MagicMock()
+        self.checkpoint.update = AsyncMock()
+
+    async def test_from_start(self):
+        await self.analyzer._recompute_memberactivities_checkpointed(
+            self.memberactivity_analysis, self.checkpoint, memberactivities_until=None
+        )
+
+        analyze_calls = self.analyzer._analyze_memberactivities.call_args_list
+        self.assertEqual(len(analyze_calls), 3)
+        # just the first chunk is computed from start
+        self.assertEqual([call.args[1] for call in analyze_calls], [True, False, False])
+        self.assertEqual(
+            [call.kwargs["until"] for call in analyze_calls],
+            [
+                self.analyzer.period + timedelta(days=10),
+                self.analyzer.period + timedelta(days=20),
+                self.yesterday,
+            ],
+        )
+
+        store_calls = self.analyzer._store_memberactivities.call_args_list
+        self.assertEqual(
+            [call.kwargs["remove_memberactivities"] for call in store_calls],
+            [True, False, False],
+        )
+        self.assertEqual(
+            [call.kwargs["remove_graph"] for call in store_calls],
+            [False, False, True],
+        )
+        # the graph is written just for the last chunk
+        self.assertIsNone(
+            store_calls[0].kwargs["analytics_data"]["memberactivities"][1]
+        )
+        self.assertEqual(
+            store_calls[-1].kwargs["analytics_data"]["memberactivities"][1],
+            self.networkx_data,
+        )
+        self.checkpoint.update.assert_awaited_with(
+            memberactivities_until=self.yesterday
+        )
+
+    async def test_resume(self):
+        await self.analyzer._recompute_memberactivities_checkpointed(
+            self.memberactivity_analysis,
+            self.checkpoint,
+            memberactivities_until=self.analyzer.period + timedelta(days=20),
+        )
+
+        self.analyzer._analyze_memberactivities.assert_called_once()
+        self.assertFalse(self.analyzer._analyze_memberactivities.call_args.args[1])
+        store_kwargs = self.analyzer._store_memberactivities.call_args.kwargs
+        self.assertFalse(store_kwargs["remove_memberactivities"])
+        self.assertTrue(store_kwargs["remove_graph"])
+
+    async def test_chunk_within_past_data_loaded(self):
+        self.analyzer.checkpoint_days = 100
+        await self.analyzer._recompute_memberactivities_checkpointed(
+            self.memberactivity_analysis, self.checkpoint, memberactivities_until=None
+        )
+
+        self.assertEqual(
+            self.analyzer._analyze_memberactivities.call_args_list[0].kwargs["until"],
+            self.analyzer.period + timedelta(days=25),
+        )
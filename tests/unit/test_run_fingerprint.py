@@ -0,0 +1,178 @@
+from datetime import datetime, timezone
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bson import ObjectId
+from tc_analyzer_lib.metrics.utils import RunFingerprint, RunFingerprintStore
+from tc_analyzer_lib.schemas.platform_configs import DiscordAnalyzerConfig
+
+
+class TestRunFingerprint(TestCase):
+    def setUp(self) -> None:
+        self.action = {"INT_THR": 1, "UW_DEG_THR": 1}
+        self.window = {"period_size": 7, "step_size": 1}
+        self.period = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def test_config_hash_resources_order(self):
+        hash1 = RunFingerprint.compute_config_hash(
+            DiscordAnalyzerConfig(), self.action, self.window, ["1", "2"], self.period
+        )
+        hash2 = RunFingerprint.compute_config_hash(
+            DiscordAnalyzerConfig(), self.action, self.window, ["2", "1"], self.period
+        )
+        self.assertEqual(hash1, hash2)
+
+    def test_config_hash_changed(self):
+        hash1 = RunFingerprint.compute_config_hash(
+            DiscordAnalyzerConfig(), self.action, self.window, ["1", "2"], self.period
+        )
+        hash2 = RunFingerprint.compute_config_hash(
+            DiscordAnalyzerConfig(), self.action, self.window, ["1", "3"], self.period
+        )
+        hash3 = RunFingerprint.compute_config_hash(
+            DiscordAnalyzerConfig(),
+            {**self.action, "INT_THR": 2},
+            self.window,
+            ["1", "2"],
+            self.period,
+        )
+        self.assertNotEqual(hash1, hash2)
+        self.assertNotEqual(hash1, hash3)
+
+    def test_is_unchanged(self):
+        raw_id = ObjectId()
+        previous = RunFingerprint("abc", raw_id, self.period, self.period)
+
+        self.assertTrue(
+            RunFingerprint("abc", raw_id, self.period).is_unchanged(previous)
+        )
+        self.assertFalse(
+            RunFingerprint("abc", ObjectId(), self.period).is_unchanged(previous)
+        )
+        self.assertFalse(
+            RunFingerprint("abd", raw_id, self.period).is_unchanged(previous)
+        )
+
+    def test_is_unchanged_members(self):
+        raw_id = ObjectId()
+        member_id = ObjectId()
+        previous = RunFingerprint(
+            "abc",
+            raw_id,
+            self.period,
+            self.period,
+            members_max_id=member_id,
+            members_updated_at=self.period,
+            members_count=2,
+        )
+
+        self.assertTrue(
+            RunFingerprint(
+                "abc", raw_id, self.period, None, member_id, self.period, 2
+            ).is_unchanged(previous)
+        )
+        # a member was added
+        self.assertFalse(
+            RunFingerprint(
+                "abc", raw_id, self.period, None, ObjectId(), self.period, 3
+            ).is_unchanged(previous)
+        )
+        # a member was updated
+        self.assertFalse(
+            RunFingerprint(
+                "abc", raw_id, self.period, None, member_id, datetime.now(), 2
+            ).is_unchanged(previous)
+        )
+        # a member was removed
+        self.assertFalse(
+            RunFingerprint(
+                "abc", raw_id, self.period, None, member_id, self.period, 1
+            ).is_unchanged(previous)
+        )
+
+    def test_dict_roundtrip(self):
+        fingerprint = RunFingerprint(
+            "abc",
+            ObjectId(),
+            datetime(2024, 1, 2, 10),
+            datetime(2024, 1, 3),
+            members_max_id=ObjectId(),
+            members_updated_at=datetime(2024, 1, 1),
+            members_count=5,
+        )
+        loaded = RunFingerprint.from_dict(fingerprint.to_dict())
+
+        self.assertEqual(loaded.config_hash, "abc")
+        self.assertEqual(loaded.raw_max_id, fingerprint.raw_max_id)
+        self.assertEqual(
+            loaded.last_activity_date, datetime(2024, 1, 2, 10, tzinfo=timezone.utc)
+        )
+        self.assertEqual(
+            loaded.analyzed_until, datetime(2024, 1, 3, tzinfo=timezone.utc)
+        )
+        self.assertEqual(loaded.members_max_id, fingerprint.members_max_id)
+        self.assertEqual(
+            loaded.members_updated_at, datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual(loaded.members_count, 5)
+
+    def test_from_dict_without_members(self):
+        # the fingerprints saved before the members were included
+        loaded = RunFingerprint.from_dict({"config_hash": "abc"})
+
+        self.assertIsNone(loaded.members_max_id)
+        self.assertIsNone(loaded.members_count)
+
+
+class TestRunFingerprintStore(IsolatedAsyncioTestCase):
+    async def test_get_current_no_raw_data(self):
+        with patch("tc_analyzer_lib.metrics.utils.run_fingerprint.MongoSingleton"):
+            store = RunFingerprintStore("1234", resource_identifier="channel_id")
+
+        raw_collection = MagicMock()
+        raw_collection.find_one = AsyncMock(return_value=None)
+        members_collection = MagicMock()
+        members_collection.find_one = AsyncMock(return_value=None)
+        members_collection.count_documents = AsyncMock(return_value=0)
+        store.database = {
+            "rawmemberactivities": raw_collection,
+            "rawmembers": members_collection,
+        }
+
+        fingerprint = await store.get_current("abc", resources=["1", "2"])
+
+        self.assertEqual(fingerprint.config_hash, "abc")
+        self.assertIsNone(fingerprint.raw_max_id)
+        self.assertIsNone(fingerprint.last_activity_date)
+        self.assertEqual(
+            raw_collection.find_one.await_args.args[0],
+            {"metadata.channel_id": {"$in": ["1", "2"]}},
+        )
+        self.assertIsNone(fingerprint.members_max_id)
+        self.assertIsNone(fingerprint.members_updated_at)
+        self.assertEqual(fingerprint.members_count, 0)
+
+    async def test_get_current_members_watermark(self):
+        with patch("tc_analyzer_lib.metrics.utils.run_fingerprint.MongoSingleton"):
+            store = RunFingerprintStore("1234", resource_identifier="channel_id")
+
+        member_id = ObjectId()
+        raw_collection = MagicMock()
+        raw_collection.find_one = AsyncMock(return_value=None)
+        members_collection = MagicMock()
+        members_collection.find_one = AsyncMock(
+            side_effect=[{"_id": member_id}, {"updatedAt": datetime(2024, 1, 1)}]
+        )
+        members_collection.count_documents = AsyncMock(return_value=3)
+        store.database = {
+            "rawmemberactivities": raw_collection,
+            "rawmembers": members_collection,
+        }
+
+        fingerprint = await store.get_current("abc", resources=["1"])
+
+        self.assertEqual(fingerprint.members_max_id, member_id)
+        self.assertEqual(
+            fingerprint.members_updated_at, datetime(2024, 1, 1, tzinfo=timezone.utc)
+        )
+        self.assertEqual(fingerprint.members_count, 3)
@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from tc_analyzer_lib.algorithms.utils.member_activity_utils import (
+    generate_based_date,
+    store_based_date,
+)
+
+
+class TestStoreBasedDate(unittest.TestCase):
+    def setUp(self) -> None:
+        self.start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        self.all_activities = {
+            "all_joined": {"0": {"user1"}, "1": {"user1"}, "2": {"user1", "user2"}},
+            "all_joined_day": {"0": {"user1"}, "1": set(), "2": {"user2"}},
+            "all_active": {"0": {"user1"}, "1": {"user1", "user3"}, "2": set()},
+            "all_lurker": {"1": {"user2"}},
+        }
+        self.joined_acc = [
+            {"id": "user1", "joined_at": self.start_date + timedelta(days=6, hours=2)},
+            {"id": "user2", "joined_at": self.start_date + timedelta(days=8)},
+            {"id": "user4", "joined_at": self.start_date + timedelta(days=8, hours=3)},
+        ]
+
+    def test_documents_per_date(self):
+        documents = store_based_date(
+            start_date=self.start_date,
+            all_activities=self.all_activities,
+            analytics_day_range=6,
+            joined_acc_dict=self.joined_acc,
+            load_past=False,
+            empty_channel_acc=True,
+        )
+
+        self.assertEqual(
+            [document["date"] for document in documents],
+            [self.start_date + timedelta(days=6 + idx) for idx in range(3)],
+        )
+        self.assertEqual(documents[0]["all_joined_day"], ["user1"])
+        self.assertEqual(documents[1]["all_joined_day"], [])
+        self.assertEqual(documents[2]["all_joined_day"], ["user2", "user4"])
+        self.assertEqual(sorted(documents[1]["all_active"]), ["user1", "user3"])
+        self.assertEqual(documents[0]["all_lurker"], [])
+        self.assertEqual(documents[1]["all_lurker"], ["user2"])
+
+    def test_skipping_stored_dates(self):
+        documents = generate_based_date(
+            start_date=self.start_date,
+            all_activities=self.all_activities,
+            analytics_day_range=6,
+            joined_acc_dict=self.joined_acc,
+            load_past=True,
+            from_date=self.start_date + timedelta(days=1),
+        )
+
+        self.assertNotIsInstance(documents, list)
+        documents = list(documents)
+        self.assertEqual(len(documents), 1)
+        self.assertEqual(documents[0]["date"], self.start_date + timedelta(days=2))
+        self.assertEqual(sorted(documents[0]["all_joined"]), ["user1", "user2"])
+
+    def test_empty_channel_acc(self):
+        documents = store_based_date(
+            start_date=self.start_date,
+            all_activities=self.all_activities,
+            analytics_day_range=6,
+            joined_acc_dict=self.joined_acc,
+            load_past=False,
+            empty_channel_acc=False,
+        )
+        self.assertEqual(documents, [])
@@ -0,0 +1,63 @@
+import sys
+import unittest
+from unittest.mock import patch
+
+from tc_analyzer_lib.automation.utils.template_cache import TemplateCache
+
+
+class TestTemplateCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = TemplateCache.get_instance()
+        self.cache.clear()
+
+    def tearDown(self) -> None:
+        self.cache.max_size = 128
+        self.cache.clear()
+
+    def test_compiled_once(self):
+        template = "Hi {{username}}!"
+
+        with patch(
+            "tc_analyzer_lib.automation.utils.template_cache.Compiler"
+        ) as compiler:
+            compiler.return_value.compile.return_value = lambda data: "compiled"
+            for _ in range(10):
+                compiled_template = self.cache.get_template(template)
+                self.assertEqual(compiled_template({"username": "user"}), "compiled")
+
+        compiler.return_value.compile.assert_called_once_with(template)
+
+    def test_compile_results(self):
+        compiled_template = self.cache.get_template("Hi {{username}}!")
+        self.assertEqual(compiled_template({"username": "user1"}), "Hi user1!")
+        self.assertIs(self.cache.get_template("Hi {{username}}!"), compiled_template)
+
+    def test_lru_eviction(self):
+        self.cache.max_size = 2
+
+        first = self.cache.get_template("first {{username}}")
+        self.cache.get_template("second {{username}}")
+        # using the first one, so the second one would be evicted
+        self.cache.get_template("first {{username}}")
+        self.cache.get_template("third {{username}}")
+
+        self.assertEqual(
+            list(self.cache._templates.keys()),
+            ["first {{username}}", "third {{username}}"],
+        )
+        self.assertIs(self.cache.get_template("first {{username}}"), first)
+
+    def test_clear_unregisters_modules(self):
+        compiled_template = self.cache.get_template("Hi {{username}}!")
+        self.assertIn(compiled_template.__module__, sys.modules)
+
+        self.cache.clear()
+        self.assertNotIn(compiled_template.__module__, sys.modules)
+
+    def test_handlebar_type(self):
+        self.assertEqual(self.cache.get_handlebar_type("Hi {{username}}!"), "username")
+        self.assertEqual(self.cache.get_handlebar_type(""), None)
+        self.assertEqual(
+            self.cache.get_handlebar_type("Hello {{nickname}} and {{username}}!"),
+            "nickname",
+        )
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+from tc_analyzer_lib.algorithms.assessment.utils.compute_interaction_per_acc import (
+    thr_int,
+)
+from tc_analyzer_lib.algorithms.assessment.utils.generate_graph import make_graph
+
+
+class TestThrInt(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(seed=0)
+        self.int_mat = {
+            "reply": rng.integers(0, 4, size=(12, 12)) * rng.integers(0, 2, (12, 12)),
+            "mention": rng.integers(0, 3, size=(12, 12)),
+        }
+        self.activities = ["reply", "mention"]
+
+    def _networkx_thresholds(self, UW_DEG_THR, EDGE_STR_THR, UW_THR_DEG_THR):
+        """the thresholds computed on networkx graphs as reference"""
+        matrix = self.int_mat["reply"] + self.int_mat["mention"]
+        graph = make_graph(matrix)
+        all_degrees = np.array([val for (_, val) in graph.degree()])
+
+        matrix_interaction = matrix.copy()
+        matrix_interaction[np.diag_indices_from(matrix_interaction)] = 0
+        graph_thresh = make_graph(matrix_interaction)
+        graph_thresh.remove_edges_from(
+            [
+                (n1, n2)
+                for n1, n2, w in graph_thresh.edges(data="weight")
+                if w < EDGE_STR_THR
+            ]
+        )
+        all_degrees_thresh = np.array([val for (_, val) in graph_thresh.degree()])
+
+        return (
+            np.where(all_degrees >= UW_DEG_THR)[0],
+            np.where(all_degrees_thresh > UW_THR_DEG_THR)[0],
+            graph,
+        )
+
+    def test_same_as_networkx(self):
+        for UW_DEG_THR, EDGE_STR_THR, UW_THR_DEG_THR in [(1, 1, 0), (10, 3, 4)]:
+            _, thr_uw_deg, thr_uw_thr_deg, graph = thr_int(
+                self.int_mat,
+                INT_THR=1,
+                UW_DEG_THR=UW_DEG_THR,
+                EDGE_STR_THR=EDGE_STR_THR,
+                UW_THR_DEG_THR=UW_THR_DEG_THR,
+                activities=self.activities,
+            )
+            expected_deg, expected_thr_deg, expected_graph = self._networkx_thresholds(
+                UW_DEG_THR, EDGE_STR_THR, UW_THR_DEG_THR
+            )
+
+            np.testing.assert_array_equal(thr_uw_deg, expected_deg)
+            np.testing.assert_array_equal(thr_uw_thr_deg, expected_thr_deg)
+            self.assertEqual(
+                sorted(graph.edges(data="weight")),
+                sorted(expected_graph.edges(data="weight")),
+            )
+
+    def test_without_graph(self):
+        results = thr_int(
+            self.int_mat,
+            INT_THR=1,
+            UW_DEG_THR=1,
+            EDGE_STR_THR=1,
+            UW_THR_DEG_THR=0,
+            activities=self.activities,
+        )
+        results_no_graph = thr_int(
+            self.int_mat,
+            INT_THR=1,
+            UW_DEG_THR=1,
+            EDGE_STR_THR=1,
+            UW_THR_DEG_THR=0,
+            activities=self.activities,
+            build_graph=False,
+        )
+
+        self.assertIsNone(results_no_graph[3])
+        for array, expected in zip(results_no_graph[:3], results[:3]):
+            np.testing.assert_array_equal(array, expected)